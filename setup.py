@@ -4,6 +4,14 @@ setup(
     name = 'vc_test_suite',
     version = '0.1.0',
     packages = ['vc_test_suite'],
+    package_data = {
+        'vc_test_suite': ['contexts/*.jsonld'],
+    },
+    extras_require = {
+        'columnar': ['numpy'],
+        'proofs': ['cryptography'],
+        'schemas': ['jsonschema'],
+    },
     entry_points = {
         'console_scripts': [
             'vc_test_suite = vc_test_suite.__main__:main'
@@ -0,0 +1,41 @@
+import os
+
+# Every context the tests use is bundled with the package; never fetch.
+os.environ.setdefault("VC_TEST_SUITE_OFFLINE", "1")
+
+import pytest
+from vc_test_suite import benchmark
+
+BASE_CONTEXT_V1 = "https://www.w3.org/2018/credentials/v1"
+
+# Hand-written credentials that break the data model in ways the synthetic
+# corpus does not: wrong types, empty containers and entries that are not
+# objects.
+MALFORMED = [
+    {},
+    {"@context": BASE_CONTEXT_V1, "type": "VerifiableCredential"},
+    {"@context": [], "type": [], "issuer": {}, "credentialSubject": []},
+    {"@context": [5, BASE_CONTEXT_V1], "id": 5, "issuer": 5, "issuanceDate": 5, "expirationDate": None},
+    {"@context": [BASE_CONTEXT_V1], "issuer": {"id": "not a uri"}, "issuanceDate": "2020-02-30T00:00:00Z"},
+    {"@context": [BASE_CONTEXT_V1], "issuanceDate": "2020-01-01T00:00:00Z", "expirationDate": "2019-01-01T00:00:00Z"},
+    {"@context": [BASE_CONTEXT_V1], "credentialStatus": 5, "credentialSchema": "abc", "evidence": [5], "termsOfUse": [{}]},
+    {"@context": [BASE_CONTEXT_V1], "credentialStatus": [{"type": "X"}, {"id": "urn:uuid:1"}], "refreshService": {"id": "https://example.com/r"}},
+    {"@context": [BASE_CONTEXT_V1], "proof": [{"type": "Ed25519Signature2020"}, "not an object"]},
+]
+
+
+@pytest.fixture
+def credential():
+    return {
+        "@context": [BASE_CONTEXT_V1],
+        "id": "urn:uuid:3978344f-8596-4c3a-a978-8fcaba3903c5",
+        "type": ["VerifiableCredential"],
+        "issuer": "did:example:issuer",
+        "issuanceDate": "2020-01-01T00:00:00Z",
+        "credentialSubject": {"id": "did:example:subject"},
+    }
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    return list(benchmark.generate_corpus("mixed", 200, seed=1)) + MALFORMED
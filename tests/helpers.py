@@ -0,0 +1,22 @@
+import json
+import base64
+
+
+def verification(results, key, statement):
+    """The verification of ``statement`` in the ``key`` section of a full result."""
+    for test in results["verifications"][key]:
+        if test["statement"] == statement:
+            return test
+    raise AssertionError(f"{statement!r} was not reported for {key}")
+
+
+def jwt_segment(value):
+    """base64url without padding, of ``value`` as JSON unless it is bytes."""
+    data = value if isinstance(value, bytes) else json.dumps(value).encode("utf-8")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def jwt(payload, header=None):
+    """A compact JWS with ``payload``; the signature is not a real one."""
+    header = header or {"alg": "EdDSA", "kid": "did:example:issuer#key-1"}
+    return ".".join((jwt_segment(header), jwt_segment(payload), "c2ln"))
@@ -0,0 +1,36 @@
+import io
+import json
+from vc_test_suite.batch import check_ndjson, read_ndjson, validate_stream
+
+
+def test_unordered_stream_yields_every_line(credential):
+    lines = [(number, json.dumps(dict(credential, id=f"urn:uuid:{number}"))) for number in range(1, 41)]
+    results = [json.loads(line) for line in validate_stream(lines, workers=2, chunksize=3, ordered=False)]
+    assert sorted(result["line"] for result in results) == list(range(1, 41))
+    assert all(result["result"]["conformant"] for result in results)
+
+
+def test_check_ndjson_keeps_rejected_lines_apart():
+    source = io.StringIO('{"a": 1}\n"hello there"\n\n[1]\nnot json\n{"a": 2}\n')
+    output = io.StringIO()
+    batches = []
+
+    def check_many(credentials):
+        batches.append(len(credentials))
+        return [credential["a"] for credential in credentials]
+
+    check_ndjson(source, check_many, batch_size=4, output=output)
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert lines == [
+        {"line": 1, "result": 1},
+        {"line": 2, "error": "Credential MUST be a JSON object."},
+        {"line": 4, "error": "Credential MUST be a JSON object."},
+        {"line": 5, "error": lines[3]["error"]},
+        {"line": 6, "result": 2},
+    ]
+    assert lines[3]["error"].startswith("Invalid JSON")
+    assert batches == [1, 1]
+
+
+def test_read_ndjson_skips_blank_lines():
+    assert list(read_ndjson(io.StringIO("a\n\n  \nb\n"))) == [(1, "a"), (4, "b")]
@@ -0,0 +1,20 @@
+import json
+import pytest
+from vc_test_suite import benchmark
+from vc_test_suite.timestamps import parse_xml_datetime
+
+
+@pytest.mark.parametrize("kind", benchmark.KINDS)
+def test_same_seed_gives_the_same_corpus(kind):
+    def generated(seed):
+        return [json.dumps(vc) for vc in benchmark.generate_corpus(kind, 20, seed)]
+
+    assert generated(3) == generated(3)
+    assert generated(3) != generated(4)
+
+
+def test_expiration_follows_issuance():
+    expiring = [vc for vc in benchmark.generate_corpus("mixed", 500, seed=0) if "expirationDate" in vc]
+    assert expiring
+    for vc in expiring:
+        assert parse_xml_datetime(vc["expirationDate"]) > parse_xml_datetime(vc["issuanceDate"])
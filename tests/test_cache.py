@@ -0,0 +1,42 @@
+import os
+from vc_test_suite import cache, context_loader, w3c
+
+
+def test_results_are_kept_per_fingerprint(tmp_path, credential):
+    validate = cache.ResultCache(maxsize=10, directory=str(tmp_path))
+    assert validate(credential) == w3c.test_data_model_v1(credential)
+    assert os.listdir(tmp_path) == [cache.results_fingerprint()]
+    again = cache.ResultCache(maxsize=10, directory=str(tmp_path))
+    assert again(credential) == w3c.test_data_model_v1(credential)
+    assert again.stats()["disk_hits"] == 1
+
+
+def test_fingerprint_follows_the_loader(monkeypatch):
+    offline = cache.results_fingerprint()
+    monkeypatch.setattr(context_loader, "document_loader", context_loader.ContextLoader(offline=False))
+    online = cache.results_fingerprint()
+    monkeypatch.setattr(context_loader, "document_loader", context_loader.ContextLoader(allow=["https://example.org/"]))
+    allowed = cache.results_fingerprint()
+    assert len({offline, online, allowed}) == 3
+
+
+def test_only_identical_credentials_hit(credential):
+    validate = cache.ResultCache(maxsize=10)
+    validate(credential)
+    validate(dict(reversed(list(credential.items()))))
+    validate(dict(credential, issuer="not a uri"))
+    assert validate.stats()["hits"] == 1
+    assert validate.stats()["misses"] == 2
+
+
+def test_expired_entries_count_as_evictions():
+    now = [0]
+    memory = cache._TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    memory["a"] = memory["b"] = 1
+    memory["c"] = 1
+    assert memory.evictions == 1
+    now[0] = 11
+    assert len(memory) == 0
+    assert memory.evictions == 3
+    memory["d"] = 1
+    assert memory.evictions == 3
@@ -0,0 +1,66 @@
+import pytest
+from vc_test_suite import context_loader
+
+
+class FlakyLoader:
+    """Fails the first ``failures`` loads, then serves a small context."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, url, options=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("network is down")
+        document = {"@context": {"name": "https://schema.org/name"}} if url.endswith("good") else {"@context": {"name": {"@id": 5}}}
+        return {"contentType": "application/ld+json", "contextUrl": None, "documentUrl": url, "document": document}
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    def install(failures):
+        loader = FlakyLoader(failures)
+        monkeypatch.setattr(context_loader, "document_loader", loader)
+        return loader
+
+    context_loader._process_context.cache_clear()
+    context_loader._load_failures.clear()
+    yield install
+    context_loader._process_context.cache_clear()
+    context_loader._load_failures.clear()
+
+
+def test_bundled_contexts_need_no_loader(flaky):
+    loader = flaky(failures=100)
+    assert context_loader.context_processable("https://www.w3.org/2018/credentials/v1")
+    assert loader.calls == 0
+
+
+def test_load_failures_are_retried_once_expired(flaky):
+    loader = flaky(failures=1)
+    url = "https://example.com/good"
+    assert not context_loader.context_processable(url)
+    # Remembered for a while, so a corpus citing it does not retry every time.
+    assert not context_loader.context_processable(url)
+    assert loader.calls == 1
+    context_loader._load_failures.clear()
+    assert context_loader.context_processable(url)
+    assert context_loader.context_processable(url)
+    assert loader.calls == 2
+
+
+def test_processing_failures_are_kept(flaky):
+    loader = flaky(failures=0)
+    url = "https://example.com/bad"
+    assert not context_loader.context_processable(url)
+    context_loader._load_failures.clear()
+    assert not context_loader.context_processable(url)
+    assert loader.calls == 1
+
+
+def test_offline_loader_does_not_fetch():
+    from pyld import jsonld
+
+    with pytest.raises(jsonld.JsonLdError):
+        context_loader.ContextLoader(offline=True).load("https://example.com/context")
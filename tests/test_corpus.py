@@ -0,0 +1,113 @@
+import os
+import json
+import pytest
+from helpers import jwt
+from vc_test_suite import corpus as corpus_module
+from vc_test_suite.corpus import Corpus, parse_range
+
+
+@pytest.fixture
+def ndjson(tmp_path, credential):
+    lines = [
+        json.dumps(dict(credential, id="urn:uuid:1")),
+        "",
+        "not json",
+        json.dumps(dict(credential, id="urn:uuid:2")),
+        jwt({"vc": dict(credential, id="urn:uuid:ignored"), "jti": "urn:uuid:3"}),
+        json.dumps(dict(credential, id="urn:uuid:1")),
+    ]
+    path = tmp_path / "corpus.ndjson"
+    path.write_text("\n".join(lines))
+    return str(path)
+
+
+def test_lines_and_ids(ndjson):
+    with Corpus(ndjson) as corpus:
+        assert len(corpus) == 6
+        assert corpus.line(3) == "not json"
+        assert corpus.line(2) == ""
+        assert corpus.ids() == ["urn:uuid:1", None, None, "urn:uuid:2", "urn:uuid:3", "urn:uuid:1"]
+        assert corpus.find("urn:uuid:1") == [1, 6]
+        assert corpus.find("urn:uuid:3") == [5]
+        assert corpus.find("urn:uuid:9") == []
+        assert list(corpus.lines(range(1, 4))) == [(1, corpus.line(1)), (3, "not json")]
+        with pytest.raises(IndexError):
+            corpus.line(7)
+
+
+def test_index_is_saved_and_reused(ndjson, monkeypatch):
+    Corpus(ndjson).close()
+    assert os.path.exists(ndjson + ".idx")
+
+    def build_index(self):
+        raise AssertionError("the saved index should have been used")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Corpus, "_build_index", build_index)
+        with Corpus(ndjson) as corpus:
+            assert corpus.find("urn:uuid:2") == [4]
+            assert corpus.line(6) == corpus.line(1)
+        with pytest.raises(AssertionError):
+            Corpus(ndjson, rebuild=True)
+
+
+def test_stale_index_is_rebuilt(ndjson, credential):
+    Corpus(ndjson).close()
+    with open(ndjson, "a") as file:
+        file.write("\n" + json.dumps(dict(credential, id="urn:uuid:4")))
+    stat = os.stat(ndjson)
+    os.utime(ndjson, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with Corpus(ndjson) as corpus:
+        assert len(corpus) == 7
+        assert corpus.find("urn:uuid:4") == [7]
+
+
+def test_truncated_index_is_rebuilt(ndjson):
+    Corpus(ndjson).close()
+    index = ndjson + ".idx"
+    data = open(index, "rb").read()
+    header = len(corpus_module.MAGIC) + corpus_module._HEADER.size
+    for size in (header + 16, header + 8 * 7 + 5):
+        with open(index, "wb") as file:
+            file.write(data[:size])
+        with Corpus(ndjson) as corpus:
+            assert len(corpus) == 6
+            assert corpus.find("urn:uuid:2") == [4]
+
+
+def test_index_that_cannot_be_saved_is_kept_in_memory(ndjson, tmp_path, monkeypatch):
+    with Corpus(ndjson, index_path=str(tmp_path / "missing" / "corpus.idx")) as corpus:
+        assert corpus.find("urn:uuid:2") == [4]
+
+    def replace(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", replace)
+    with Corpus(ndjson, index_path=str(tmp_path / "corpus.idx")) as corpus:
+        assert corpus.find("urn:uuid:2") == [4]
+    assert os.listdir(tmp_path) == ["corpus.ndjson"]
+
+
+def test_validate_selected_lines(ndjson):
+    with Corpus(ndjson) as corpus:
+        results = [json.loads(result) for result in corpus.validate([4, 3, 5], workers=0)]
+    assert [result["line"] for result in results] == [4, 3, 5]
+    assert results[0]["result"]["conformant"]
+    assert results[1]["error"].startswith("Invalid JSON")
+    assert results[2]["result"]["conformant"]
+
+
+def test_main_selects_lines_ranges_and_ids(ndjson, capsys):
+    assert corpus_module.main([ndjson, "--line", "1", "--range", "3:4", "--id", "urn:uuid:3", "--id", "urn:uuid:9"]) is None
+    captured = capsys.readouterr()
+    assert [json.loads(line)["line"] for line in captured.out.splitlines()] == [1, 3, 4, 5]
+    assert "no credential with id 'urn:uuid:9'" in captured.err
+    assert corpus_module.main([ndjson, "--range", "5:"]) is None
+    assert [json.loads(line)["line"] for line in capsys.readouterr().out.splitlines()] == [5, 6]
+    assert corpus_module.main([ndjson, "--line", "9"]) == 1
+
+
+def test_parse_range():
+    assert parse_range("3:7") == (3, 7)
+    assert parse_range(":7") == (None, 7)
+    assert parse_range("3:") == (3, None)
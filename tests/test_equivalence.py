@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+import pytest
+from vc_test_suite import w3c
+from vc_test_suite.rules import CompactResult
+
+# Every evaluator must agree with rules.evaluate, with and without a clock.
+CLOCKS = [None, datetime(2021, 6, 1, tzinfo=timezone.utc)]
+
+
+@pytest.mark.parametrize("now", CLOCKS)
+def test_compact_expands_to_full_result(corpus, now):
+    for vc in corpus:
+        compact = w3c.test_data_model_v1_compact(vc, now)
+        full = w3c.test_data_model_v1(vc, now)
+        assert compact.expand() == full
+        assert compact.conformant == full["conformant"]
+
+
+def test_compact_round_trips_through_bytes(corpus):
+    for vc in corpus:
+        compact = w3c.test_data_model_v1_compact(vc)
+        assert CompactResult.from_bytes(compact.to_bytes(), w3c.VCDM_V1_CHECKS) == compact
+
+
+@pytest.mark.parametrize("now", CLOCKS)
+def test_columnar_rows_match_full_results(corpus, now):
+    pytest.importorskip("numpy")
+    from vc_test_suite.columnar import test_data_model_v1_corpus as corpus_results
+
+    results = corpus_results(corpus, now)
+    conformant = results.conformant
+    for row, vc in enumerate(corpus):
+        full = w3c.test_data_model_v1(vc, now)
+        assert results.result(row) == full
+        assert bool(conformant[row]) is full["conformant"]
+
+
+@pytest.mark.parametrize("now", CLOCKS)
+def test_required_only_keeps_the_required_checks(corpus, now):
+    for vc in corpus:
+        full = w3c.test_data_model_v1(vc, now)
+        required = w3c.test_data_model_v1(vc, now, mode="required-only")
+        expected = {}
+        for key, tests in full["verifications"].items():
+            kept = [test for test in tests if test["required"]]
+            if kept:
+                expected[key] = kept
+        assert required["verifications"] == expected
+        assert required["conformant"] == full["conformant"]
+        assert required["required_score"] == full["required_score"]
+
+
+@pytest.mark.parametrize("now", CLOCKS)
+def test_conformant_only_reports_the_first_failure(corpus, now):
+    for vc in corpus:
+        full = w3c.test_data_model_v1(vc, now)
+        quick = w3c.test_data_model_v1(vc, now, mode="conformant-only")
+        assert quick["conformant"] == full["conformant"]
+        failures = [
+            {"property": key, "statement": test["statement"]}
+            for key, tests in full["verifications"].items()
+            for test in tests
+            if test["required"] and not test["pass"]
+        ]
+        assert quick["failure"] == (failures[0] if failures else None)
@@ -0,0 +1,74 @@
+import copy
+import pytest
+from vc_test_suite import w3c
+from vc_test_suite.incremental import PatchError, apply_patch, revalidate
+
+PATCHES = [
+    [{"op": "replace", "path": "/issuer", "value": "not a uri"}],
+    [{"op": "remove", "path": "/credentialSubject"}],
+    [{"op": "add", "path": "/type/-", "value": "ExampleCredential"}],
+    [{"op": "add", "path": "/expirationDate", "value": "2000-01-01T00:00:00Z"}],
+    [{"op": "replace", "path": "/issuanceDate", "value": "2020-02-30T00:00:00Z"}],
+    [{"op": "move", "from": "/issuanceDate", "path": "/expirationDate"}],
+    [{"op": "copy", "from": "/credentialSubject", "path": "/evidence"}],
+    [
+        {"op": "add", "path": "/credentialSubject/name", "value": "Example"},
+        {"op": "copy", "from": "/credentialSubject", "path": "/evidence"},
+        {"op": "add", "path": "/evidence/type", "value": "Evidence"},
+        {"op": "remove", "path": "/credentialSubject/id"},
+    ],
+    [{"op": "replace", "path": "", "value": {"type": ["VerifiableCredential"]}}],
+    [{"op": "test", "path": "/type/0", "value": "VerifiableCredential"}, {"op": "remove", "path": "/@context/0"}],
+]
+
+
+@pytest.mark.parametrize("patch", PATCHES)
+def test_revalidation_matches_full_validation(corpus, patch):
+    applied = 0
+    for vc in corpus:
+        if not isinstance(vc.get("credentialSubject"), dict) or "issuanceDate" not in vc:
+            continue
+        original = copy.deepcopy(vc)
+        previous = w3c.test_data_model_v1(vc)
+        try:
+            patched, results = revalidate(vc, previous, patch)
+        except PatchError:
+            continue
+        applied += 1
+        assert results == w3c.test_data_model_v1(patched)
+        assert vc == original
+    assert applied
+
+
+def test_copy_does_not_share_containers():
+    document = {"credentialSubject": {"id": "did:example:1"}}
+    patched, touched = apply_patch(
+        document,
+        [
+            {"op": "add", "path": "/credentialSubject/x", "value": 1},
+            {"op": "copy", "from": "/credentialSubject", "path": "/foo"},
+            {"op": "add", "path": "/foo/y", "value": 2},
+        ],
+    )
+    assert patched["credentialSubject"] == {"id": "did:example:1", "x": 1}
+    assert patched["foo"] == {"id": "did:example:1", "x": 1, "y": 2}
+    assert document == {"credentialSubject": {"id": "did:example:1"}}
+    assert touched == {"credentialSubject", "foo"}
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"op": "add", "path": "/a"},
+        [{"op": "remove", "path": "/missing"}],
+        [{"op": "add", "path": "/type/7", "value": "X"}],
+        [{"op": "add", "path": "/type/\u0661", "value": "X"}],
+        [{"op": "add", "path": "/type/\u00b2", "value": "X"}],
+        [{"op": "move", "from": "/credentialSubject", "path": "/credentialSubject/id"}],
+        [{"op": "test", "path": "/issuer", "value": "someone else"}],
+        [{"op": "frobnicate", "path": "/issuer"}],
+    ],
+)
+def test_invalid_patches_are_rejected(credential, patch):
+    with pytest.raises(PatchError):
+        apply_patch(credential, patch)
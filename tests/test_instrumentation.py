@@ -0,0 +1,81 @@
+import pytest
+from vc_test_suite import instrumentation, messaging, presentation, rulesets, w3c
+from vc_test_suite.rules import Rule, Section
+
+BASE_CONTEXT_V2 = "https://www.w3.org/ns/credentials/v2"
+
+
+@pytest.fixture
+def timing():
+    registry = instrumentation.Registry()
+    instrumentation.enable(registry)
+    yield registry
+    instrumentation.disable()
+
+
+def checks(registry, section):
+    return {rule["check"] for rule in registry.snapshot()["rules"] if rule["section"] == section}
+
+
+def test_rules_conditions_and_presence_are_timed(timing, credential):
+    credential["credentialStatus"] = {"id": "https://example.com/status/1", "type": "Example"}
+    w3c.test_data_model_v1(credential)
+    assert checks(timing, "issuer") == {"present", "is_issuer"}
+    assert checks(timing, "credentialStatus") == {"present", "is_one_or_more_objects", "each_has_id", "each_has_type"}
+    assert checks(timing, "refreshService") == {"present"}
+
+
+def test_every_plan_is_timed(timing, credential):
+    rulesets.test_data_model({"@context": [BASE_CONTEXT_V2], "type": "VerifiableCredential"})
+    presentation.test_presentation_v1({"@context": [w3c.BASE_CONTEXT_V1], "holder": "did:example:holder"})
+    profile = rulesets.Ruleset(
+        {"name": Section(presence=Rule(0, True), rules=[Rule(1, True, lambda value: isinstance(value, str))])},
+        {"name": ["A credential MUST have a name.", "The name MUST be a string."]},
+    )
+    profile(dict(credential, name="Example"))
+    assert "has_verifiable_credential_type" in checks(timing, "type")
+    assert "is_holder" in checks(timing, "holder")
+    assert checks(timing, "name") == {"present", "<lambda>"}
+
+
+def test_results_are_unchanged(timing, corpus):
+    timed = [w3c.test_data_model_v1(vc) for vc in corpus[:50]]
+    instrumentation.disable()
+    assert timed == [w3c.test_data_model_v1(vc) for vc in corpus[:50]]
+
+
+def test_snapshot_counts_calls(timing, credential):
+    for _ in range(3):
+        w3c.test_data_model_v1(credential)
+    snapshot = timing.snapshot()
+    issuer = [rule for rule in snapshot["rules"] if rule["section"] == "issuer" and rule["check"] == "is_issuer"]
+    assert [rule["calls"] for rule in issuer] == [3]
+    assert issuer[0]["statement"] == messaging.VCDM_V1_STATEMENTS["issuer"][1]
+    section = snapshot["sections"]["issuer"]
+    assert section["calls"] == 6
+    assert section["seconds"] >= issuer[0]["seconds"] > 0
+    timing.reset()
+    assert timing.snapshot() == {"rules": [], "sections": {}}
+
+
+def test_to_prometheus():
+    registry = instrumentation.Registry()
+    registry.record(("issuer", 'A "quoted"\\ statement', "is_issuer"), 0.5)
+    registry.record(("issuer", 'A "quoted"\\ statement', "is_issuer"), 0.25)
+    text = registry.to_prometheus(prefix="vc")
+    labels = 'section="issuer",statement="A \\"quoted\\"\\\\ statement",check="is_issuer"'
+    assert f"vc_rule_calls_total{{{labels}}} 2" in text.splitlines()
+    assert f"vc_rule_seconds_total{{{labels}}} 0.75" in text.splitlines()
+    assert 'vc_section_seconds_total{section="issuer"} 0.75' in text.splitlines()
+    assert "# TYPE vc_rule_calls_total counter" in text.splitlines()
+
+
+def test_disable_puts_the_plain_plans_back(credential):
+    registry = instrumentation.Registry()
+    instrumentation.enable(registry)
+    assert w3c.VCDM_V1_ACTIVE.plan is not w3c.VCDM_V1_PLAN
+    instrumentation.disable()
+    assert w3c.VCDM_V1_ACTIVE.plan is w3c.VCDM_V1_PLAN
+    assert w3c.VP_V1_ACTIVE.plan is w3c.VP_V1_PLAN
+    w3c.test_data_model_v1(credential)
+    assert registry.snapshot()["rules"] == []
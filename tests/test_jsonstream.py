@@ -0,0 +1,54 @@
+import io
+import json
+import pytest
+from vc_test_suite.jsonstream import StreamError, iter_json_items
+
+
+def items(data, **options):
+    return list(iter_json_items(io.BytesIO(data), **options))
+
+
+def test_array_items_carry_their_byte_offsets():
+    data = '[{"a": "é"},\n {"b": [1, 2]} ,3]'.encode("utf-8")
+    found = items(data)
+    assert [text for _, text in found] == ['{"a": "é"}', '{"b": [1, 2]}', "3"]
+    for offset, text in found:
+        assert data[offset:].startswith(text.encode("utf-8"))
+
+
+def test_invalid_utf8_does_not_shift_later_offsets():
+    data = b'[{"a":"x\xffy"}, {"b":1}]'
+    assert items(data) == [(1, '{"a":"x�y"}'), (data.index(b'{"b"'), '{"b":1}')]
+
+
+def test_concatenated_documents():
+    data = b'{"a": 1}\n{"b": 2}{"c": 3}\n "s" 4'
+    assert [text for _, text in items(data)] == ['{"a": 1}', '{"b": 2}', '{"c": 3}', '"s"', "4"]
+
+
+def test_malformed_items_are_yielded_and_reading_carries_on():
+    found = [text for _, text in items(b'[{"a": 1,}, {"b": tru}, {"c": 3}]')]
+    assert found == ['{"a": 1,}', '{"b": tru}', '{"c": 3}']
+    with pytest.raises(ValueError):
+        json.loads(found[0])
+    assert json.loads(found[2]) == {"c": 3}
+
+
+def test_any_chunk_size_gives_the_same_items():
+    data = json.dumps([{"n": n, "s": "é☃,]}" * n, "l": list(range(n))} for n in range(20)]).encode("utf-8")
+    data = data[:40] + b'{"broken": [}, ' + data[40:] + b'\xff{"x": "\xe2\x98"}'
+    expected = items(data)
+    for chunk_size in (1, 2, 3, 7, 64, 1000):
+        assert items(data, chunk_size=chunk_size) == expected
+
+
+def test_empty_stream():
+    assert items(b"") == []
+    assert items(b"  []  ") == []
+
+
+def test_max_item_size():
+    data = b'[{"a": "' + b"x" * 100 + b'"}]'
+    assert items(data, chunk_size=8, max_item_size=200) == [(1, data[1:-1].decode())]
+    with pytest.raises(StreamError):
+        items(data, chunk_size=8, max_item_size=50)
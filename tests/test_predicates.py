@@ -0,0 +1,66 @@
+import pytest
+import uritools
+from vc_test_suite import predicates, w3c
+from vc_test_suite.predicates import UriCheck
+
+PRESCREENED = [
+    "did:example:123",
+    "did:",
+    "https://example.com/credentials/1",
+    "https:",
+    "http://[::1]:80/a b",
+    "urn:uuid:3978344f-8596-4c3a-a978-8fcaba3903c5",
+]
+OTHER = [
+    "",
+    " ",
+    "not a uri",
+    "example.com",
+    "//example.com/path",
+    "/relative/path",
+    "mailto:someone@example.com",
+    "urn:isbn:0451450523",
+    "ftp://ftp.example.com/file",
+    "HTTPS://EXAMPLE.COM",
+    "did",
+    "1abc:def",
+    "a+b-c.d:rest",
+    "a_b:rest",
+    ":no-scheme",
+    "tag:example.com,2020:x",
+    "data:,hello",
+    "é:x",
+    "https\x00:",
+]
+
+
+@pytest.mark.parametrize("value", PRESCREENED + OTHER)
+def test_same_verdicts_as_uritools(value):
+    assert UriCheck()(value) is uritools.isuri(value)
+    assert w3c.is_uri(value) is uritools.isuri(value)
+
+
+def test_prescreened_strings_are_uris_to_uritools():
+    for value in PRESCREENED:
+        assert value.startswith(predicates.COMMON_URI_PREFIXES)
+        assert uritools.isuri(value)
+    for value in OTHER:
+        assert not value.startswith(predicates.COMMON_URI_PREFIXES)
+
+
+def test_stats():
+    check = UriCheck(maxsize=2)
+    for value in ["did:example:1", "https://example.com", "mailto:a@b", "mailto:a@b", "x", "y", "mailto:a@b"]:
+        check(value)
+    stats = check.stats()
+    assert stats == {
+        "calls": 7,
+        "prescreened": 2,
+        "memo_hits": 1,
+        "memo_misses": 4,
+        "memo_size": 2,
+        "hit_rate": 3 / 7,
+    }
+    check.clear()
+    assert check.stats()["calls"] == 0
+    assert UriCheck().stats()["hit_rate"] == 0.0
@@ -0,0 +1,97 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from helpers import jwt as token
+from vc_test_suite import presentation
+
+BASE_CONTEXT_V1 = "https://www.w3.org/2018/credentials/v1"
+
+
+def make_presentation(*credentials):
+    return {
+        "@context": [BASE_CONTEXT_V1],
+        "type": ["VerifiablePresentation"],
+        "verifiableCredential": list(credentials),
+    }
+
+
+def test_embedded_vc_jwts_are_decoded(credential):
+    report = presentation.test_presentation_v1(make_presentation(token({"vc": credential}), token({"vc": []})))
+    good, bad = report["credentials"]
+    assert good["result"]["conformant"]
+    assert bad["error"] == "Invalid VC-JWT: The vc claim MUST be a JSON object"
+
+
+def test_a_single_vc_jwt_is_one_or_more_credentials(credential):
+    vp = dict(make_presentation(), verifiableCredential=token({"vc": credential}))
+    report = presentation.test_presentation_v1(vp)
+    assert report["conformant"]
+    assert len(report["credentials"]) == 1
+
+
+def test_presentation_and_its_credentials_are_checked(credential):
+    broken = dict(credential, issuer="not a uri")
+    report = presentation.test_presentation_v1(make_presentation(credential, broken, "text"))
+    assert report["presentation"]["conformant"]
+    assert report["credentials"][0]["result"]["conformant"]
+    assert not report["credentials"][1]["result"]["conformant"]
+    assert report["credentials"][2] == {"error": "Embedded credential MUST be a JSON object."}
+    assert not report["conformant"]
+
+    report = presentation.test_presentation_v1(make_presentation(credential))
+    assert report["conformant"]
+    report = presentation.test_presentation_v1(dict(make_presentation(credential), type=["VerifiableCredential"]))
+    assert not report["conformant"]
+    assert report["credentials"][0]["result"]["conformant"]
+
+
+def test_repeated_credentials_are_validated_once(credential, monkeypatch):
+    seen = []
+    validate_embedded = presentation.validate_embedded
+
+    def counting(vc, *args):
+        seen.append(vc)
+        return validate_embedded(vc, *args)
+
+    monkeypatch.setattr(presentation, "validate_embedded", counting)
+    other = dict(credential, id="urn:uuid:2")
+    reordered = dict(reversed(list(credential.items())))
+    report = presentation.test_presentation_v1(make_presentation(credential, other, reordered, credential))
+    assert seen == [credential, other]
+    assert len(report["credentials"]) == 4
+    assert report["credentials"][0] == report["credentials"][2] == report["credentials"][3]
+
+
+def test_executor_gives_the_same_report(credential, corpus):
+    vp = make_presentation(credential, *corpus[:30], credential)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert presentation.test_presentation_v1(vp, executor=executor) == presentation.test_presentation_v1(vp)
+
+
+def test_conformant_only_stops_at_the_presentation(credential, monkeypatch):
+    def validate_embedded(*args):
+        raise AssertionError("the credentials should not be checked")
+
+    vp = dict(make_presentation(credential), type="VerifiablePresentation")
+    with monkeypatch.context() as patch:
+        patch.setattr(presentation, "validate_embedded", validate_embedded)
+        report = presentation.test_presentation_v1(vp, mode="conformant-only")
+    assert report["conformant"] is False
+    assert report["credentials"] is None
+    assert report["presentation"]["failure"]["property"] == "type"
+
+    report = presentation.test_presentation_v1(make_presentation(credential), mode="conformant-only")
+    assert report == {
+        "conformant": True,
+        "presentation": {"conformant": True, "failure": None},
+        "credentials": [{"result": {"conformant": True, "failure": None}}],
+    }
+
+
+def test_main_takes_a_ruleset(credential, capsys):
+    vp = json.dumps(make_presentation(credential))
+    presentation.main([vp])
+    assert json.loads(capsys.readouterr().out)["conformant"]
+    presentation.main([vp, "--ruleset", "vcdm-2.0"])
+    report = json.loads(capsys.readouterr().out)
+    assert report["presentation"]["conformant"]
+    assert not report["credentials"][0]["result"]["conformant"]
@@ -0,0 +1,149 @@
+import copy
+import pytest
+
+pytest.importorskip("cryptography")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from vc_test_suite import proofs
+
+ISSUER_DOCUMENT = "https://example.com/issuer"
+
+
+def base58_encode(data):
+    number = int.from_bytes(data, "big")
+    text = ""
+    while number:
+        number, digit = divmod(number, 58)
+        text = proofs._BASE58[digit] + text
+    return "1" * (len(data) - len(data.lstrip(b"\0"))) + text
+
+
+@pytest.fixture(scope="module")
+def key():
+    private_key = Ed25519PrivateKey.from_private_bytes(bytes(range(32)))
+    public_key = private_key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    multikey = "z" + base58_encode(proofs.ED25519_PUB + public_key)
+    return private_key, multikey, f"did:key:{multikey}"
+
+
+@pytest.fixture(scope="module")
+def store(key):
+    _, multikey, _ = key
+    return proofs.KeyStore(
+        [
+            {
+                "id": ISSUER_DOCUMENT,
+                "verificationMethod": [
+                    {"id": "#key-1", "type": "Multikey", "publicKeyMultibase": multikey},
+                    {"id": "#key-2", "type": "Multikey", "publicKeyMultibase": multikey},
+                ],
+                "assertionMethod": ["#key-1"],
+            }
+        ]
+    )
+
+
+def sign(private_key, vc, method, purpose="assertionMethod"):
+    # eddsa-jcs-2022 needs no JSON-LD processing, so nothing is fetched.
+    proof = {
+        "type": "DataIntegrityProof",
+        "cryptosuite": "eddsa-jcs-2022",
+        "created": "2020-01-01T00:00:00Z",
+        "verificationMethod": method,
+        "proofPurpose": purpose,
+    }
+    signature = private_key.sign(proofs.ProofVerifier().verify_data(vc, proof))
+    return dict(vc, proof=dict(proof, proofValue="z" + base58_encode(signature)))
+
+
+def test_did_key_proof_by_the_issuer_verifies(key, credential):
+    private_key, multikey, did = key
+    signed = sign(private_key, dict(credential, issuer=did), f"{did}#{multikey}")
+    result = proofs.ProofVerifier().verify(signed)
+    assert result["verified"], result
+
+
+def test_tampered_credential_does_not_verify(key, credential):
+    private_key, multikey, did = key
+    signed = sign(private_key, dict(credential, issuer=did), f"{did}#{multikey}")
+    tampered = copy.deepcopy(signed)
+    tampered["credentialSubject"]["id"] = "did:example:someone"
+    assert proofs.ProofVerifier().verify(tampered)["proofs"][0]["error"] == "Signature does not match."
+
+
+def test_key_of_another_controller_does_not_verify(key, credential):
+    private_key, multikey, did = key
+    signed = sign(private_key, dict(credential, issuer="did:example:someone-else"), f"{did}#{multikey}")
+    result = proofs.ProofVerifier().verify(signed)
+    assert not result["verified"]
+    assert "not the issuer" in result["proofs"][0]["error"]
+
+
+def test_proof_purpose_must_be_assertion(key, credential):
+    private_key, multikey, did = key
+    signed = sign(private_key, dict(credential, issuer=did), f"{did}#{multikey}", purpose="authentication")
+    result = proofs.ProofVerifier().verify(signed)
+    assert not result["verified"]
+    assert "proofPurpose" in result["proofs"][0]["error"]
+
+
+@pytest.mark.parametrize("method, verified", [("#key-1", True), ("#key-2", False)])
+def test_method_must_be_an_assertion_method_of_the_issuer(key, store, credential, method, verified):
+    private_key, _, _ = key
+    signed = sign(private_key, dict(credential, issuer=ISSUER_DOCUMENT), ISSUER_DOCUMENT + method)
+    verifier = proofs.ProofVerifier(proofs.chain(proofs.resolve_did_key, store), documents=store.document)
+    assert verifier.verify(signed)["verified"] is verified
+
+
+@pytest.mark.parametrize("proof", [5, "abc", None])
+def test_malformed_proof_is_the_credentials_error(credential, proof):
+    result = proofs.ProofVerifier().verify_many([dict(credential, proof=proof)])[0]
+    assert result == {"verified": False, "proofs": [], "error": "proof MUST be one or more objects"}
+
+
+def test_credential_without_proof(credential):
+    for vc in (credential, dict(credential, proof=[])):
+        assert proofs.ProofVerifier().verify(vc) == {"verified": False, "proofs": [], "error": "Credential has no proof"}
+
+
+# Signed with the key fixture. URDNA2015 only needs the bundled credentials
+# and Ed25519Signature2020 contexts, so this runs offline.
+SIGNED_ED25519_SIGNATURE_2020 = {
+    "@context": ["https://www.w3.org/2018/credentials/v1", "https://w3id.org/security/suites/ed25519-2020/v1"],
+    "id": "urn:uuid:3978344f-8596-4c3a-a978-8fcaba3903c5",
+    "type": ["VerifiableCredential"],
+    "issuer": "did:key:z6MkehRgf7yJbgaGfYsdoAsKdBPE3dj2CYhowQdcjqSJgvVd",
+    "issuanceDate": "2020-01-01T00:00:00Z",
+    "credentialSubject": {"id": "did:example:subject"},
+    "proof": {
+        "type": "Ed25519Signature2020",
+        "created": "2020-01-01T00:00:00Z",
+        "verificationMethod": "did:key:z6MkehRgf7yJbgaGfYsdoAsKdBPE3dj2CYhowQdcjqSJgvVd#z6MkehRgf7yJbgaGfYsdoAsKdBPE3dj2CYhowQdcjqSJgvVd",
+        "proofPurpose": "assertionMethod",
+        "proofValue": "z5HX3aGTg6K8YeRZpbiCgaEskHaNA7SBYZ1HRjttetG9i8LTsdAo6KHzYtgyiGfB4ZHoKCtKH8V6AGPjiE3iPa8JE",
+    },
+}
+
+
+def test_ed25519_signature_2020_fixture_verifies(key):
+    assert SIGNED_ED25519_SIGNATURE_2020["issuer"] == key[2]
+    result = proofs.ProofVerifier().verify(SIGNED_ED25519_SIGNATURE_2020)
+    assert result["verified"], result
+
+
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        (("credentialSubject", "id"), "did:example:someone"),
+        (("issuanceDate",), "2021-01-01T00:00:00Z"),
+        (("proof", "created"), "2021-01-01T00:00:00Z"),
+    ],
+)
+def test_tampered_ed25519_signature_2020_does_not_verify(path, value):
+    tampered = copy.deepcopy(SIGNED_ED25519_SIGNATURE_2020)
+    target = tampered
+    for name in path[:-1]:
+        target = target[name]
+    target[path[-1]] = value
+    assert proofs.ProofVerifier().verify(tampered)["proofs"][0]["error"] == "Signature does not match."
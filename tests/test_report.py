@@ -0,0 +1,91 @@
+import io
+import json
+from helpers import jwt
+from vc_test_suite.batch import validate_stream
+from vc_test_suite.report import NO_ISSUER, OTHER_ISSUERS, FailureReport, build_report, failures
+
+FAILED = {
+    "conformant": False,
+    "verifications": {
+        "issuer": [{"statement": "has issuer", "required": True, "pass": True}, {"statement": "issuer is a URL", "required": True, "pass": False}],
+        "id": [{"statement": "id is a URL", "required": False, "pass": False}],
+    },
+}
+PASSED = {"conformant": True, "verifications": {"issuer": [{"statement": "has issuer", "required": True, "pass": True}]}}
+
+
+def test_failures_of_every_mode():
+    assert sorted(failures(FAILED)) == [("id", "id is a URL", False), ("issuer", "issuer is a URL", True)]
+    assert list(failures({"conformant": False, "failure": {"property": "type", "statement": "has type"}})) == [("type", "has type", True)]
+    assert list(failures({"conformant": True, "failure": None})) == []
+
+
+def test_counts_per_statement_and_issuer():
+    report = FailureReport()
+    report.add(FAILED, "a", "did:example:1")
+    report.add(FAILED, "b", "did:example:1")
+    report.add(PASSED, "c", "did:example:2")
+    report.add(FAILED, "d")
+    report.add_error()
+    data = report.to_dict()
+    assert (data["credentials"], data["conformant"], data["nonconformant"], data["errors"]) == (4, 1, 3, 1)
+    assert [(record["property"], record["failed"], record["required"]) for record in data["statements"]] == [("id", 3, False), ("issuer", 3, True)]
+    issuers = {entry["issuer"]: entry for entry in data["issuers"]}
+    assert (issuers["did:example:1"]["credentials"], issuers["did:example:1"]["nonconformant"]) == (2, 2)
+    assert issuers["did:example:2"]["failures"] == []
+    assert issuers[NO_ISSUER]["nonconformant"] == 1
+    assert [entry["issuer"] for entry in data["issuers"]][0] == "did:example:1"
+    assert "4 credentials: 1 conformant, 3 nonconformant, 1 errors" in report.summary()
+
+
+def test_samples_are_a_bounded_repeatable_reservoir():
+    def sampled(seed):
+        report = FailureReport(samples=3, seed=seed)
+        for number in range(1000):
+            report.add(FAILED, number)
+        return report.to_dict()["statements"][0]["examples"]
+
+    examples = sampled(0)
+    assert len(examples) == 3
+    assert len(set(examples)) == 3
+    assert examples == sampled(0)
+    assert any(example >= 3 for example in examples)
+    assert examples != sampled(1)
+
+
+def test_issuers_past_max_issuers_are_pooled():
+    report = FailureReport(max_issuers=2)
+    for number in range(5):
+        report.add(FAILED, number, f"did:example:{number}")
+    report.add(FAILED, 5, "did:example:0")
+    issuers = {entry["issuer"]: entry["credentials"] for entry in report.to_dict()["issuers"]}
+    assert issuers == {"did:example:0": 2, "did:example:1": 1, OTHER_ISSUERS: 3}
+
+
+def test_build_report_joins_results_with_credentials(credential):
+    lines = [
+        json.dumps(dict(credential, id="urn:uuid:1", issuer="not a uri")),
+        "not json",
+        jwt({"vc": {key: value for key, value in credential.items() if key not in ("id", "issuer")}}),
+        jwt({"vc": dict(credential, issuer={"id": "did:example:jwt"}, type=[]), "jti": "urn:uuid:3"}),
+        json.dumps(dict(credential, id="urn:uuid:4")),
+    ]
+    source = "\n".join(lines) + "\n"
+    results = "\n".join(validate_stream(enumerate(source.splitlines(), start=1), workers=0))
+    report = build_report(io.StringIO(results), io.StringIO(source)).to_dict()
+    assert (report["credentials"], report["errors"]) == (4, 1)
+    issuers = {entry["issuer"]: entry["nonconformant"] for entry in report["issuers"]}
+    assert issuers == {"not a uri": 1, NO_ISSUER: 1, "did:example:jwt": 1, credential["issuer"]: 0}
+    examples = {}
+    for record in report["statements"]:
+        if record["required"]:
+            examples.setdefault(record["property"], []).extend(record["examples"])
+    assert sorted(examples["issuer"]) == ["line 3", "urn:uuid:1"]
+    assert examples["type"] == ["urn:uuid:3"]
+
+
+def test_build_report_without_credentials(credential):
+    results = "\n".join(validate_stream([(7, json.dumps(dict(credential, issuer=5)))], workers=0))
+    report = build_report(io.StringIO(results)).to_dict()
+    assert report["statements"][0]["examples"] == ["line 7"]
+    assert report["issuers"][0]["issuer"] == NO_ISSUER
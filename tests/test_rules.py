@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+import pytest
+from helpers import verification
+from vc_test_suite import messaging, w3c
+
+STATEMENTS = messaging.VCDM_V1_STATEMENTS
+
+# Statement indexes of the per-entry id and type checks, which differ between
+# properties.
+ENTRY_CHECKS = {
+    "credentialStatus": (2, 3),
+    "credentialSchema": (3, 2),
+    "refreshService": (3, 2),
+    "termsOfUse": (3, 2),
+    "evidence": (3, 2),
+}
+
+
+def test_conformant_credential(credential):
+    results = w3c.test_data_model_v1(credential)
+    assert results["conformant"]
+    assert results["required_score"] == "11/11"
+
+
+@pytest.mark.parametrize("key", sorted(ENTRY_CHECKS))
+def test_every_entry_needs_an_id(credential, key):
+    id_index, type_index = ENTRY_CHECKS[key]
+    credential[key] = [{"id": "https://example.com/1", "type": "Example"}, {"type": "Example"}]
+    results = w3c.test_data_model_v1(credential)
+    assert not verification(results, key, STATEMENTS[key][id_index])["pass"]
+    assert verification(results, key, STATEMENTS[key][type_index])["pass"]
+
+
+@pytest.mark.parametrize("key", sorted(ENTRY_CHECKS))
+def test_every_entry_needs_a_type(credential, key):
+    id_index, type_index = ENTRY_CHECKS[key]
+    credential[key] = [{"id": "https://example.com/1", "type": "Example"}, {"id": "https://example.com/2"}]
+    results = w3c.test_data_model_v1(credential)
+    assert verification(results, key, STATEMENTS[key][id_index])["pass"]
+    assert not verification(results, key, STATEMENTS[key][type_index])["pass"]
+
+
+@pytest.mark.parametrize("key", ["termsOfUse", "evidence"])
+def test_may_entry_ids_are_optional(credential, key):
+    credential[key] = {"type": "Example"}
+    results = w3c.test_data_model_v1(credential)
+    assert not verification(results, key, STATEMENTS[key][3])["required"]
+    assert results["conformant"]
+
+
+@pytest.mark.parametrize("key, statement", [("id", 1), ("issuer", 1), ("issuanceDate", 1), ("expirationDate", 1)])
+def test_non_string_values_fail(credential, key, statement):
+    credential[key] = 5
+    results = w3c.test_data_model_v1(credential)
+    assert not verification(results, key, STATEMENTS[key][statement])["pass"]
+
+
+@pytest.mark.parametrize("timestamp", ["2020-02-30T00:00:00Z", "2020-01-01T24:00:01Z", "2020-01-01T00:00:00+14:01", "2020-01-01"])
+def test_invalid_datetimes_fail(credential, timestamp):
+    credential["issuanceDate"] = timestamp
+    results = w3c.test_data_model_v1(credential)
+    assert not verification(results, "issuanceDate", STATEMENTS["issuanceDate"][1])["pass"]
+
+
+def test_expiration_before_issuance_is_reported(credential):
+    credential["expirationDate"] = "2019-01-01T00:00:00Z"
+    results = w3c.test_data_model_v1(credential)
+    assert not verification(results, "expirationDate", STATEMENTS["expirationDate"][2])["pass"]
+
+
+def test_validity_period_is_only_checked_with_a_clock(credential):
+    credential["expirationDate"] = "2021-01-01T00:00:00Z"
+    results = w3c.test_data_model_v1(credential)
+    statements = {test["statement"] for test in results["verifications"]["expirationDate"]}
+    assert STATEMENTS["expirationDate"][3] not in statements
+    assert results["conformant"]
+
+
+@pytest.mark.parametrize(
+    "now, conformant",
+    [
+        (datetime(2019, 1, 1, tzinfo=timezone.utc), False),
+        (datetime(2020, 6, 1, tzinfo=timezone.utc), True),
+        (datetime(2021, 6, 1), False),
+    ],
+)
+def test_validity_period_is_required(credential, now, conformant):
+    credential["expirationDate"] = "2021-01-01T00:00:00Z"
+    results = w3c.test_data_model_v1(credential, now=now)
+    assert verification(results, "issuanceDate", STATEMENTS["issuanceDate"][2])["required"]
+    assert verification(results, "expirationDate", STATEMENTS["expirationDate"][3])["required"]
+    assert results["conformant"] is conformant
+    assert w3c.test_data_model_v1(credential, now=now, mode="conformant-only")["conformant"] is conformant
@@ -0,0 +1,127 @@
+import sys
+import subprocess
+from datetime import datetime, timezone
+import pytest
+from helpers import verification
+from vc_test_suite import messaging, rulesets
+from vc_test_suite.rules import Rule, Section
+
+BASE_CONTEXT_V2 = "https://www.w3.org/ns/credentials/v2"
+STATEMENTS = messaging.VCDM_V2_STATEMENTS
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Let a test register rulesets without leaving them behind."""
+    for name in ("_loaders", "_loaded", "_contexts"):
+        monkeypatch.setattr(rulesets, name, dict(getattr(rulesets, name)))
+
+
+@pytest.fixture
+def credential_v2():
+    return {
+        "@context": [BASE_CONTEXT_V2],
+        "id": "urn:uuid:3978344f-8596-4c3a-a978-8fcaba3903c5",
+        "type": ["VerifiableCredential"],
+        "issuer": "did:example:issuer",
+        "validFrom": "2020-01-01T00:00:00Z",
+        "credentialSubject": {"id": "did:example:subject"},
+    }
+
+
+@pytest.mark.parametrize(
+    "vc, name",
+    [
+        ({"@context": [BASE_CONTEXT_V2]}, "vcdm-2.0"),
+        ({"@context": BASE_CONTEXT_V2}, "vcdm-2.0"),
+        ({"@context": ["https://www.w3.org/2018/credentials/v1", BASE_CONTEXT_V2]}, "vcdm-1.1"),
+        ({"@context": ["https://example.com/other"]}, "vcdm-1.1"),
+        ({"@context": []}, "vcdm-1.1"),
+        ({"@context": [5]}, "vcdm-1.1"),
+        ({}, "vcdm-1.1"),
+        ([], "vcdm-1.1"),
+    ],
+)
+def test_detect(vc, name):
+    assert rulesets.detect(vc) == name
+
+
+def test_unknown_ruleset():
+    with pytest.raises(rulesets.UnknownRuleset):
+        rulesets.get("vcdm-9")
+
+
+def test_registered_ruleset_is_detected_and_loaded_on_first_use(registry, credential):
+    profile = rulesets.Ruleset(
+        {"name": Section(presence=Rule(0, True), rules=[Rule(1, True, lambda value: isinstance(value, str))])},
+        {"name": ["A credential MUST have a name.", "The name MUST be a string."]},
+    )
+    rulesets.register("profile", profile, contexts=("https://example.com/profile/v1",))
+    assert "profile" in rulesets.names()
+    assert "profile" not in rulesets.loaded()
+    assert profile._active is None
+
+    credential["@context"] = ["https://example.com/profile/v1"]
+    assert not rulesets.test_data_model(credential)["conformant"]
+    assert rulesets.test_data_model(dict(credential, name="Example"))["conformant"]
+    assert rulesets.get("profile") is profile
+    assert "profile" in rulesets.loaded()
+
+
+def test_register_by_module_name(registry):
+    rulesets.register("again", "vc_test_suite.vcdm2:test_data_model_v2")
+    from vc_test_suite.vcdm2 import test_data_model_v2
+
+    assert rulesets.get("again") is test_data_model_v2
+
+
+def test_vcdm2_conformant_credential(credential_v2):
+    results = rulesets.test_data_model(credential_v2)
+    assert results["conformant"]
+    assert "issuanceDate" not in results["verifications"]
+
+
+def test_vcdm2_types_may_be_a_single_string(credential_v2):
+    credential_v2["type"] = "VerifiableCredential"
+    assert rulesets.test_data_model(credential_v2)["conformant"]
+    credential_v2["type"] = ["VerifiableCredential", 5]
+    assert not verification(rulesets.test_data_model(credential_v2), "type", STATEMENTS["type"][1])["pass"]
+
+
+def test_vcdm2_timestamps_need_a_timezone(credential_v2):
+    credential_v2["validFrom"] = "2020-01-01T00:00:00"
+    results = rulesets.test_data_model(credential_v2)
+    assert not verification(results, "validFrom", STATEMENTS["validFrom"][1])["pass"]
+    assert not results["conformant"]
+
+
+def test_vcdm2_validity_period(credential_v2):
+    credential_v2["validUntil"] = "2019-01-01T00:00:00Z"
+    results = rulesets.test_data_model(credential_v2)
+    assert not verification(results, "validUntil", STATEMENTS["validUntil"][2])["pass"]
+
+    credential_v2["validUntil"] = "2021-01-01T00:00:00Z"
+    results = rulesets.test_data_model(credential_v2, now=datetime(2022, 1, 1, tzinfo=timezone.utc))
+    assert not verification(results, "validUntil", STATEMENTS["validUntil"][3])["pass"]
+    assert verification(results, "validFrom", STATEMENTS["validFrom"][2])["pass"]
+    assert not results["conformant"]
+
+
+def test_vcdm2_status_ids_must_be_urls(credential_v2):
+    credential_v2["credentialStatus"] = [{"type": "BitstringStatusListEntry"}, {"type": "X", "id": "not a url"}]
+    results = rulesets.test_data_model(credential_v2)
+    assert verification(results, "credentialStatus", STATEMENTS["credentialStatus"][2])["pass"]
+    assert not verification(results, "credentialStatus", STATEMENTS["credentialStatus"][3])["pass"]
+
+
+def test_vcdm2_does_not_load_the_vcdm1_rules():
+    code = (
+        "import sys\n"
+        "import vc_test_suite\n"
+        "from vc_test_suite import rulesets\n"
+        f"assert rulesets.test_data_model({{'@context': [{BASE_CONTEXT_V2!r}]}})['conformant'] is False\n"
+        "print(sorted(name for name in sys.modules if name.startswith('vc_test_suite.')))\n"
+    )
+    loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert "vc_test_suite.vcdm2" in loaded
+    assert "vc_test_suite.w3c" not in loaded
@@ -0,0 +1,83 @@
+import json
+import pytest
+
+pytest.importorskip("jsonschema")
+
+from vc_test_suite.schemas import SchemaDirectory, SchemaEnforcer
+
+DEGREE = "https://example.org/schemas/degree.json"
+SUBJECT = "https://example.org/schemas/subject.json"
+BROKEN = "https://example.org/schemas/broken.json"
+
+
+@pytest.fixture
+def enforcer(tmp_path):
+    schemas = {
+        "degree.json": {"$id": DEGREE, "$schema": "https://json-schema.org/draft/2020-12/schema", "type": "object", "required": ["type"]},
+        "subject.json": {"$id": SUBJECT, "type": "object", "required": ["degree"], "properties": {"degree": {"$ref": "degree.json"}}},
+        "broken.json": {"$id": BROKEN, "type": "object", "properties": {"degree": {"$ref": "missing.json"}}},
+        "notes.txt": "ignored",
+    }
+    for name, schema in schemas.items():
+        (tmp_path / name).write_text(json.dumps(schema), encoding="utf-8")
+    return SchemaEnforcer(SchemaDirectory(str(tmp_path)))
+
+
+def with_schema(credential, schema_id, subject):
+    return dict(credential, credentialSchema={"id": schema_id, "type": "JsonSchemaValidator2018"}, credentialSubject=subject)
+
+
+@pytest.mark.parametrize("subject, valid", [({"degree": {"type": "BachelorDegree"}}, True), ({"degree": {}}, False), ({}, False)])
+def test_ref_is_resolved_through_the_directory(enforcer, credential, subject, valid):
+    result = enforcer.check(with_schema(credential, SUBJECT, subject))
+    assert result["valid"] is valid
+    assert result["schemas"][0]["error"] is None
+
+
+def test_unresolvable_ref_is_the_entrys_error(enforcer, credential):
+    results = enforcer.check_many([with_schema(credential, BROKEN, {"degree": {}})] * 2)
+    for result in results:
+        assert not result["valid"]
+        assert "could not be applied" in result["schemas"][0]["error"]
+
+
+@pytest.mark.parametrize("subject", ["abc", 5, [{"degree": {"type": "X"}}, 3]])
+def test_non_object_subjects_are_not_validated(enforcer, credential, subject):
+    report = enforcer.check(with_schema(credential, SUBJECT, subject))["schemas"][0]
+    assert report["error"] == "credentialSubject MUST be one or more objects"
+    assert not report["valid"]
+
+
+def test_missing_schema_is_compiled_once(enforcer, credential):
+    results = enforcer.check_many([with_schema(credential, "https://example.org/nowhere", {})] * 3)
+    assert all("could not be found" in result["schemas"][0]["error"] for result in results)
+    assert enforcer.stats()["misses"] == 1
+
+
+@pytest.mark.parametrize("subject", [None, []])
+def test_missing_subject_is_an_error(enforcer, credential, subject):
+    vc = with_schema(credential, SUBJECT, subject)
+    if subject is None:
+        del vc["credentialSubject"]
+    result = enforcer.check(vc)
+    assert not result["valid"]
+    assert result["schemas"][0]["error"] is not None
+
+
+def test_ref_cache_is_bounded(credential):
+    schemas = {
+        "https://example.org/a.json": {"$id": "https://example.org/a.json", "properties": {"x": {"$ref": "x.json"}}},
+        "https://example.org/b.json": {"$id": "https://example.org/b.json", "properties": {"x": {"$ref": "y.json"}}},
+        "https://example.org/x.json": {"$id": "https://example.org/x.json", "type": "string"},
+        "https://example.org/y.json": {"$id": "https://example.org/y.json", "type": "string"},
+    }
+    loads = []
+
+    def loader(schema_id):
+        loads.append(schema_id)
+        return schemas.get(schema_id)
+
+    enforcer = SchemaEnforcer(loader, maxsize=1)
+    for name in "abab":
+        assert enforcer.check(with_schema(credential, f"https://example.org/{name}.json", {"x": "text"}))["valid"]
+    assert loads.count("https://example.org/x.json") == 2
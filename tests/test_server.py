@@ -0,0 +1,167 @@
+import json
+import time
+import queue
+import socket
+import asyncio
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pyld import jsonld
+from vc_test_suite import context_loader, server
+
+
+@pytest.fixture
+def restore_loader(monkeypatch):
+    monkeypatch.setattr(context_loader, "document_loader", context_loader.document_loader)
+    yield
+    context_loader._process_context.cache_clear()
+    context_loader._load_failures.clear()
+
+
+@pytest.mark.parametrize(
+    "online, allow, offline, allowed",
+    [
+        (False, [], True, None),
+        (False, ["https://contexts.example.org/"], False, ("https://contexts.example.org/",)),
+        (True, [], False, None),
+    ],
+)
+def test_serve_is_offline_unless_told_otherwise(restore_loader, online, allow, offline, allowed):
+    server.configure_contexts(online, allow)
+    assert context_loader.document_loader.offline is offline
+    assert context_loader.document_loader.allow == allowed
+
+
+def test_allowlist_refuses_other_urls():
+    loader = context_loader.ContextLoader(allow=["https://contexts.example.org/"])
+    with pytest.raises(jsonld.JsonLdError):
+        loader.load("http://169.254.169.254/latest/meta-data/")
+
+
+def test_unknown_context_fails_without_a_fetch(restore_loader, credential):
+    server.configure_contexts()
+    credential["@context"].append("http://169.254.169.254/latest/meta-data/")
+    status, body = server.validate_body(json.dumps(credential).encode("utf-8"))
+    assert status == 200
+    assert not json.loads(body)["conformant"]
+
+
+@pytest.fixture
+def start_server(restore_loader):
+    """Yield start(**options), which serves a ValidationServer on 127.0.0.1 and returns (server, port)."""
+    server.configure_contexts()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    started = queue.Queue()
+
+    def start(**options):
+        executor = ThreadPoolExecutor(max_workers=2)
+        validation = server.ValidationServer(executor, **options)
+        # The loop holds its tasks weakly; keep the server's alive.
+        running.append(asyncio.run_coroutine_threadsafe(validation.serve("127.0.0.1", 0, started.put), loop))
+        executors.append(executor)
+        listener = started.get(timeout=5)
+        return validation, listener.sockets[0].getsockname()[1]
+
+    async def shutdown():
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    running = []
+    executors = []
+    yield start
+    asyncio.run_coroutine_threadsafe(shutdown(), loop).result(5)
+    for executor in executors:
+        executor.shutdown()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+def request(port, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request(method, path, body, headers or {})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_validate_and_batch(start_server, credential):
+    _, port = start_server()
+    status, headers, body = request(port, "POST", "/validate", json.dumps(credential))
+    assert status == 200 and body["conformant"]
+    assert headers["Content-Type"] == "application/json"
+    status, _, body = request(port, "POST", "/validate/batch", json.dumps([credential, 5]))
+    assert status == 200
+    assert body[0]["result"]["conformant"]
+    assert body[1] == {"error": "Credential MUST be a JSON object."}
+    status, _, body = request(port, "POST", "/validate", "{")
+    assert status == 400 and body["error"].startswith("Invalid JSON")
+
+
+def test_request_errors(start_server, credential):
+    _, port = start_server(max_body=100, max_batch=1)
+    assert request(port, "GET", "/nowhere")[0] == 404
+    assert request(port, "GET", "/validate")[0] == 405
+    assert request(port, "POST", "/health")[0] == 405
+    assert request(port, "POST", "/validate", "x" * 101)[0] == 413
+    assert request(port, "POST", "/validate/batch", "[{}, {}]")[0] == 413
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"POST /validate HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        assert sock.makefile("rb").readline().startswith(b"HTTP/1.1 411 ")
+
+
+def test_saturated_pool_answers_503(start_server, monkeypatch, credential):
+    validation, port = start_server(max_pending=1)
+    release = threading.Event()
+    validate_body = server.validate_body
+
+    def slow_validate_body(*args):
+        release.wait(5)
+        return validate_body(*args)
+
+    monkeypatch.setattr(server, "validate_body", slow_validate_body)
+    with ThreadPoolExecutor(max_workers=1) as client:
+        first = client.submit(request, port, "POST", "/validate", json.dumps(credential))
+        deadline = time.monotonic() + 5
+        while validation.pending < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        status, headers, _ = request(port, "POST", "/validate", json.dumps(credential))
+        release.set()
+        assert first.result()[0] == 200
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+
+    status, _, health = request(port, "GET", "/health")
+    assert status == 200
+    assert health["status"] == "ok"
+    assert health["pending"] == 0 and health["max_pending"] == 1
+    assert (health["requests"], health["validated"], health["rejected"], health["errors"]) == (3, 1, 1, 0)
+    assert health["responses"] == {"200": 1, "503": 1}
+
+
+def test_connections_are_kept_alive(start_server, credential):
+    _, port = start_server()
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        sockets = set()
+        for _ in range(3):
+            connection.request("POST", "/validate", json.dumps(credential))
+            response = connection.getresponse()
+            assert response.status == 200
+            assert response.getheader("Connection") == "keep-alive"
+            response.read()
+            sockets.add(connection.sock)
+        assert len(sockets) == 1
+        connection.request("GET", "/health", headers={"Connection": "close"})
+        response = connection.getresponse()
+        assert response.getheader("Connection") == "close"
+        assert json.loads(response.read())["requests"] == 4
+    finally:
+        connection.close()
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import socket
+import threading
+import pytest
+from vc_test_suite.shards import ShardLock, ShardedRun
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "shard.lock")
+    assert ShardLock(path).acquire()
+    assert not ShardLock(path).acquire()
+
+
+@pytest.mark.parametrize("contents", ["", "{", "[]"])
+def test_abandoned_lock_goes_stale(tmp_path, contents):
+    path = tmp_path / "shard.lock"
+    path.write_text(contents, encoding="utf-8")
+    assert not ShardLock(str(path)).acquire()
+    age(path, 60)
+    assert ShardLock(str(path)).acquire()
+    assert json.loads(path.read_text(encoding="utf-8"))["pid"] == os.getpid()
+
+
+def test_lock_of_a_dead_process_goes_stale(tmp_path):
+    path = tmp_path / "shard.lock"
+    path.write_text(json.dumps({"host": socket.gethostname(), "pid": 2 ** 22 + 1}), encoding="utf-8")
+    assert ShardLock(str(path)).acquire()
+
+
+def test_takeover_gives_back_a_fresh_claim(tmp_path):
+    path = str(tmp_path / "shard.lock")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"host": "elsewhere", "pid": 1}, file)
+    age(path, 7200)
+    late = ShardLock(path, lease=60)
+    stale = late._stale()
+    assert stale
+    # Another contender takes the stale lock over first.
+    assert ShardLock(path, lease=60).acquire()
+    with open(path, encoding="utf-8") as file:
+        fresh = file.read()
+    assert not late._take_over(stale)
+    with open(path, encoding="utf-8") as file:
+        assert file.read() == fresh
+    assert os.listdir(tmp_path) == ["shard.lock"]
+
+
+def test_run_resumes_and_merges(tmp_path, credential):
+    corpus = tmp_path / "corpus.ndjson"
+    corpus.write_text("".join(json.dumps(dict(credential, id=f"urn:uuid:{n}")) + "\n" for n in range(25)), encoding="utf-8")
+    run_dir = str(tmp_path / "run")
+    run = ShardedRun(run_dir, str(corpus), shard_size=10)
+    # An empty manifest lock left by a crash does not stop a restart.
+    lock = os.path.join(run_dir, "manifest.json.lock")
+    open(lock, "w").close()
+    age(lock, 60)
+    run = ShardedRun(run_dir, str(corpus), shard_size=10, lease=1)
+    assert run.run(workers=0) == 3
+    assert run.merge()
+    with open(os.path.join(run_dir, "results.ndjson"), encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert [line["line"] for line in lines] == list(range(1, 26))
+    assert ShardedRun(run_dir, str(corpus), shard_size=10).run(workers=0) == 0
+
+
+def test_manifest_wait_is_bounded(tmp_path, credential):
+    corpus = tmp_path / "corpus.ndjson"
+    corpus.write_text(json.dumps(credential) + "\n", encoding="utf-8")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    lock = run_dir / "manifest.json.lock"
+    lock.write_text(json.dumps({"host": "elsewhere", "pid": 1}), encoding="utf-8")
+    done = threading.Event()
+
+    def keep_alive():
+        # A holder elsewhere that keeps its claim alive but never lets go.
+        while not done.wait(0.05):
+            os.utime(lock)
+
+    holder = threading.Thread(target=keep_alive)
+    holder.start()
+    try:
+        with pytest.raises(TimeoutError):
+            ShardedRun(str(run_dir), str(corpus), lease=0.5)
+    finally:
+        done.set()
+        holder.join()
@@ -0,0 +1,39 @@
+import io
+import json
+from vc_test_suite.startup import parse_importtime, profile_imports
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       112 |        112 |   _io
+import time:        47 |         47 |   marshal
+import time:       398 |        557 | _frozen_importlib_external
+import time:      1043 |       1043 |     encodings.aliases
+import time:      2101 |       3144 |   encodings
+Traceback (most recent call last):
+import time: not | a | number
+import time:         9 |          9 | vc_test_suite
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(SAMPLE.splitlines()) == [
+        ("_io", 112, 112, 1),
+        ("marshal", 47, 47, 1),
+        ("_frozen_importlib_external", 398, 557, 0),
+        ("encodings.aliases", 1043, 1043, 2),
+        ("encodings", 2101, 3144, 1),
+        ("vc_test_suite", 9, 9, 0),
+    ]
+
+
+def test_profile_imports(credential, capfd):
+    report = io.StringIO()
+    assert profile_imports([json.dumps(credential)], limit=3, stream=report) == 0
+    assert json.loads(capfd.readouterr().out)["conformant"]
+    lines = report.getvalue().splitlines()
+    assert not any(line.startswith("import time:") for line in lines)
+    summary = next(index for index, line in enumerate(lines) if line.startswith("Startup imports: "))
+    assert len(lines[summary + 2:]) == 3
+    report = io.StringIO()
+    assert profile_imports(["not json"], stream=report) != 0
+    assert "JSONDecodeError" in report.getvalue()
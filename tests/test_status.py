@@ -0,0 +1,65 @@
+import gzip
+import base64
+import pytest
+from vc_test_suite.status import StatusChecker, StatusListStore, decode_list
+
+LIST_URL = "https://example.com/status/1"
+
+
+def encode(bits):
+    return "u" + base64.urlsafe_b64encode(gzip.compress(bytes(bits))).decode("ascii").rstrip("=")
+
+
+@pytest.fixture
+def checker():
+    # Bit 3 (0x10 in the first byte) is set: index 0 is the top bit.
+    lists = {
+        LIST_URL: {
+            "credentialSubject": {"type": "StatusList2021", "statusPurpose": "revocation", "encodedList": encode([0x10] + [0] * 15)}
+        }
+    }
+    return StatusChecker(StatusListStore(lists))
+
+
+def entry(index, purpose="revocation", url=LIST_URL):
+    return {"type": "StatusList2021Entry", "statusPurpose": purpose, "statusListCredential": url, "statusListIndex": index}
+
+
+def test_decode_list_accepts_both_alphabets():
+    data = gzip.compress(b"\xff\x00")
+    assert decode_list(base64.b64encode(data).decode("ascii")) == b"\xff\x00"
+    assert decode_list("u" + base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")) == b"\xff\x00"
+
+
+@pytest.mark.parametrize("index, revoked", [("3", True), ("2", False), ("4", False), ("127", False)])
+def test_revocation_bit(checker, credential, index, revoked):
+    result = checker.check(dict(credential, credentialStatus=entry(index)))
+    assert result["revoked"] is revoked
+    assert result["entries"][0]["error"] is None
+
+
+@pytest.mark.parametrize("index", ["²", "-1", "3.0", "", 3, "128"])
+def test_unusable_index_is_reported(checker, credential, index):
+    result = checker.check(dict(credential, credentialStatus=entry(index)))
+    assert not result["revoked"]
+    assert result["entries"][0]["error"]
+
+
+def test_purpose_must_match_the_list(checker, credential):
+    result = checker.check(dict(credential, credentialStatus=entry("3", purpose="suspension")))
+    assert not result["suspended"]
+    assert "does not match" in result["entries"][0]["error"]
+
+
+@pytest.mark.parametrize("status", [5, "abc", None])
+def test_malformed_credential_status_is_the_credentials_error(checker, credential, status):
+    result = checker.check(dict(credential, credentialStatus=status))
+    assert result == {"revoked": False, "suspended": False, "entries": [], "error": "credentialStatus MUST be one or more objects"}
+
+
+def test_check_many_resolves_each_list_once(checker, credential):
+    credentials = [dict(credential, credentialStatus=[entry(str(index)), entry("0", url="https://example.com/missing")]) for index in range(8)]
+    results = checker.check_many(credentials)
+    assert [result["revoked"] for result in results] == [index == 3 for index in range(8)]
+    assert all("could not be resolved" in result["entries"][1]["error"] for result in results)
+    assert checker.stats()["misses"] == 2
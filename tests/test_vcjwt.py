@@ -0,0 +1,64 @@
+import pytest
+from helpers import jwt_segment as segment, jwt as token
+from vc_test_suite import vcjwt
+from vc_test_suite.vcjwt import JwtError
+
+
+def test_decode_maps_the_registered_claims(credential):
+    vc = {key: value for key, value in credential.items() if key not in ("id", "issuer", "issuanceDate")}
+    header, decoded = vcjwt.decode(token({
+        "vc": vc,
+        "iss": "did:example:issuer",
+        "nbf": 1577836800,
+        "exp": 1609459200.5,
+        "jti": "urn:uuid:1",
+        "sub": "did:example:someone",
+    }))
+    assert header == {"alg": "EdDSA", "kid": "did:example:issuer#key-1"}
+    assert decoded["issuer"] == "did:example:issuer"
+    assert decoded["issuanceDate"] == "2020-01-01T00:00:00Z"
+    assert decoded["expirationDate"] == "2021-01-01T00:00:00.500000Z"
+    assert decoded["id"] == "urn:uuid:1"
+    assert decoded["credentialSubject"] == {"id": "did:example:someone"}
+    assert "issuer" not in vc
+
+
+def test_iss_keeps_an_object_issuer():
+    decoded = vcjwt.decode(token({"vc": {"issuer": {"id": "did:example:old", "name": "Issuer"}}, "iss": "did:example:new"}))[1]
+    assert decoded["issuer"] == {"id": "did:example:new", "name": "Issuer"}
+
+
+def test_sub_without_a_subject():
+    assert vcjwt.decode(token({"vc": {}, "sub": "did:example:s"}))[1]["credentialSubject"] == {"id": "did:example:s"}
+
+
+def test_payload_without_vc_claim_is_the_credential(credential):
+    assert vcjwt.decode(token(credential))[1] == credential
+
+
+def test_decoded_credential_is_checked(credential):
+    assert vcjwt.test_vc_jwt(token({"vc": credential}))["conformant"]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("a.b", "three dot-separated segments"),
+        ("a.b.c.d", "three dot-separated segments"),
+        (token({"iss": "did:example:issuer"}), "neither a vc claim nor a credential"),
+        (token({"vc": []}), "vc claim MUST be a JSON object"),
+        (token({"vc": {}, "nbf": "2020"}), "nbf MUST be a NumericDate"),
+        (token({"vc": {}, "exp": True}), "exp MUST be a NumericDate"),
+        (segment({"alg": "none"}) + ".!!!.", "payload is not base64url"),
+        (segment({"alg": "none"}) + "." + segment(b"not json") + ".", "payload is not JSON"),
+        (segment([1]) + "." + segment({}) + ".", "header MUST be a JSON object"),
+    ],
+)
+def test_bad_tokens_are_rejected(text, message):
+    with pytest.raises(JwtError, match=message):
+        vcjwt.decode(text)
+
+
+def test_looks_like_jwt():
+    assert vcjwt.looks_like_jwt(token({}))
+    assert not vcjwt.looks_like_jwt('{"@context": []}')
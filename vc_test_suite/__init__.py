@@ -1 +1,17 @@
-from .w3c import test_data_model_v1
\ No newline at end of file
+# The exports are loaded on first use, so importing the package, or a module
+# in it, does not load and compile the rules of a ruleset that is not used.
+_EXPORTS = {
+    "test_data_model_v1": "vc_test_suite.w3c",
+    "test_data_model_v1_compact": "vc_test_suite.w3c",
+    "test_data_model": "vc_test_suite.rulesets",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
@@ -1,12 +1,60 @@
-from .w3c import test_data_model_v1
+from .rules import MODES
+from .rulesets import UnknownRuleset, test_data_model
+from .vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
 import sys
 import json
+import importlib
+
+# Subcommands are imported only when they are used, so a plain single
+# credential run never loads the pool, server or benchmark machinery.
+COMMANDS = {
+    "batch": "vc_test_suite.batch",
+    "serve": "vc_test_suite.server",
+    "benchmark": "vc_test_suite.benchmark",
+    "presentation": "vc_test_suite.presentation",
+    "report": "vc_test_suite.report",
+    "verify": "vc_test_suite.proofs",
+    "corpus": "vc_test_suite.corpus",
+    "run": "vc_test_suite.shards",
+    "status": "vc_test_suite.status",
+    "schema": "vc_test_suite.schemas",
+}
 
 def main():
     args = sys.argv[1:]
-    vc = json.loads(args[0])
-    results = json.dumps(test_data_model_v1(vc), indent=2)
+    if "--startup-profile" in args:
+        from .startup import profile_imports
+        args.remove("--startup-profile")
+        return profile_imports(args)
+    if args and args[0] in COMMANDS:
+        return importlib.import_module(COMMANDS[args[0]]).main(args[1:])
+    mode = "full"
+    if "--mode" in args:
+        position = args.index("--mode")
+        mode = args[position + 1] if position + 1 < len(args) else ""
+        del args[position:position + 2]
+        if mode not in MODES:
+            print(f"--mode must be one of {', '.join(MODES)}", file=sys.stderr)
+            return 2
+    ruleset = None
+    if "--ruleset" in args:
+        position = args.index("--ruleset")
+        ruleset = args[position + 1] if position + 1 < len(args) else ""
+        del args[position:position + 2]
+    if looks_like_jwt(args[0]):
+        try:
+            vc = decode_jwt(args[0])[1]
+        except JwtError as error:
+            print(f"Invalid VC-JWT: {error}", file=sys.stderr)
+            return 2
+    else:
+        vc = json.loads(args[0])
+    try:
+        results = json.dumps(test_data_model(vc, mode=mode, ruleset=ruleset), indent=2)
+    except UnknownRuleset as error:
+        print(error, file=sys.stderr)
+        return 2
     print(results)
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import argparse
+from collections import deque
+from itertools import islice
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from vc_test_suite import rulesets
+from vc_test_suite.rules import MODES
+from vc_test_suite.jsonstream import StreamError, iter_json_items
+from vc_test_suite.rulesets import test_data_model
+from vc_test_suite.vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
+
+# Replaced per process by init_worker when results are cached.
+validate = test_data_model
+
+
+def init_worker(cache_size=0, cache_dir=None, mode="full", ruleset=None):
+    global validate
+    if mode == "full" and ruleset is None:
+        validate = test_data_model
+    else:
+        validate = partial(test_data_model, mode=mode, ruleset=ruleset)
+    if cache_size or cache_dir:
+        from vc_test_suite.cache import ResultCache
+
+        if cache_dir is not None and mode != "full":
+            # Results of other modes have another shape; keep them apart.
+            cache_dir = os.path.join(cache_dir, mode)
+        if cache_dir is not None and ruleset is not None:
+            cache_dir = os.path.join(cache_dir, ruleset)
+        validate = ResultCache(maxsize=cache_size or 1, directory=cache_dir, validate=validate)
+
+
+def read_ndjson(stream):
+    """Yield (line_number, line) for every non-blank line of an NDJSON stream."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+
+def validate_line(line_number, line, location="line"):
+    """Validate one JSON text or VC-JWT; ``location`` names the ``line_number`` field of the output."""
+    try:
+        vc = decode_jwt(line)[1] if looks_like_jwt(line) else json.loads(line)
+        if isinstance(vc, str) and looks_like_jwt(vc):
+            vc = decode_jwt(vc)[1]
+    except JwtError as error:
+        return json.dumps({location: line_number, "error": f"Invalid VC-JWT: {error}"})
+    except ValueError as error:
+        return json.dumps({location: line_number, "error": f"Invalid JSON: {error}"})
+    if not isinstance(vc, dict):
+        return json.dumps({location: line_number, "error": "Credential MUST be a JSON object."})
+    try:
+        results = validate(vc)
+    except Exception as error:
+        return json.dumps({location: line_number, "error": f"Validation failed: {error!r}"})
+    return json.dumps({location: line_number, "result": results})
+
+
+def validate_chunk(chunk, location="line"):
+    return [validate_line(line_number, line, location) for line_number, line in chunk]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_stream(lines, workers=None, chunksize=64, ordered=True, max_pending=None, cache_size=0, cache_dir=None, mode="full", ruleset=None, location="line"):
+    """Validate (line_number, line) pairs and yield one JSON result line each.
+
+    With ``workers=0`` everything runs in the calling process. Otherwise chunks
+    of ``chunksize`` lines are fanned out over a process pool with at most
+    ``max_pending`` chunks in flight, so memory does not grow with the input.
+    ``cache_size`` and ``cache_dir`` give every process a ResultCache.
+    ``mode`` and ``ruleset`` are passed on to rulesets.test_data_model, which
+    picks the ruleset from each credential's @context when ``ruleset`` is
+    None. Results carry the number as
+    ``location``, "offset" for items of jsonstream.iter_json_items.
+    """
+    chunks = chunked(lines, chunksize)
+    if workers == 0:
+        init_worker(cache_size, cache_dir, mode, ruleset)
+        for chunk in chunks:
+            yield from validate_chunk(chunk, location)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(cache_size, cache_dir, mode, ruleset)) as executor:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(validate_chunk, chunk, location))
+            while pending:
+                yield from pending.popleft().result()
+        else:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+                pending.add(executor.submit(validate_chunk, chunk, location))
+            for future in as_completed(pending):
+                yield from future.result()
+
+
+def check_ndjson(source, check_many, batch_size=1000, output=None):
+    """Print one result line per credential of an NDJSON stream, checked in batches.
+
+    ``check_many`` takes a list of up to ``batch_size`` credentials and
+    returns their results in order. Lines that are not JSON objects are not
+    passed on; they get an error line instead.
+    """
+    output = output or sys.stdout
+    for chunk in chunked(read_ndjson(source), batch_size):
+        credentials = []
+        errors = {}
+        for line_number, line in chunk:
+            try:
+                vc = json.loads(line)
+            except ValueError as error:
+                errors[line_number] = f"Invalid JSON: {error}"
+                continue
+            if not isinstance(vc, dict):
+                errors[line_number] = "Credential MUST be a JSON object."
+                continue
+            credentials.append(vc)
+        results = iter(check_many(credentials))
+        for line_number, _ in chunk:
+            if line_number in errors:
+                print(json.dumps({"line": line_number, "error": errors[line_number]}), file=output)
+            else:
+                print(json.dumps({"line": line_number, "result": next(results)}), file=output)
+
+
+def run_batch(source, output, format="ndjson", **options):
+    """Validate ``source`` into ``output``; for the "json" format ``source`` must be binary."""
+    if format == "json":
+        items = iter_json_items(source)
+        options["location"] = "offset"
+    else:
+        items = read_ndjson(source)
+    for result in validate_stream(items, **options):
+        output.write(result)
+        output.write("\n")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite batch",
+        description="Validate newline-delimited JSON credentials or VC-JWTs, or a JSON array of them, one result line per credential.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="file to read, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="file to write results to, '-' for stdout (default)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes, 0 to validate in-process (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=64, help="lines handed to a worker at a time (default: 64)")
+    parser.add_argument("--max-pending", type=int, default=None, help="chunks in flight at once (default: 2 x workers)")
+    parser.add_argument("--cache-size", type=int, default=0, help="cache up to this many results per process, keyed by the canonical credential")
+    parser.add_argument("--cache-dir", default=None, help="also keep cached results in this directory, shared between runs")
+    parser.add_argument("--unordered", action="store_true", help="emit results as soon as they are ready instead of in input order")
+    parser.add_argument("--format", choices=("ndjson", "json"), default="ndjson", help="ndjson, or json: one large array or concatenated documents, read incrementally (default: ndjson)")
+    parser.add_argument("--mode", choices=MODES, default="full", help="checks to run: all, only required ones, or up to the first failure (default: full)")
+    parser.add_argument("--ruleset", choices=rulesets.names(), default=None, help="ruleset to check every credential against (default: detected from @context)")
+    args = parser.parse_args(argv)
+
+    if args.format == "json":
+        source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    else:
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        run_batch(
+            source,
+            output,
+            format=args.format,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            ordered=not args.unordered,
+            max_pending=args.max_pending,
+            cache_size=args.cache_size,
+            cache_dir=args.cache_dir,
+            mode=args.mode,
+            ruleset=args.ruleset,
+        )
+    except StreamError as error:
+        print(f"vc_test_suite batch: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if source not in (sys.stdin, sys.stdin.buffer):
+            source.close()
+        if output is not sys.stdout:
+            output.close()
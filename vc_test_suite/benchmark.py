@@ -0,0 +1,356 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from vc_test_suite.w3c import test_data_model_v1, BASE_CONTEXT_V1
+from vc_test_suite.batch import validate_line, validate_stream
+from vc_test_suite.timestamps import is_xml_datetime, parse_xml_datetime
+
+KINDS = ("minimal", "typical", "pathological", "mixed")
+MODES = ("single", "batch", "pool")
+
+# Share of each kind in a "mixed" corpus.
+MIXED_WEIGHTS = {"minimal": 10, "typical": 80, "pathological": 10}
+
+EXAMPLES_CONTEXT_V1 = "https://www.w3.org/2018/credentials/examples/v1"
+
+
+def _did(rng):
+    return f"did:example:{rng.getrandbits(96):024x}"
+
+
+# Timezones of generated timestamps, named as they are written.
+ZONES = (
+    timezone(timedelta(0), "Z"),
+    timezone(timedelta(hours=2), "+02:00"),
+    timezone(-timedelta(hours=7, minutes=30), "-07:30"),
+)
+
+
+def _moment(rng):
+    return datetime(
+        rng.randint(2000, 2040),
+        rng.randint(1, 12),
+        rng.randint(1, 28),
+        rng.randint(0, 23),
+        rng.randint(0, 59),
+        rng.randint(0, 59),
+        tzinfo=rng.choice(ZONES),
+    )
+
+
+def _timestamp(rng, fraction_digits=0, moment=None):
+    if moment is None:
+        moment = _moment(rng)
+    stamp = "%04d-%02d-%02dT%02d:%02d:%02d" % (
+        moment.year,
+        moment.month,
+        moment.day,
+        moment.hour,
+        moment.minute,
+        moment.second,
+    )
+    if fraction_digits:
+        stamp += "." + "".join(rng.choice("0123456789") for _ in range(fraction_digits))
+    return stamp + moment.tzname()
+
+
+def _expiration(rng, issued, fraction_digits=0):
+    # At least a day after the issuance, whatever the fractions and offsets.
+    later = issued + timedelta(days=rng.randint(1, 3650), seconds=rng.randint(0, 86399))
+    return _timestamp(rng, fraction_digits, later)
+
+
+def minimal_credential(rng):
+    return {
+        "@context": [BASE_CONTEXT_V1],
+        "type": ["VerifiableCredential"],
+        "issuer": _did(rng),
+        "issuanceDate": _timestamp(rng),
+        "credentialSubject": {"id": _did(rng)},
+    }
+
+
+def typical_credential(rng):
+    serial = rng.getrandbits(32)
+    issued = _moment(rng)
+    vc = {
+        "@context": [BASE_CONTEXT_V1, EXAMPLES_CONTEXT_V1],
+        "id": f"https://example.edu/credentials/{serial}",
+        "type": ["VerifiableCredential", "UniversityDegreeCredential"],
+        "issuer": rng.choice([_did(rng), {"id": _did(rng), "name": "Example University"}]),
+        "issuanceDate": _timestamp(rng, moment=issued),
+        "credentialSubject": {
+            "id": _did(rng),
+            "degree": {"type": "BachelorDegree", "name": "Bachelor of Science and Arts"},
+        },
+        "proof": {
+            "type": "Ed25519Signature2020",
+            "created": _timestamp(rng),
+            "verificationMethod": f"{_did(rng)}#key-1",
+            "proofPurpose": "assertionMethod",
+            "proofValue": "z" + "".join(rng.choice("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz") for _ in range(86)),
+        },
+    }
+    if rng.random() < 0.5:
+        vc["expirationDate"] = _expiration(rng, issued)
+    if rng.random() < 0.3:
+        vc["credentialStatus"] = {"id": f"https://example.edu/status/{serial}", "type": "CredentialStatusList2017"}
+    if rng.random() < 0.3:
+        vc["credentialSchema"] = {"id": "https://example.org/examples/degree.json", "type": "JsonSchemaValidator2018"}
+    if rng.random() < 0.1:
+        vc["refreshService"] = {"id": f"https://example.edu/refresh/{serial}", "type": "ManualRefreshService2018"}
+    if rng.random() < 0.1:
+        vc["termsOfUse"] = [{"type": "IssuerPolicy", "id": "http://example.com/policies/credential/4"}]
+    if rng.random() < 0.1:
+        vc["evidence"] = [{"id": f"https://example.edu/evidence/{serial}", "type": ["DocumentVerification"]}]
+    return vc
+
+
+def pathological_credential(rng):
+    vc = typical_credential(rng)
+    vc["type"] = ["VerifiableCredential"] + [f"ExampleType{index}" for index in range(rng.randint(500, 1500))]
+    vc["evidence"] = [
+        {"id": f"https://example.edu/evidence/{index}", "type": ["DocumentVerification"]}
+        for index in range(rng.randint(100, 500))
+    ]
+    vc["termsOfUse"] = [
+        {"type": "IssuerPolicy", "id": f"http://example.com/policies/credential/{index}"}
+        for index in range(rng.randint(100, 500))
+    ]
+    issuer = {"id": _did(rng)}
+    for _ in range(rng.randint(20, 60)):
+        issuer = {"id": _did(rng), "parentOrganization": issuer}
+    vc["issuer"] = issuer
+    issued = _moment(rng)
+    vc["issuanceDate"] = _timestamp(rng, rng.randint(100, 1000), issued)
+    vc["expirationDate"] = _expiration(rng, issued, rng.randint(100, 1000))
+    return vc
+
+
+GENERATORS = {
+    "minimal": minimal_credential,
+    "typical": typical_credential,
+    "pathological": pathological_credential,
+}
+
+
+def generate_corpus(kind="typical", count=1000, seed=0):
+    """Yield ``count`` synthetic credentials; the same arguments give the same corpus."""
+    rng = random.Random(f"{kind}:{seed}")
+    kinds = list(MIXED_WEIGHTS)
+    weights = list(MIXED_WEIGHTS.values())
+    for _ in range(count):
+        chosen = rng.choices(kinds, weights)[0] if kind == "mixed" else kind
+        yield GENERATORS[chosen](rng)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _run_single(credentials):
+    latencies = []
+    clock = time.perf_counter
+    for vc in credentials:
+        start = clock()
+        test_data_model_v1(vc)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _run_batch(lines):
+    # What a batch run does per line: parse, validate and serialize.
+    latencies = []
+    clock = time.perf_counter
+    for line_number, line in enumerate(lines, start=1):
+        start = clock()
+        validate_line(line_number, line)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def _run_pool(lines, workers):
+    # Pooled results arrive in chunks, so the latency of a result is the time
+    # since the previous one reached the consumer.
+    latencies = []
+    clock = time.perf_counter
+    previous = clock()
+    for _ in validate_stream(enumerate(lines, start=1), workers=workers):
+        now = clock()
+        latencies.append(now - previous)
+        previous = now
+    return latencies
+
+
+def _run_mode(mode, credentials, lines, workers):
+    if mode == "single":
+        return _run_single(credentials)
+    if mode == "batch":
+        return _run_batch(lines)
+    return _run_pool(lines, workers)
+
+
+def measure(mode, credentials, lines, workers=None, memory=True):
+    """Time one mode over a corpus and return its statistics as a dict."""
+    import resource
+
+    _run_mode(mode, credentials[:10], lines[:10], workers)
+
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    start = time.perf_counter()
+    latencies = _run_mode(mode, credentials, lines, workers)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    stats = {
+        "mode": mode,
+        "count": len(latencies),
+        "seconds": round(elapsed, 6),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+    }
+    if mode == "pool":
+        stats["workers"] = workers or os.cpu_count()
+        stats["peak_worker_rss_kb"] = max(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss, children_before)
+    elif memory:
+        # A separate pass, tracing allocations distorts timings.
+        tracemalloc.start()
+        _run_mode(mode, credentials, lines, workers)
+        stats["peak_traced_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return stats
+
+
+def package_version():
+    from importlib import metadata
+
+    try:
+        return metadata.version("vc_test_suite")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def run_benchmark(credentials, modes=MODES, workers=None, memory=True, corpus=None):
+    lines = [json.dumps(vc) for vc in credentials]
+    return {
+        "version": package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": corpus or {},
+        "results": [measure(mode, credentials, lines, workers, memory) for mode in modes],
+    }
+
+
+# The timestamp check before the XMLSCHEMA11-2 parser, kept for comparison.
+LEGACY_TIMESTAMP_REGEX = r"^(-?(?:[1-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[01]|0[1-9]|[12][0-9])T(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$"
+
+
+def legacy_valid_xml_timestamp(timestamp):
+    return re.compile(LEGACY_TIMESTAMP_REGEX).match(timestamp) is not None
+
+
+def benchmark_timestamps(count=100000, seed=0):
+    """Compare the legacy timestamp regex with is_xml_datetime and parse_xml_datetime."""
+    rng = random.Random(f"timestamps:{seed}")
+    stamps = [_timestamp(rng, fraction_digits=rng.choice([0, 0, 0, 3, 9])) for _ in range(count)]
+    candidates = {
+        "legacy_regex": legacy_valid_xml_timestamp,
+        "xmlschema_check": is_xml_datetime,
+        "xmlschema_parser": parse_xml_datetime,
+    }
+    results = []
+    for name, function in candidates.items():
+        start = time.perf_counter()
+        for stamp in stamps:
+            function(stamp)
+        elapsed = time.perf_counter() - start
+        results.append({"implementation": name, "count": count, "seconds": round(elapsed, 6), "ns_per_call": round(elapsed / count * 1e9, 1)})
+    return {"python": platform.python_version(), "results": results}
+
+
+def format_report(report):
+    corpus = ", ".join(f"{key}={value}" for key, value in report["corpus"].items())
+    rows = [
+        f"vc_test_suite {report['version']} on Python {report['python']} ({report['cpus']} CPUs) {corpus}",
+        f"{'mode':<8} {'count':>8} {'cred/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak kb':>10}",
+    ]
+    for stats in report["results"]:
+        peak = stats.get("peak_traced_kb", stats.get("peak_worker_rss_kb", "-"))
+        rows.append(
+            f"{stats['mode']:<8} {stats['count']:>8} {stats['throughput']:>10} "
+            f"{stats['p50_ms']:>9} {stats['p99_ms']:>9} {peak:>10}"
+        )
+    return "\n".join(rows)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite benchmark",
+        description="Generate synthetic credential corpora and measure validation speed.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic corpus as NDJSON")
+    run = commands.add_parser("run", help="benchmark validation over a corpus")
+    timestamps = commands.add_parser("timestamps", help="compare the dateTime parser with the legacy regex")
+    timestamps.add_argument("--count", type=int, default=100000, help="timestamps to check (default: 100000)")
+    timestamps.add_argument("--seed", type=int, default=0, help="seed for the generated timestamps (default: 0)")
+    timestamps.add_argument("--json", action="store_true", help="print the report as JSON")
+    for command in (generate, run):
+        command.add_argument("--kind", choices=KINDS, default="typical", help="credential shapes to generate (default: typical)")
+        command.add_argument("--count", type=int, default=1000, help="credentials to generate (default: 1000)")
+        command.add_argument("--seed", type=int, default=0, help="seed, the same seed gives the same corpus (default: 0)")
+    generate.add_argument("-o", "--output", default="-", help="file to write, '-' for stdout (default)")
+    run.add_argument("--corpus", default=None, help="benchmark an NDJSON file instead of a generated corpus")
+    run.add_argument("--modes", default=",".join(MODES), help=f"comma separated modes out of {', '.join(MODES)} (default: all)")
+    run.add_argument("-w", "--workers", type=int, default=None, help="worker processes for the pool mode (default: CPU count)")
+    run.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    run.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            for vc in generate_corpus(args.kind, args.count, args.seed):
+                output.write(json.dumps(vc))
+                output.write("\n")
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
+
+    if args.command == "timestamps":
+        report = benchmark_timestamps(args.count, args.seed)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            for stats in report["results"]:
+                print(f"{stats['implementation']:<18} {stats['ns_per_call']:>10} ns/call")
+        return
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as file:
+            credentials = [json.loads(line) for line in file if line.strip()]
+        corpus = {"file": args.corpus, "count": len(credentials)}
+    else:
+        credentials = list(generate_corpus(args.kind, args.count, args.seed))
+        corpus = {"kind": args.kind, "count": args.count, "seed": args.seed}
+
+    report = run_benchmark(credentials, modes, args.workers, not args.no_memory, corpus)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
@@ -0,0 +1,176 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from functools import lru_cache
+from collections.abc import Mapping
+from cachetools import Cache, LRUCache, TTLCache
+from vc_test_suite.w3c import test_data_model_v1
+
+
+def _to_json(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def canonical_json(vc):
+    """Serialize a credential with sorted keys and no insignificant whitespace."""
+    return json.dumps(vc, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_to_json)
+
+
+def credential_digest(canonical):
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint():
+    """SHA-256 of the package's modules and bundled contexts, which decide every verdict."""
+    digest = hashlib.sha256()
+    for directory, subdirectories, names in os.walk(PACKAGE_DIR):
+        subdirectories[:] = sorted(name for name in subdirectories if name != "__pycache__")
+        for name in sorted(names):
+            if name.endswith((".py", ".jsonld")):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, PACKAGE_DIR).encode("utf-8") + b"\0")
+                with open(path, "rb") as file:
+                    digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def results_fingerprint():
+    """Fingerprint of what validation results depend on besides the credential.
+
+    That is the code and bundled contexts of the package and how the
+    context loader may reach other contexts.
+    """
+    from vc_test_suite import context_loader
+
+    loader = context_loader.document_loader
+    mode = "offline" if loader.offline else "online" if loader.allow is None else "allow:" + "|".join(sorted(loader.allow))
+    return hashlib.sha256(f"{code_fingerprint()}\0{mode}".encode("utf-8")).hexdigest()[:16]
+
+
+class _CountEvictions:
+    evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class _LRUCache(_CountEvictions, LRUCache):
+    pass
+
+
+class _TTLCache(_CountEvictions, TTLCache):
+    def expire(self, time=None):
+        # Expired entries are dropped here, not through popitem().
+        size = Cache.__len__(self)
+        expired = super().expire(time)
+        self.evictions += size - Cache.__len__(self)
+        return expired
+
+
+class ResultCache:
+    """Memoize validation results by the canonical form of the credential.
+
+    Entries are keyed by the SHA-256 of the canonical JSON and keep the
+    canonical JSON itself, which is compared on every hit, so a result is only
+    ever returned for a byte-identical credential. The in-memory tier is an LRU
+    (or TTL, when ``ttl`` seconds are given) bounded to ``maxsize`` entries.
+    With ``directory`` set, results are also written there, one file per
+    digest, and read back on a memory miss, so they survive restarts and can
+    be shared between processes. They go into a subdirectory named by
+    results_fingerprint(), so results of another version of the rules, or
+    of a loader that reaches other contexts, are never read back.
+
+    Cached results are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=10000, ttl=None, directory=None, validate=test_data_model_v1):
+        self._memory = _TTLCache(maxsize, ttl) if ttl else _LRUCache(maxsize)
+        self._lock = threading.Lock()
+        self._validate = validate
+        self.directory = None if directory is None else os.path.join(directory, results_fingerprint())
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __call__(self, vc):
+        return self.validate(vc)
+
+    def validate(self, vc):
+        canonical = canonical_json(vc)
+        digest = credential_digest(canonical)
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None and entry[0] == canonical:
+                self.hits += 1
+                return entry[1]
+
+        results = self._load(digest, canonical)
+        with self._lock:
+            if results is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+        if results is None:
+            results = self._validate(vc)
+            self._store(digest, canonical, results)
+
+        with self._lock:
+            self._memory[digest] = (canonical, results)
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self._memory.evictions,
+                "size": len(self._memory),
+                "maxsize": self._memory.maxsize,
+            }
+
+    def clear(self):
+        """Drop the in-memory tier. Files in ``directory`` are kept."""
+        with self._lock:
+            self._memory.clear()
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def _load(self, digest, canonical):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(digest), encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("credential") != canonical:
+            return None
+        return entry.get("results")
+
+    def _store(self, digest, canonical, results):
+        if self.directory is None:
+            return
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it so that concurrent readers
+        # never see a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"credential": canonical, "results": results}, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
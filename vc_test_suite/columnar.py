@@ -0,0 +1,214 @@
+from collections import namedtuple
+import numpy as np
+from vc_test_suite import messaging, w3c
+from vc_test_suite.rules import CompactResult, check_table
+from vc_test_suite.timestamps import is_xml_datetime, instant_from_datetime
+
+# Corpus-level evaluation: the properties of every credential are read once
+# into columns, each rule of the plan becomes a boolean column over all
+# credentials and the outcomes land in one int8 matrix. Needs numpy, which the
+# rest of the package does not.
+
+MISSING, STRING, OBJECT, ARRAY, OTHER = range(5)
+
+NOT_REPORTED, FAIL, PASS = -1, 0, 1
+
+# One top-level property across the corpus: its value per credential (None
+# when missing), a kind code, the length of arrays and their first entry.
+Feature = namedtuple("Feature", ["present", "values", "kind", "length", "first"])
+
+
+def extract_feature(credentials, key):
+    count = len(credentials)
+    values = np.empty(count, dtype=object)
+    kind = np.zeros(count, dtype=np.int8)
+    length = np.zeros(count, dtype=np.int64)
+    first = np.empty(count, dtype=object)
+    for row, vc in enumerate(credentials):
+        if key not in vc:
+            continue
+        value = vc[key]
+        values[row] = value
+        if isinstance(value, str):
+            kind[row] = STRING
+        elif w3c.is_object(value):
+            kind[row] = OBJECT
+        elif w3c.is_array(value):
+            kind[row] = ARRAY
+            length[row] = len(value)
+            if value:
+                first[row] = value[0]
+        else:
+            kind[row] = OTHER
+    return Feature(kind != MISSING, values, kind, length, first)
+
+
+def apply_check(check, feature, rows):
+    """Run a scalar check on ``rows``, once per distinct string value."""
+    passed = np.zeros(len(feature.values), dtype=bool)
+    memo = {}
+    for row in rows:
+        value = feature.values[row]
+        if feature.kind[row] == STRING:
+            result = memo.get(value)
+            if result is None:
+                result = memo[value] = bool(check(value))
+        else:
+            result = bool(check(value))
+        passed[row] = result
+    return passed
+
+
+def _strings(feature):
+    return np.flatnonzero(feature.kind == STRING)
+
+
+def _ordered_set(feature):
+    return (feature.kind == ARRAY) & (feature.length > 0)
+
+
+# Vectorized versions of the scalar checks in w3c. Checks not listed here, such
+# as the timed copies made by instrumentation, fall back to apply_check.
+KERNELS = {
+    w3c.is_ordered_set: _ordered_set,
+    w3c.has_base_context: lambda feature: _ordered_set(feature) & (feature.first == w3c.BASE_CONTEXT_V1),
+    w3c.has_specific_type: lambda feature: (feature.kind == ARRAY) & (feature.length > 1),
+    w3c.is_one_or_more_objects: lambda feature: (feature.kind == OBJECT) | (feature.kind == ARRAY),
+    w3c.is_timestamp: lambda feature: apply_check(is_xml_datetime, feature, _strings(feature)),
+    w3c.is_uri: lambda feature: apply_check(w3c.uri_check, feature, _strings(feature)),
+}
+
+
+def _check_column(check, feature, rows):
+    kernel = KERNELS.get(check)
+    if kernel is not None:
+        return kernel(feature)
+    return apply_check(check, feature, rows)
+
+
+def _contextual_column(check, feature, credentials, options, rows):
+    passed = np.zeros(len(credentials), dtype=bool)
+    for row in rows:
+        passed[row] = bool(check(feature.values[row], credentials[row], options))
+    return passed
+
+
+class CorpusResults:
+    """Outcomes of every check for a list of credentials.
+
+    ``outcomes`` has one row per credential and one column per check of
+    ``table``, a rules.CheckTable, holding PASS, FAIL or NOT_REPORTED for
+    checks that were not run, like the rules of a missing property.
+    """
+
+    def __init__(self, table, outcomes):
+        self.table = table
+        self.checks = table.checks
+        self.outcomes = outcomes
+        self._required = np.array([check.required for check in self.checks], dtype=bool)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    @property
+    def reported(self):
+        return self.outcomes != NOT_REPORTED
+
+    @property
+    def passed(self):
+        return self.outcomes == PASS
+
+    def scores(self):
+        """Return (required_pass, required_count, optional_pass, optional_count) per credential."""
+        reported = self.reported
+        passed = self.passed
+        return (
+            passed[:, self._required].sum(axis=1),
+            reported[:, self._required].sum(axis=1),
+            passed[:, ~self._required].sum(axis=1),
+            reported[:, ~self._required].sum(axis=1),
+        )
+
+    @property
+    def conformant(self):
+        required_pass, required_count, _, _ = self.scores()
+        return required_pass == required_count
+
+    def result(self, row):
+        """Expand one row into the dict test_data_model_v1 returns."""
+        return self.compact(row).expand()
+
+    def compact(self, row):
+        """Return one row as a CompactResult."""
+        outcomes = self.outcomes[row]
+        reported = sum(1 << int(bit) for bit in np.flatnonzero(outcomes != NOT_REPORTED))
+        passed = sum(1 << int(bit) for bit in np.flatnonzero(outcomes == PASS))
+        return CompactResult(self.table, reported, passed)
+
+    def statement_counts(self, statements=messaging.VCDM_V1_STATEMENTS):
+        """Count checked, passed and failed credentials for every statement.
+
+        Statements no rule checks are listed with zero counts.
+        """
+        checked = self.reported.sum(axis=0).tolist()
+        passed = self.passed.sum(axis=0).tolist()
+        totals = {}
+        for check, checked_count, passed_count in zip(self.checks, checked, passed):
+            total = totals.setdefault((check.key, check.statement), [0, 0])
+            total[0] += checked_count
+            total[1] += passed_count
+        counts = {}
+        for key, texts in statements.items():
+            counts[key] = []
+            for text in texts:
+                checked_count, passed_count = totals.get((key, text), (0, 0))
+                counts[key].append(
+                    {"statement": text, "checked": checked_count, "passed": passed_count, "failed": checked_count - passed_count}
+                )
+        return counts
+
+    def summary(self):
+        conformant = int(self.conformant.sum())
+        return {
+            "credentials": len(self),
+            "conformant": conformant,
+            "nonconformant": len(self) - conformant,
+            "statements": self.statement_counts(),
+        }
+
+
+def evaluate_corpus(plan, credentials, options=None):
+    """Run a compiled plan over many credentials, one rule at a time.
+
+    Gives the same outcomes as rules.evaluate on each credential.
+    """
+    credentials = list(credentials)
+    columns = []
+    for key, optional, statement, required, rules, presence in plan:
+        feature = extract_feature(credentials, key)
+        present = feature.present
+        columns.append(np.where(present, PASS, np.where(optional, NOT_REPORTED, FAIL)))
+        for statement, required, check, when, contextual in rules:
+            if contextual:
+                applies = present
+                if when is not None:
+                    applies = _contextual_column(when, feature, credentials, options, np.flatnonzero(present))
+                passed = _contextual_column(check, feature, credentials, options, np.flatnonzero(applies))
+            else:
+                applies = present
+                if when is not None:
+                    applies = present & _check_column(when, feature, np.flatnonzero(present))
+                passed = _check_column(check, feature, np.flatnonzero(applies))
+            columns.append(np.where(applies, np.where(passed, PASS, FAIL), NOT_REPORTED))
+    outcomes = np.column_stack(columns).astype(np.int8) if columns else np.empty((len(credentials), 0), dtype=np.int8)
+    return CorpusResults(check_table(plan), outcomes)
+
+
+def test_data_model_v1_corpus(credentials, now=None):
+    """Check a list of credentials against the VCDM 1.1 statements at once.
+
+    Row ``i`` of the returned CorpusResults agrees with
+    ``test_data_model_v1(credentials[i], now)``.
+    """
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    return evaluate_corpus(w3c.VCDM_V1_ACTIVE.plan, credentials, options)
@@ -0,0 +1,212 @@
+import os
+import json
+import threading
+from functools import lru_cache
+from cachetools import TTLCache
+
+# pyld, urllib.request, hashlib and tempfile are imported where they are used: bundled
+# contexts are answered without them, which keeps short-lived runs fast.
+
+# A context that could not be loaded is reported as not processable for this
+# many seconds before it is tried again; one that loaded is judged for good.
+LOAD_FAILURE_TTL = 60
+
+CONTEXTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contexts")
+
+# Well-known contexts shipped with the package, served without any lookup.
+BUNDLED_CONTEXTS = {
+    "https://www.w3.org/2018/credentials/v1": "credentials-v1.jsonld",
+    "https://www.w3.org/2018/credentials/examples/v1": "credentials-examples-v1.jsonld",
+    "https://w3id.org/security/v1": "security-v1.jsonld",
+    "https://w3id.org/security/v2": "security-v2.jsonld",
+    "https://w3id.org/security/suites/ed25519-2020/v1": "ed25519-2020-v1.jsonld",
+    "https://w3id.org/vc/status-list/2021/v1": "status-list-2021-v1.jsonld",
+    "https://www.w3.org/ns/did/v1": "did-v1.jsonld",
+    "https://www.w3.org/ns/odrl.jsonld": "odrl.jsonld",
+}
+
+
+def default_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "vc_test_suite", "contexts")
+
+
+class ContextLoader:
+    """A pyld document loader for JSON-LD contexts.
+
+    Contexts are looked up in the bundled set, then in memory, then in
+    ``cache_dir`` and only then fetched over the network, unless ``offline``
+    is set. With ``allow``, a sequence of URL prefixes, only URLs starting
+    with one of them are fetched. Fetched contexts are kept in memory and
+    written to ``cache_dir``.
+    """
+
+    def __init__(self, cache_dir=None, offline=False, timeout=10, allow=None):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.timeout = timeout
+        self.allow = tuple(allow) if allow is not None else None
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url, options=None):
+        return {
+            "contentType": "application/ld+json",
+            "contextUrl": None,
+            "documentUrl": url,
+            "document": self.load(url),
+        }
+
+    def load(self, url):
+        with self._lock:
+            document = self._documents.get(url)
+        if document is not None:
+            return document
+
+        if url in BUNDLED_CONTEXTS:
+            with open(os.path.join(CONTEXTS_DIR, BUNDLED_CONTEXTS[url]), encoding="utf-8") as file:
+                document = json.load(file)
+        else:
+            document = self._load_cached(url)
+            if document is None:
+                document = self._fetch(url)
+                self._store_cached(url, document)
+
+        with self._lock:
+            self._documents[url] = document
+        return document
+
+    def _cache_path(self, url):
+        import hashlib
+
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.jsonld")
+
+    def _load_cached(self, url):
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(url), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, url, document):
+        if self.cache_dir is None:
+            return
+        import tempfile
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(document, file)
+            os.replace(tmp_path, self._cache_path(url))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _fetch(self, url):
+        import urllib.request
+        from pyld import jsonld
+
+        if self.offline:
+            raise jsonld.JsonLdError(
+                "Context is not available offline.",
+                "jsonld.LoadDocumentError",
+                {"url": url},
+                code="loading remote context failed",
+            )
+        if self.allow is not None and not url.startswith(self.allow):
+            raise jsonld.JsonLdError(
+                "Context is not on the list of URLs that may be fetched.",
+                "jsonld.LoadDocumentError",
+                {"url": url},
+                code="loading remote context failed",
+            )
+        if not url.startswith(("http://", "https://")):
+            raise jsonld.JsonLdError(
+                "URL could not be dereferenced; only http(s) URLs are supported.",
+                "jsonld.InvalidUrl",
+                {"url": url},
+                code="loading remote context failed",
+            )
+        request = urllib.request.Request(url, headers={"Accept": "application/ld+json, application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except (OSError, ValueError) as cause:
+            raise jsonld.JsonLdError(
+                "Could not retrieve a JSON-LD document from the URL.",
+                "jsonld.LoadDocumentError",
+                {"url": url},
+                code="loading remote context failed",
+                cause=cause,
+            )
+
+
+def _default_loader():
+    return ContextLoader(
+        cache_dir=os.environ.get("VC_TEST_SUITE_CONTEXT_CACHE") or default_cache_dir(),
+        offline=os.environ.get("VC_TEST_SUITE_OFFLINE", "").lower() in ("1", "true", "yes"),
+    )
+
+
+document_loader = _default_loader()
+
+
+def configure(**options):
+    """Replace the loader used for context checks, see ContextLoader."""
+    global document_loader
+    document_loader = ContextLoader(**options)
+    _process_context.cache_clear()
+    with _load_failures_lock:
+        _load_failures.clear()
+
+
+def context_processable(context):
+    """Whether a single @context item (URL or object) is a valid JSON-LD context.
+
+    Results are memoized per URL or per serialized object, so a context shared
+    by many credentials is only resolved and processed once. A context that
+    could not be loaded, say for a network error, is only remembered for
+    LOAD_FAILURE_TTL seconds.
+    """
+    if isinstance(context, str):
+        if context in BUNDLED_CONTEXTS:
+            # Bundled contexts are known to process cleanly.
+            return True
+        key, is_object = context, False
+    else:
+        key, is_object = json.dumps(context, sort_keys=True, default=dict), True
+    with _load_failures_lock:
+        if _load_failures.get(key):
+            return False
+    try:
+        return _process_context(key, is_object)
+    except _LoadFailed:
+        with _load_failures_lock:
+            _load_failures[key] = True
+        return False
+
+
+class _LoadFailed(Exception):
+    """Raised instead of returning False, so that lru_cache does not keep it."""
+
+
+_load_failures = TTLCache(maxsize=4096, ttl=LOAD_FAILURE_TTL)
+_load_failures_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _process_context(key, is_object):
+    from pyld import jsonld
+
+    context = json.loads(key) if is_object else key
+    try:
+        jsonld.expand({"@context": context}, {"documentLoader": document_loader})
+    except jsonld.JsonLdError as error:
+        if error.code == "loading remote context failed":
+            raise _LoadFailed() from error
+        return False
+    return True
@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+from array import array
+from vc_test_suite.rules import MODES
+from vc_test_suite import rulesets
+from vc_test_suite.batch import validate_stream
+from vc_test_suite.vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
+
+# Random access into large NDJSON corpora. The file is memory-mapped and an
+# index of where every line starts, plus the id of the credential on it, is
+# saved next to it, so validating a few records reads only those records.
+
+MAGIC = b"VCIDX1\n"
+# Source size, source mtime in ns and line count, little-endian.
+_HEADER = struct.Struct("<QqQ")
+
+
+def index_path_for(path):
+    return path + ".idx"
+
+
+def _record_id(text):
+    try:
+        vc = decode_jwt(text)[1] if looks_like_jwt(text) else json.loads(text)
+    except (JwtError, ValueError):
+        return None
+    if isinstance(vc, dict) and isinstance(vc.get("id"), str):
+        return vc["id"]
+    return None
+
+
+class Corpus:
+    """A memory-mapped NDJSON corpus addressed by line number or credential id.
+
+    Lines are numbered from 1, as in batch output. The index is read from
+    ``index_path`` (by default the file name plus ".idx") when it matches the
+    file's size and modification time, and otherwise built in one pass and
+    saved there; an index that cannot be saved is only kept in memory.
+    """
+
+    def __init__(self, path, index_path=None, rebuild=False):
+        self.path = path
+        self.index_path = index_path or index_path_for(path)
+        self._file = open(path, "rb")
+        stat = os.fstat(self._file.fileno())
+        self._stamp = (stat.st_size, stat.st_mtime_ns)
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        self._ids = None
+        self._by_id = None
+        if rebuild or not self._load_index():
+            self._build_index()
+            self._save_index()
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def _build_index(self):
+        buffer = self._buffer
+        starts = array("Q", [0])
+        ids = []
+        find = buffer.find
+        position = 0
+        size = len(buffer)
+        while position < size:
+            end = find(b"\n", position)
+            end = size if end < 0 else end + 1
+            starts.append(end)
+            ids.append(_record_id(buffer[position:end].decode("utf-8", "replace").strip()))
+            position = end
+        self._starts = starts
+        self._ids = ids
+
+    def _save_index(self):
+        import tempfile
+
+        starts = self._starts
+        if sys.byteorder != "little":
+            starts = array("Q", starts)
+            starts.byteswap()
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(MAGIC)
+                file.write(_HEADER.pack(*self._stamp, len(self)))
+                file.write(starts.tobytes())
+                file.write(json.dumps(self._ids).encode("utf-8"))
+            os.replace(tmp_path, self.index_path)
+        except BaseException as error:
+            os.unlink(tmp_path)
+            if not isinstance(error, OSError):
+                raise
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rb") as file:
+                if file.read(len(MAGIC)) != MAGIC:
+                    return False
+                size, mtime_ns, count = _HEADER.unpack(file.read(_HEADER.size))
+                if (size, mtime_ns) != self._stamp:
+                    return False
+                data = file.read(8 * (count + 1))
+                if len(data) != 8 * (count + 1):
+                    return False
+                starts = array("Q")
+                starts.frombytes(data)
+                self._ids_offset = file.tell()
+        except (OSError, struct.error, ValueError):
+            return False
+        if sys.byteorder != "little":
+            starts.byteswap()
+        if starts[0] != 0 or starts[-1] != size:
+            return False
+        self._starts = starts
+        return True
+
+    def ids(self):
+        """The credential id of every line, None where there is none."""
+        if self._ids is None:
+            try:
+                with open(self.index_path, "rb") as file:
+                    file.seek(self._ids_offset)
+                    ids = json.loads(file.read())
+            except (OSError, ValueError):
+                ids = None
+            if not isinstance(ids, list) or len(ids) != len(self):
+                # The saved ids are gone or damaged; read them from the file.
+                ids = [_record_id(self.line(line_number)) for line_number in range(1, len(self) + 1)]
+            self._ids = ids
+        return self._ids
+
+    def find(self, credential_id):
+        """Line numbers of the credentials with ``credential_id``."""
+        if self._by_id is None:
+            by_id = {}
+            for line_number, value in enumerate(self.ids(), start=1):
+                if value is not None:
+                    by_id.setdefault(value, []).append(line_number)
+            self._by_id = by_id
+        return list(self._by_id.get(credential_id, ()))
+
+    def line(self, line_number):
+        """The text of line ``line_number``, without its line break."""
+        if not 1 <= line_number <= len(self):
+            raise IndexError(f"Line {line_number} is out of range 1-{len(self)}")
+        data = self._buffer[self._starts[line_number - 1]:self._starts[line_number]]
+        return data.decode("utf-8", "replace").strip()
+
+    def lines(self, line_numbers):
+        """Yield (line_number, text) for the non-blank lines among ``line_numbers``."""
+        for line_number in line_numbers:
+            text = self.line(line_number)
+            if text:
+                yield line_number, text
+
+    def validate(self, line_numbers, **options):
+        """Validate the given lines; takes and yields what batch.validate_stream does."""
+        return validate_stream(self.lines(line_numbers), **options)
+
+
+def parse_range(text):
+    """Parse "A:B", lines A to B inclusive; either end may be left out."""
+    start, colon, stop = text.partition(":")
+    if not colon:
+        raise argparse.ArgumentTypeError(f"Expected A:B, not {text!r}")
+    return (int(start) if start else None, int(stop) if stop else None)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite corpus",
+        description="Validate selected records of a large NDJSON file through a saved index, one result line per record.",
+    )
+    parser.add_argument("input", help="NDJSON file; its index is kept in <input>.idx")
+    parser.add_argument("--line", type=int, action="append", default=[], help="validate this line (repeatable)")
+    parser.add_argument("--range", type=parse_range, action="append", default=[], help="validate lines A to B inclusive, e.g. 100:200 or 5000: (repeatable)")
+    parser.add_argument("--id", action="append", default=[], help="validate the credentials with this id (repeatable)")
+    parser.add_argument("--reindex", action="store_true", help="rebuild the index even if it is up to date")
+    parser.add_argument("--index", default=None, help="where to keep the index (default: <input>.idx)")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes (default: 0, in-process)")
+    parser.add_argument("--mode", choices=MODES, default="full", help="checks to run: all, only required ones, or up to the first failure (default: full)")
+    parser.add_argument("--ruleset", choices=rulesets.names(), default=None, help="ruleset to check every credential against (default: detected from @context)")
+    args = parser.parse_args(argv)
+
+    with Corpus(args.input, args.index, rebuild=args.reindex) as corpus:
+        line_numbers = list(args.line)
+        for start, stop in args.range:
+            line_numbers.extend(range(start or 1, (len(corpus) if stop is None else stop) + 1))
+        for credential_id in args.id:
+            found = corpus.find(credential_id)
+            if not found:
+                print(f"vc_test_suite corpus: no credential with id {credential_id!r}", file=sys.stderr)
+            line_numbers.extend(found)
+        if not line_numbers:
+            print(f"{len(corpus)} lines indexed in {corpus.index_path}", file=sys.stderr)
+            return 0
+        outside = [line_number for line_number in line_numbers if not 1 <= line_number <= len(corpus)]
+        if outside:
+            print(f"vc_test_suite corpus: line {outside[0]} is out of range 1-{len(corpus)}", file=sys.stderr)
+            return 1
+        for result in corpus.validate(line_numbers, workers=args.workers, mode=args.mode, ruleset=args.ruleset):
+            print(result)
@@ -0,0 +1,236 @@
+from vc_test_suite import w3c
+from vc_test_suite.rules import dependency_index, evaluate
+from vc_test_suite.timestamps import instant_from_datetime
+
+# Which sections of VCDM_V1_RULES have to run again when a property changes.
+VCDM_V1_DEPENDENCIES = dependency_index(w3c.VCDM_V1_RULES)
+
+
+class PatchError(ValueError):
+    """A JSON Patch that is malformed or does not apply to the document."""
+
+
+def parse_pointer(pointer):
+    """Split an RFC 6901 JSON Pointer into its unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise PatchError(f"JSON Pointer must be a string, not {pointer!r}")
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"JSON Pointer must start with '/': {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container, token, path, append=False):
+    if append and token == "-":
+        return len(container)
+    # str.isdigit also accepts digits such as "²" that int() rejects.
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token[0] == "0"):
+        raise PatchError(f"Invalid array index {token!r} in {path!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise PatchError(f"Array index {index} is out of range in {path!r}")
+    return index
+
+
+def _deep_copy(value):
+    # Read-only mappings and tuples come back as plain dicts and lists.
+    if w3c.is_object(value):
+        return {key: _deep_copy(item) for key, item in value.items()}
+    if w3c.is_array(value):
+        return [_deep_copy(item) for item in value]
+    return value
+
+
+class _Document:
+    """A document being patched, copying only the containers a patch changes.
+
+    The original document and the values taken from the patch are never
+    modified: a container is copied the first time it is written to, and
+    ``owned`` remembers the copies, keeping them alive so their ids stay theirs.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.owned = {}
+
+    def _own(self, value):
+        if id(value) in self.owned:
+            return value
+        if w3c.is_object(value):
+            value = dict(value)
+        elif w3c.is_array(value):
+            value = list(value)
+        else:
+            return value
+        self.owned[id(value)] = value
+        return value
+
+    def get(self, tokens, path):
+        value = self.root
+        for token in tokens:
+            if w3c.is_object(value):
+                if token not in value:
+                    raise PatchError(f"Path {path!r} does not exist")
+                value = value[token]
+            elif w3c.is_array(value):
+                value = value[_index(value, token, path)]
+            else:
+                raise PatchError(f"Path {path!r} does not exist")
+        return value
+
+    def parent(self, tokens, path):
+        """Return the owned container holding the last token of ``tokens``."""
+        self.root = container = self._own(self.root)
+        for token in tokens[:-1]:
+            if isinstance(container, dict):
+                if token not in container:
+                    raise PatchError(f"Path {path!r} does not exist")
+                key = token
+            elif isinstance(container, list):
+                key = _index(container, token, path)
+            else:
+                raise PatchError(f"Path {path!r} does not exist")
+            child = self._own(container[key])
+            container[key] = child
+            container = child
+        if not isinstance(container, (dict, list)):
+            raise PatchError(f"Path {path!r} does not exist")
+        return container
+
+    def add(self, tokens, path, value):
+        if not tokens:
+            self.root = value
+            return
+        container = self.parent(tokens, path)
+        if isinstance(container, dict):
+            container[tokens[-1]] = value
+        else:
+            container.insert(_index(container, tokens[-1], path, append=True), value)
+
+    def remove(self, tokens, path):
+        if not tokens:
+            raise PatchError("Cannot remove the whole document")
+        container = self.parent(tokens, path)
+        if isinstance(container, dict):
+            if tokens[-1] not in container:
+                raise PatchError(f"Path {path!r} does not exist")
+            return container.pop(tokens[-1])
+        return container.pop(_index(container, tokens[-1], path))
+
+    def replace(self, tokens, path, value):
+        if not tokens:
+            self.root = value
+            return
+        self.remove(tokens, path)
+        self.add(tokens, path, value)
+
+
+def _member(operation, name, index):
+    if name not in operation:
+        raise PatchError(f"Operation {index} has no {name!r}")
+    return operation[name]
+
+
+def apply_patch(document, patch):
+    """Apply an RFC 6902 JSON Patch without modifying ``document``.
+
+    Returns the patched document and the set of top-level properties the
+    patch touched, or None when it replaced the document as a whole.
+    """
+    if not w3c.is_array(patch):
+        raise PatchError("A JSON Patch must be an array of operations")
+    target = _Document(document)
+    touched = set()
+    for index, operation in enumerate(patch):
+        if not w3c.is_object(operation):
+            raise PatchError(f"Operation {index} is not an object")
+        op = _member(operation, "op", index)
+        path = _member(operation, "path", index)
+        tokens = parse_pointer(path)
+        if op in ("add", "replace", "test"):
+            value = _member(operation, "value", index)
+        if op in ("move", "copy"):
+            source = _member(operation, "from", index)
+            source_tokens = parse_pointer(source)
+
+        if op == "add":
+            target.add(tokens, path, value)
+        elif op == "remove":
+            target.remove(tokens, path)
+        elif op == "replace":
+            target.get(tokens, path)
+            target.replace(tokens, path, value)
+        elif op == "move":
+            if tokens[:len(source_tokens)] == source_tokens and tokens != source_tokens:
+                raise PatchError(f"Cannot move {source!r} into itself")
+            if tokens == source_tokens:
+                target.get(source_tokens, source)
+            else:
+                target.add(tokens, path, target.remove(source_tokens, source))
+        elif op == "copy":
+            # The copy must not share containers with its source, which may
+            # already be owned and so be changed in place by later operations.
+            target.add(tokens, path, _deep_copy(target.get(source_tokens, source)))
+        elif op == "test":
+            if target.get(tokens, path) != value:
+                raise PatchError(f"Test failed at {path!r}")
+            continue
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+
+        if touched is not None:
+            if not tokens:
+                touched = None
+            else:
+                touched.add(tokens[0])
+                if op == "move":
+                    touched.add(source_tokens[0])
+    return target.root, touched
+
+
+def revalidate(vc, previous, patch, now=None):
+    """Re-validate ``vc`` after ``patch``, given ``previous``, its full result.
+
+    Only the sections reading a property the patch touched are checked again,
+    see VCDM_V1_DEPENDENCIES; the others are taken from ``previous``. The
+    result is the one test_data_model_v1 gives for the patched credential, as
+    long as ``previous`` was computed with the same ``now``. Returns the
+    patched credential and its result; ``vc`` is not modified.
+    """
+    patched, touched = apply_patch(vc, patch)
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    plan = w3c.VCDM_V1_ACTIVE.plan
+    if touched is None or not w3c.is_object(patched):
+        return patched, evaluate(plan, patched, options)
+
+    affected = set()
+    for key in touched:
+        affected.update(VCDM_V1_DEPENDENCIES.get(key, ()))
+    rerun = evaluate(tuple(section for section in plan if section.key in affected), patched, options)
+
+    verifications = {}
+    required_test_count = 0
+    optional_test_count = 0
+    required_test_pass = 0
+    optional_test_pass = 0
+    for section in plan:
+        source = rerun if section.key in affected else previous
+        tests = source["verifications"].get(section.key)
+        if tests is None:
+            continue
+        verifications[section.key] = tests
+        for test in tests:
+            if test["required"]:
+                required_test_count += 1
+                required_test_pass += test["pass"]
+            else:
+                optional_test_count += 1
+                optional_test_pass += test["pass"]
+
+    return patched, {
+        "conformant": required_test_pass == required_test_count,
+        "required_score": f"{required_test_pass}/{required_test_count}",
+        "optional_score": f"{optional_test_pass}/{optional_test_count}",
+        "verifications": verifications,
+    }
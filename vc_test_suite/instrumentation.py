@@ -0,0 +1,122 @@
+import threading
+from time import perf_counter
+from vc_test_suite.rules import wrap_plans
+
+
+class Registry:
+    """Call counts and wall time per rule, shared by every thread of a process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rules = {}
+
+    def record(self, key, elapsed):
+        with self._lock:
+            stats = self._rules.get(key)
+            if stats is None:
+                self._rules[key] = [1, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+
+    def reset(self):
+        with self._lock:
+            self._rules.clear()
+
+    def snapshot(self):
+        """Return {"rules": [...], "sections": {...}} with calls and seconds."""
+        with self._lock:
+            items = [(key, list(stats)) for key, stats in self._rules.items()]
+        rules = []
+        sections = {}
+        for (section, statement, check), (calls, seconds) in items:
+            rules.append({"section": section, "statement": statement, "check": check, "calls": calls, "seconds": seconds})
+            totals = sections.setdefault(section, {"calls": 0, "seconds": 0.0})
+            totals["calls"] += calls
+            totals["seconds"] += seconds
+        return {"rules": rules, "sections": sections}
+
+    def to_prometheus(self, prefix="vc_test_suite"):
+        """Render the counters in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in samples:
+                rendered = ",".join(f'{label}="{_escape(text)}"' for label, text in labels)
+                lines.append(f"{prefix}_{name}{{{rendered}}} {value!r}")
+
+        rule_labels = [
+            ((("section", rule["section"]), ("statement", rule["statement"]), ("check", rule["check"])), rule)
+            for rule in snapshot["rules"]
+        ]
+        family("rule_calls_total", "Times each rule was evaluated.", [(labels, rule["calls"]) for labels, rule in rule_labels])
+        family("rule_seconds_total", "Wall time spent evaluating each rule.", [(labels, rule["seconds"]) for labels, rule in rule_labels])
+        family(
+            "section_seconds_total",
+            "Wall time spent evaluating the rules of each section.",
+            [((("section", section),), totals["seconds"]) for section, totals in snapshot["sections"].items()],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+def _timed(check, key, registry):
+    def timed(*args):
+        start = perf_counter()
+        try:
+            return check(*args)
+        finally:
+            registry.record(key, perf_counter() - start)
+    return timed
+
+
+def _presence(key):
+    def present(vc):
+        return key in vc
+    return present
+
+
+def instrument_plan(plan, registry=registry):
+    """Return a copy of a compiled plan whose checks report to ``registry``.
+
+    Presence checks are reported as "present" and ``when`` conditions under
+    their own names, next to the rules they guard.
+    """
+    sections = []
+    for section in plan:
+        rules = []
+        for rule in section.rules:
+            key = (section.key, rule.statement)
+            rule = rule._replace(check=_timed(rule.check, (*key, _name(rule.check)), registry))
+            if rule.when is not None:
+                rule = rule._replace(when=_timed(rule.when, (*key, _name(rule.when)), registry))
+            rules.append(rule)
+        presence = _timed(section.presence or _presence(section.key), (section.key, section.statement, "present"), registry)
+        sections.append(section._replace(rules=tuple(rules), presence=presence))
+    return tuple(sections)
+
+
+def _name(check):
+    return getattr(check, "__name__", "check")
+
+
+def enable(registry=registry):
+    """Time every check of every ruleset and of presentations from now on.
+
+    Rulesets loaded later are timed as well.
+    """
+    wrap_plans(lambda plan: instrument_plan(plan, registry))
+
+
+def disable():
+    """Go back to the plain plans; the registry keeps what it collected."""
+    wrap_plans(None)
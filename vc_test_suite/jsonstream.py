@@ -0,0 +1,159 @@
+import re
+import json
+import codecs
+
+# Splits a large JSON array, or JSON documents written one after another,
+# into the text of each item without holding more than a chunk and the
+# current item in memory. Well-formed items are delimited by the C decoder;
+# _scan only runs to find where a malformed item ends.
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*(?:,[ \t\n\r]*)?")
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[\[\]{},]|[ \t\n\r]+')
+
+_decoder = json.JSONDecoder()
+
+
+class StreamError(ValueError):
+    """The stream cannot be split into items any further."""
+
+
+def _scan(buffer, start, index, depth, array):
+    """Find the end of the item at ``start``, resuming at ``index`` with ``depth``.
+
+    Array elements end at a comma or at the closing bracket of the array,
+    other items at their own closing bracket or at whitespace. Returns
+    (end, index, depth) with ``end`` None when the buffer runs out first.
+    """
+    for match in _TOKEN.finditer(buffer, index):
+        token = match.group()
+        first = token[0]
+        if first == '"':
+            if len(token) == 1:
+                # The string is cut off by the end of the buffer.
+                return None, match.start(), depth
+        elif first in "[{":
+            depth += 1
+        elif first in "]}":
+            if depth == 0:
+                return match.start(), match.start(), depth
+            depth -= 1
+            if depth == 0 and not array:
+                return match.end(), match.end(), depth
+        elif first == ",":
+            if depth == 0 and array:
+                return match.start(), match.start(), depth
+        elif depth == 0 and not array and match.start() > start:
+            return match.start(), match.start(), depth
+    return None, len(buffer), depth
+
+
+# Invalid UTF-8 is decoded to lone surrogates, one per byte, so offsets can
+# be counted by encoding the text back; items are yielded with U+FFFD instead.
+def _byte_length(text):
+    return len(text) if text.isascii() else len(text.encode("utf-8", "surrogateescape"))
+
+
+def _replace_invalid(text):
+    if text.isascii():
+        return text
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return text.encode("utf-8", "surrogateescape").decode("utf-8", "replace")
+    return text
+
+
+def iter_json_items(stream, chunk_size=1 << 20, max_item_size=64 << 20):
+    """Yield (byte_offset, text) for every item of a binary JSON stream.
+
+    The stream is either one top-level JSON array, whose elements are the
+    items, or JSON documents one after another, like NDJSON. Malformed items
+    are yielded as they are, so json.loads reports what is wrong with them,
+    and reading carries on with the next item. Memory holds about
+    ``chunk_size`` bytes plus the item being read; an item that grows past
+    ``max_item_size`` characters raises StreamError, since there is no safe
+    place to carry on from.
+    """
+    decode = codecs.getincrementaldecoder("utf-8")("surrogateescape").decode
+    buffer = ""
+    eof = False
+    # Byte offset of buffer[mark]; mark only moves forward.
+    mark = 0
+    mark_offset = 0
+
+    def fill(keep):
+        """Drop buffer[:keep] and read on; returns how far positions shift."""
+        nonlocal buffer, eof, mark, mark_offset
+        if keep > mark:
+            mark_offset += _byte_length(buffer[mark:keep])
+            mark = keep
+        mark -= keep
+        # Reading at least as much as is buffered keeps huge items linear.
+        chunk = stream.read(max(chunk_size, len(buffer) - keep))
+        if chunk:
+            buffer = buffer[keep:] + decode(chunk)
+        else:
+            eof = True
+            buffer = buffer[keep:] + decode(b"", True)
+        return keep
+
+    def offset_at(position):
+        nonlocal mark, mark_offset
+        mark_offset += _byte_length(buffer[mark:position])
+        mark = position
+        return mark_offset
+
+    def skip(pattern, position):
+        while True:
+            end = pattern.match(buffer, position).end()
+            if end < len(buffer) or eof:
+                return end
+            position -= fill(position)
+
+    position = skip(_WHITESPACE, 0)
+    if position >= len(buffer):
+        return
+    array = buffer[position] == "["
+    if array:
+        position += 1
+
+    while True:
+        position = skip(_SEPARATOR if array else _WHITESPACE, position)
+        if position >= len(buffer):
+            return
+        if array and buffer[position] == "]":
+            # Whatever follows the array is read as further documents.
+            array = False
+            position += 1
+            continue
+
+        start = position
+        offset = offset_at(start)
+        scan_index = start
+        depth = 0
+        while True:
+            try:
+                end = _decoder.raw_decode(buffer, start)[1]
+            except (ValueError, RecursionError):
+                end = None
+            else:
+                # A number cut off by the end of the buffer also decodes.
+                if end < len(buffer) or eof:
+                    break
+            if end is None and scan_index < len(buffer):
+                end, scan_index, depth = _scan(buffer, start, scan_index, depth, array)
+                if end is not None:
+                    end = max(end, start + 1)
+                    break
+            if eof:
+                end = len(buffer)
+                break
+            if len(buffer) - start > max_item_size:
+                raise StreamError(f"Item at byte {offset} is larger than {max_item_size} characters.")
+            shift = fill(start)
+            start -= shift
+            scan_index -= shift
+
+        yield offset, _replace_invalid(buffer[start:end])
+        position = end
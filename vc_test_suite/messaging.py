@@ -25,10 +25,13 @@ VCDM_V1_STATEMENTS = {
     "issuanceDate": [
         "A credential MUST have an issuanceDate property.",
         "The value of the issuanceDate property MUST be a string value of an [XMLSCHEMA11-2] combined date-time string",
+        "The credential MUST NOT be considered valid before its issuanceDate.",
     ],
     "expirationDate": [
         "Verifiable credentials MAY have an expirationDate property.",
-        "If present, the value of the expirationDate property MUST be a string value of an [XMLSCHEMA11-2] date-time"
+        "If present, the value of the expirationDate property MUST be a string value of an [XMLSCHEMA11-2] date-time",
+        "The expirationDate SHOULD be later than the issuanceDate.",
+        "The credential MUST NOT be considered valid after its expirationDate.",
     ],
     "credentialSubject": [
         "A verifiable credential MUST have a credentialSubject property.",
@@ -72,3 +75,102 @@ VCDM_V1_STATEMENTS = {
         "The specific method used for an embedded proof MUST be included using the type property.",
     ],
 }
+
+VP_V1_STATEMENTS = {
+    "@context": [
+        "Verifiable presentations MUST include a @context property.",
+        "The value of the @context property MUST be an ordered set.",
+        "The first item MUST be a URI with the value https://www.w3.org/2018/credentials/v1",
+        "Subsequent items MUST be composed of URLs and/or objects each processable as a JSON-LD Context.",
+    ],
+    "id": [
+        "A verifiable presentation MAY have an id property.",
+        "The value of the id property MUST be a single URI.",
+    ],
+    "type": [
+        "Verifiable presentations MUST have a type property.",
+        "The value of the type property MUST be, or map to, one or more URIs.",
+        "MUST have VerifiablePresentation",
+    ],
+    "verifiableCredential": [
+        "A verifiable presentation MAY have a verifiableCredential property.",
+        "If present, the value of the verifiableCredential property MUST be constructed from one or more verifiable credentials.",
+    ],
+    "holder": [
+        "A verifiable presentation MAY have a holder property.",
+        "If present, the value of the holder property MUST be either a URI or an object containing an id property.",
+    ],
+    "proof": [
+        "A verifiable presentation MAY have a proof property.",
+        "The specific method used for an embedded proof MUST be included using the type property.",
+    ],
+}
+
+VCDM_V2_STATEMENTS = {
+    "@context": [
+        "Verifiable credentials MUST include a @context property.",
+        "The value of the @context property MUST be an ordered set.",
+        "The first item MUST be a URL with the value https://www.w3.org/ns/credentials/v2",
+        "Subsequent items MUST be composed of URLs and/or objects each processable as a JSON-LD Context.",
+    ],
+    "id": [
+        "A verifiable credential MAY have an id property.",
+        "If present, the value of the id property MUST be a single URL.",
+    ],
+    "type": [
+        "Verifiable credentials MUST have a type property.",
+        "The value of the type property MUST be one or more terms and/or absolute URL strings.",
+        "One of the items MUST be VerifiableCredential.",
+    ],
+    "issuer": [
+        "A verifiable credential MUST have an issuer property.",
+        "The value of the issuer property MUST be either a URL or an object containing an id property whose value is a URL.",
+    ],
+    "credentialSubject": [
+        "A verifiable credential MUST have a credentialSubject property.",
+        "The value of the credentialSubject property MUST be one or more objects.",
+        "Each credential subject MAY contain an id, which MUST be a URL.",
+    ],
+    "validFrom": [
+        "A verifiable credential MAY have a validFrom property.",
+        "If present, the value of the validFrom property MUST be an [XMLSCHEMA11-2] dateTimeStamp string value.",
+        "The credential MUST NOT be considered valid before its validFrom.",
+    ],
+    "validUntil": [
+        "A verifiable credential MAY have a validUntil property.",
+        "If present, the value of the validUntil property MUST be an [XMLSCHEMA11-2] dateTimeStamp string value.",
+        "If validFrom is also present, it MUST express a datetime the same as or earlier than validUntil.",
+        "The credential MUST NOT be considered valid after its validUntil.",
+    ],
+    "credentialStatus": [
+        "A verifiable credential MAY have a credentialStatus property.",
+        "The value of the credentialStatus property MUST be one or more status objects.",
+        "Each status object MUST specify its type.",
+        "If present, the id of a status object MUST be a URL.",
+    ],
+    "credentialSchema": [
+        "A verifiable credential MAY have a credentialSchema property.",
+        "The value of the credentialSchema property MUST be one or more data schemas.",
+        "Each credentialSchema MUST specify its type.",
+        "Each credentialSchema MUST specify an id that is a URL.",
+    ],
+    "refreshService": [
+        "A verifiable credential MAY have a refreshService property.",
+        "The value of the refreshService property MUST be one or more refresh services.",
+        "Each refreshService MUST specify its type.",
+    ],
+    "termsOfUse": [
+        "A verifiable credential MAY have a termsOfUse property.",
+        "The value of the termsOfUse property MUST be one or more terms of use policies.",
+        "Each termsOfUse MUST specify its type.",
+    ],
+    "evidence": [
+        "A verifiable credential MAY have an evidence property.",
+        "The value of the evidence property MUST be one or more evidence schemes.",
+        "Each evidence MUST specify its type.",
+    ],
+    "proof": [
+        "A verifiable credential MAY have an embedded proof.",
+        "The specific method used for an embedded proof MUST be included using the type property.",
+    ],
+}
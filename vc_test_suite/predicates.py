@@ -0,0 +1,104 @@
+import uritools
+from functools import lru_cache
+from collections.abc import Mapping
+from vc_test_suite import context_loader
+from vc_test_suite.timestamps import parse_xml_datetime
+
+# Checks shared by every ruleset. Version-specific checks live with their
+# rules in w3c and vcdm2, so loading one version does not load the other.
+
+# Credentials are only ever read, so any mapping (dict, frozendict,
+# MappingProxyType) is an object and tuples count as arrays.
+ARRAY_TYPES = (list, tuple)
+
+def is_object(value):
+    return isinstance(value, dict) or isinstance(value, Mapping)
+
+def is_array(value):
+    return isinstance(value, ARRAY_TYPES)
+
+def entries(value):
+    """View a single object or an array of objects as a sequence, without copying."""
+    return (value,) if is_object(value) else value
+
+# Schemes that make up nearly all credential, issuer and subject ids. Any
+# string starting with one of them is a URI to uritools.isuri as well.
+COMMON_URI_PREFIXES = ("did:", "https:", "http:", "urn:uuid:")
+
+class UriCheck:
+    """uritools.isuri with a pre-screen for common schemes and a bounded memo.
+
+    Strings that do not start with a common scheme go through uritools once
+    and their verdict is remembered in an LRU of ``maxsize`` entries, which
+    also keeps a single copy of each repeated id.
+    """
+
+    def __init__(self, maxsize=8192):
+        self.prescreened = 0
+        self._isuri = lru_cache(maxsize=maxsize)(uritools.isuri)
+
+    def __call__(self, value):
+        if value.startswith(COMMON_URI_PREFIXES):
+            self.prescreened += 1
+            return True
+        return self._isuri(value)
+
+    def stats(self):
+        info = self._isuri.cache_info()
+        calls = self.prescreened + info.hits + info.misses
+        return {
+            "calls": calls,
+            "prescreened": self.prescreened,
+            "memo_hits": info.hits,
+            "memo_misses": info.misses,
+            "memo_size": info.currsize,
+            "hit_rate": (self.prescreened + info.hits) / calls if calls else 0.0,
+        }
+
+    def clear(self):
+        self.prescreened = 0
+        self._isuri.cache_clear()
+
+uri_check = UriCheck()
+
+def is_uri(value):
+    return isinstance(value, str) and uri_check(value)
+
+# Only the validity period rules need instants, often of the same string.
+_parse_instant = lru_cache(maxsize=1024)(parse_xml_datetime)
+
+def instant(value):
+    return _parse_instant(value) if isinstance(value, str) else None
+
+def issued_by_now(value, vc, options):
+    return instant(value) <= options["now"]
+
+def not_expired_by_now(value, vc, options):
+    return options["now"] <= instant(value)
+
+def is_ordered_set(value):
+    return is_array(value) and len(value) > 0
+
+def contexts_processable(value):
+    contexts = value if is_array(value) else (value,)
+    return all(
+        (isinstance(item, str) or is_object(item)) and context_loader.context_processable(item)
+        for item in contexts
+    )
+
+def is_issuer(value):
+    if is_object(value):
+        return "id" in value and is_uri(value["id"])
+    return is_uri(value)
+
+def is_one_or_more_objects(value):
+    return is_object(value) or is_array(value)
+
+def each_has(key):
+    def check(value):
+        return all(is_object(entry) and key in entry for entry in entries(value))
+    check.__name__ = f"each_has_{key}"
+    return check
+
+each_has_id = each_has("id")
+each_has_type = each_has("type")
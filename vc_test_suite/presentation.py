@@ -0,0 +1,108 @@
+import sys
+import json
+import argparse
+from itertools import repeat
+from vc_test_suite import rulesets, w3c
+from vc_test_suite.cache import canonical_json
+from vc_test_suite.rules import MODES, evaluate_mode
+from vc_test_suite.timestamps import instant_from_datetime
+from vc_test_suite.vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
+
+
+def validate_embedded(vc, now=None, mode="full", ruleset=None):
+    """Validate one embedded credential or VC-JWT; never raises, like batch.validate_line."""
+    if isinstance(vc, str) and looks_like_jwt(vc):
+        try:
+            vc = decode_jwt(vc)[1]
+        except JwtError as error:
+            return {"error": f"Invalid VC-JWT: {error}"}
+    if not w3c.is_object(vc):
+        return {"error": "Embedded credential MUST be a JSON object."}
+    try:
+        return {"result": rulesets.test_data_model(vc, now, mode, ruleset)}
+    except Exception as error:
+        return {"error": f"Validation failed: {error!r}"}
+
+
+def embedded_credentials(vp):
+    """The verifiableCredential entries of a presentation, as a sequence."""
+    if not w3c.is_object(vp) or "verifiableCredential" not in vp:
+        return ()
+    credentials = vp["verifiableCredential"]
+    return credentials if w3c.is_array(credentials) else (credentials,)
+
+
+def _dedupe(credentials):
+    """Return the distinct credentials and, per entry, the index of its copy."""
+    unique = []
+    positions = {}
+    slots = []
+    for vc in credentials:
+        try:
+            key = canonical_json(vc)
+        except (TypeError, ValueError):
+            key = None
+        if key is None:
+            slots.append(len(unique))
+            unique.append(vc)
+            continue
+        position = positions.get(key)
+        if position is None:
+            position = positions[key] = len(unique)
+            unique.append(vc)
+        slots.append(position)
+    return unique, slots
+
+
+def test_presentation_v1(vp, now=None, mode="full", executor=None, ruleset=None):
+    """Check a presentation and every credential it carries.
+
+    Returns ``{"conformant", "presentation", "credentials"}``: the report on
+    the presentation itself and one ``{"result": ...}`` or ``{"error": ...}``
+    per verifiableCredential entry, in order. A credential that appears more
+    than once is only validated once. With an ``executor`` (any
+    concurrent.futures executor) the distinct credentials are validated on
+    it. ``mode`` applies at both levels; in "conformant-only" the credentials
+    are not looked at once the presentation itself fails, and ``credentials``
+    is None. Each credential is checked against ``ruleset``, or the one its
+    @context names.
+    """
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    active = w3c.VP_V1_ACTIVE
+    presentation = evaluate_mode(active.plan, active.required, vp, options, mode)
+    if mode == "conformant-only" and not presentation["conformant"]:
+        return {"conformant": False, "presentation": presentation, "credentials": None}
+
+    unique, slots = _dedupe(embedded_credentials(vp))
+    if executor is None or len(unique) < 2:
+        results = [validate_embedded(vc, now, mode, ruleset) for vc in unique]
+    else:
+        chunksize = max(1, len(unique) // 32)
+        results = list(executor.map(validate_embedded, unique, repeat(now), repeat(mode), repeat(ruleset), chunksize=chunksize))
+    credentials = [results[slot] for slot in slots]
+    conformant = presentation["conformant"] and all(
+        "result" in entry and entry["result"]["conformant"] for entry in credentials
+    )
+    return {"conformant": conformant, "presentation": presentation, "credentials": credentials}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite presentation",
+        description="Validate a verifiable presentation and the credentials it carries.",
+    )
+    parser.add_argument("presentation", help="the presentation as JSON, '-' to read it from stdin")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="worker processes for the embedded credentials (default: 0, in-process)")
+    parser.add_argument("--mode", choices=MODES, default="full", help="checks to run: all, only required ones, or up to the first failure (default: full)")
+    parser.add_argument("--ruleset", choices=rulesets.names(), default=None, help="ruleset to check every embedded credential against (default: detected from @context)")
+    args = parser.parse_args(argv)
+
+    vp = json.load(sys.stdin) if args.presentation == "-" else json.loads(args.presentation)
+    if args.workers:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = test_presentation_v1(vp, mode=args.mode, executor=executor, ruleset=args.ruleset)
+    else:
+        results = test_presentation_v1(vp, mode=args.mode, ruleset=args.ruleset)
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,307 @@
+import sys
+import json
+import base64
+import hashlib
+import argparse
+from functools import lru_cache
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from vc_test_suite import context_loader, w3c
+
+# Verifies embedded Ed25519 proofs: Ed25519Signature2020 and DataIntegrityProof
+# with the eddsa-rdfc-2022 or eddsa-jcs-2022 cryptosuite. Needs cryptography,
+# which the rest of the package does not. Keys are found through a resolver,
+# by default did:key and a local fixture store, so nothing is fetched. A proof
+# only counts when it was made for assertion with a key of the issuer.
+
+_BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_BASE58_INDEX = {character: index for index, character in enumerate(_BASE58)}
+
+# Multicodec prefix of an Ed25519 public key in a multikey.
+ED25519_PUB = b"\xed\x01"
+
+SUITES = ("Ed25519Signature2020", "DataIntegrityProof")
+CRYPTOSUITES = ("eddsa-rdfc-2022", "eddsa-jcs-2022")
+PROOF_PURPOSE = "assertionMethod"
+
+
+class ProofError(ValueError):
+    """A proof, or the key it names, cannot be used for verification."""
+
+
+def base58_decode(text):
+    number = 0
+    for character in text:
+        if character not in _BASE58_INDEX:
+            raise ProofError(f"Invalid base58 character {character!r}")
+        number = number * 58 + _BASE58_INDEX[character]
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\x00" * (len(text) - len(text.lstrip("1"))) + body
+
+
+def multibase_decode(text):
+    """Decode a base58btc ("z") multibase string."""
+    if not isinstance(text, str) or not text.startswith("z"):
+        raise ProofError("Only base58btc multibase values (starting with 'z') are supported")
+    return base58_decode(text[1:])
+
+
+def public_key_bytes(method):
+    """The raw Ed25519 key of a verification method object."""
+    if not w3c.is_object(method):
+        raise ProofError("Verification method is not an object")
+    if "publicKeyMultibase" in method:
+        key = multibase_decode(method["publicKeyMultibase"])
+        if key.startswith(ED25519_PUB) and len(key) == 34:
+            key = key[2:]
+    elif "publicKeyBase58" in method:
+        key = base58_decode(method["publicKeyBase58"])
+    elif "publicKeyJwk" in method:
+        jwk = method["publicKeyJwk"]
+        if not w3c.is_object(jwk) or jwk.get("kty") != "OKP" or jwk.get("crv") != "Ed25519":
+            raise ProofError("Only Ed25519 OKP JWKs are supported")
+        x = jwk.get("x", "")
+        key = base64.urlsafe_b64decode(x + "=" * (-len(x) % 4))
+    else:
+        raise ProofError("Verification method has no supported public key property")
+    if len(key) != 32:
+        raise ProofError(f"Ed25519 public keys are 32 bytes, not {len(key)}")
+    return key
+
+
+def resolve_did_key(url):
+    """Resolve did:key Ed25519 verification methods, which carry the key itself."""
+    if not url.startswith("did:key:"):
+        return None
+    did = url.split("#", 1)[0]
+    identifier = did[len("did:key:"):]
+    key = multibase_decode(identifier)
+    if not key.startswith(ED25519_PUB):
+        raise ProofError(f"{url} is not an Ed25519 did:key")
+    return {"id": url, "type": "Multikey", "controller": did, "publicKeyMultibase": identifier}
+
+
+class KeyStore:
+    """Verification methods from local fixtures, looked up by id.
+
+    ``source`` is a mapping, or a path to a JSON file holding one, either from
+    verification method ids to methods, or a list of controller documents
+    (DID documents) whose ``verificationMethod`` entries are indexed by id.
+    Methods of a controller document are controlled by it unless they name
+    another ``controller``; its ``assertionMethod`` list is kept for
+    document().
+    """
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            with open(source, encoding="utf-8") as file:
+                source = json.load(file)
+        self.methods = {}
+        self.documents = {}
+        if w3c.is_array(source):
+            for document in source:
+                self.documents[document["id"]] = document
+                for method in document.get("verificationMethod", ()):
+                    method_id = _absolute(document["id"], method["id"])
+                    self.methods[method_id] = dict(method, controller=method.get("controller", document["id"]))
+        else:
+            self.methods.update(source)
+
+    def __call__(self, url):
+        return self.methods.get(url)
+
+    def document(self, controller):
+        """The controller document with id ``controller``, or None."""
+        return self.documents.get(controller)
+
+
+def chain(*resolvers):
+    """A resolver asking each of ``resolvers`` in turn."""
+    def resolve(url):
+        for resolver in resolvers:
+            method = resolver(url)
+            if method is not None:
+                return method
+        return None
+    return resolve
+
+
+def _absolute(document_id, method_id):
+    return document_id + method_id if method_id.startswith("#") else method_id
+
+
+def assertion_methods(document):
+    """The ids of the methods a controller document allows to make assertions."""
+    methods = set()
+    for method in w3c.entries(document.get("assertionMethod", ())):
+        method_id = method.get("id") if w3c.is_object(method) else method
+        if isinstance(method_id, str):
+            methods.add(_absolute(document["id"], method_id))
+    return methods
+
+
+def _without(document, key):
+    return {name: value for name, value in document.items() if name != key}
+
+
+class ProofVerifier:
+    """Verify the embedded proofs of credentials.
+
+    ``resolver`` maps a verificationMethod URL to its verification method
+    object, or None; the default knows did:key only. A proof is accepted
+    only for the ``assertionMethod`` purpose, with a method listed in the
+    issuer's controller document when ``documents`` (a DID to document
+    callable, such as KeyStore.document) knows it, and otherwise with a
+    method whose ``controller`` is the issuer. Parsed keys are kept in an LRU
+    of ``key_cache_size`` entries and processed JSON-LD contexts in one of
+    ``context_cache_size``, both shared by every credential verified.
+    """
+
+    def __init__(self, resolver=resolve_did_key, key_cache_size=1024, context_cache_size=256, documents=None):
+        from pyld.context_resolver import ContextResolver
+        from pyld.jsonld import LRUCache
+
+        self.resolver = resolver
+        self.documents = documents
+        self._contexts = ContextResolver(LRUCache(maxsize=context_cache_size), context_loader.document_loader)
+        self.key = lru_cache(maxsize=key_cache_size)(self._load_key)
+
+    def _load_key(self, url):
+        """Return (public key, controller) of the verification method ``url``."""
+        method = self.resolver(url)
+        if method is None:
+            raise ProofError(f"Verification method {url} could not be resolved")
+        return Ed25519PublicKey.from_public_bytes(public_key_bytes(method)), method.get("controller")
+
+    def check_issuer(self, vc, method, controller):
+        """Raise ProofError unless ``method`` may make assertions for the issuer of ``vc``."""
+        issuer = _issuer_key(vc)
+        if not issuer:
+            raise ProofError("Credential has no issuer to bind the proof to")
+        document = self.documents(issuer) if self.documents is not None else None
+        if document is not None:
+            if method not in assertion_methods(document):
+                raise ProofError(f"Verification method {method} is not an assertionMethod of the issuer {issuer}")
+        elif controller is None:
+            raise ProofError(f"Verification method {method} names no controller")
+        elif controller != issuer:
+            raise ProofError(f"Verification method {method} is controlled by {controller}, not the issuer {issuer}")
+
+    def canonical_rdf(self, document):
+        from pyld import jsonld
+
+        return jsonld.normalize(
+            document,
+            {
+                "algorithm": "URDNA2015",
+                "format": "application/n-quads",
+                "documentLoader": context_loader.document_loader,
+                "contextResolver": self._contexts,
+            },
+        ).encode("utf-8")
+
+    def verify_data(self, vc, proof):
+        """The bytes the proof signs: hash(proof options) + hash(credential)."""
+        options = _without(proof, "proofValue")
+        options["@context"] = vc.get("@context")
+        document = _without(vc, "proof")
+        if proof.get("type") == "DataIntegrityProof" and proof.get("cryptosuite") == "eddsa-jcs-2022":
+            from c14n.Canonicalize import canonicalize
+
+            return hashlib.sha256(canonicalize(options)).digest() + hashlib.sha256(canonicalize(document)).digest()
+        return hashlib.sha256(self.canonical_rdf(options)).digest() + hashlib.sha256(self.canonical_rdf(document)).digest()
+
+    def verify_proof(self, vc, proof):
+        """Return {"type", "verificationMethod", "verified", "error"} for one proof."""
+        report = {
+            "type": proof.get("type") if w3c.is_object(proof) else None,
+            "verificationMethod": proof.get("verificationMethod") if w3c.is_object(proof) else None,
+            "verified": False,
+            "error": None,
+        }
+        try:
+            if not w3c.is_object(proof):
+                raise ProofError("Proof is not an object")
+            if report["type"] not in SUITES:
+                raise ProofError(f"Unsupported proof type {report['type']!r}")
+            if report["type"] == "DataIntegrityProof" and proof.get("cryptosuite") not in CRYPTOSUITES:
+                raise ProofError(f"Unsupported cryptosuite {proof.get('cryptosuite')!r}")
+            if proof.get("proofPurpose") != PROOF_PURPOSE:
+                raise ProofError(f"proofPurpose MUST be {PROOF_PURPOSE!r}, not {proof.get('proofPurpose')!r}")
+            method = report["verificationMethod"]
+            if not isinstance(method, str):
+                raise ProofError("Proof has no verificationMethod URL")
+            signature = multibase_decode(proof.get("proofValue"))
+            key, controller = self.key(method)
+            self.check_issuer(vc, method, controller)
+            key.verify(signature, self.verify_data(vc, proof))
+        except InvalidSignature:
+            report["error"] = "Signature does not match."
+        except Exception as error:
+            # Malformed documents make pyld raise many kinds of errors.
+            report["error"] = str(error) or repr(error)
+        else:
+            report["verified"] = True
+        return report
+
+    def verify(self, vc):
+        """Verify every proof of ``vc``; returns {"verified", "proofs", "error"}.
+
+        A credential without proofs is not verified; ``error`` says why no
+        proof could be looked at.
+        """
+        proof = vc.get("proof", ())
+        if not w3c.is_one_or_more_objects(proof):
+            return {"verified": False, "proofs": [], "error": "proof MUST be one or more objects"}
+        proofs = [self.verify_proof(vc, entry) for entry in w3c.entries(proof)]
+        if not proofs:
+            return {"verified": False, "proofs": [], "error": "Credential has no proof"}
+        return {"verified": all(entry["verified"] for entry in proofs), "proofs": proofs, "error": None}
+
+    def verify_many(self, credentials):
+        """Verify many credentials, grouped by issuer, and return results in order.
+
+        Credentials of one issuer are verified together, so each key is
+        resolved once and the contexts they share stay hot in the cache.
+        """
+        credentials = list(credentials)
+        groups = {}
+        for index, vc in enumerate(credentials):
+            groups.setdefault(_issuer_key(vc), []).append(index)
+        results = [None] * len(credentials)
+        for indexes in groups.values():
+            for index in indexes:
+                results[index] = self.verify(credentials[index])
+        return results
+
+
+def _issuer_key(vc):
+    issuer = vc.get("issuer")
+    if w3c.is_object(issuer):
+        issuer = issuer.get("id")
+    return issuer if isinstance(issuer, str) else ""
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite verify",
+        description="Verify the embedded Ed25519 proofs of newline-delimited JSON credentials, one result line per credential.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="file to read, '-' for stdin (default)")
+    parser.add_argument("--keys", default=None, help="JSON file of verification methods to resolve keys from, besides did:key")
+    parser.add_argument("--batch-size", type=int, default=1000, help="credentials grouped by issuer at a time (default: 1000)")
+    args = parser.parse_args(argv)
+
+    if args.keys is None:
+        verifier = ProofVerifier(resolve_did_key)
+    else:
+        store = KeyStore(args.keys)
+        verifier = ProofVerifier(chain(resolve_did_key, store), documents=store.document)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        from vc_test_suite.batch import check_ndjson
+
+        check_ndjson(source, verifier.verify_many, args.batch_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
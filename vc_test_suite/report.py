@@ -0,0 +1,242 @@
+import sys
+import json
+import random
+import argparse
+from vc_test_suite.batch import read_ndjson
+from vc_test_suite.vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
+
+# Folds a stream of results into failure counts per statement and per issuer,
+# plus a few example credentials per statement. Memory is bounded by the
+# number of statements, ``max_issuers`` and ``samples``, never by the corpus.
+
+OTHER_ISSUERS = "(other issuers)"
+NO_ISSUER = "(no issuer)"
+
+
+def issuer_of(vc):
+    """The issuer URL of a credential, or None when it has no usable one."""
+    issuer = vc.get("issuer")
+    if isinstance(issuer, dict):
+        issuer = issuer.get("id")
+    return issuer if isinstance(issuer, str) else None
+
+
+def failures(result):
+    """Yield (property, statement, required) for each failed check of ``result``.
+
+    Takes the dicts of every mode: "full", "required-only" and
+    "conformant-only", whose single ``failure`` is a required one.
+    """
+    if "verifications" not in result:
+        failure = result.get("failure")
+        if failure is not None:
+            yield failure["property"], failure["statement"], True
+        return
+    for key, tests in result["verifications"].items():
+        for test in tests:
+            if not test["pass"]:
+                yield key, test["statement"], test["required"]
+
+
+class _Statement:
+    __slots__ = ("key", "statement", "required", "failed", "examples")
+
+    def __init__(self, key, statement, required):
+        self.key = key
+        self.statement = statement
+        self.required = required
+        self.failed = 0
+        self.examples = []
+
+
+class FailureReport:
+    """Aggregate validation results one at a time.
+
+    Every statement keeps a failure count and a uniform sample of at most
+    ``samples`` example ids (reservoir sampling, seeded by ``seed`` so runs
+    are repeatable). The first ``max_issuers`` distinct issuers are broken
+    down individually; later ones are counted together as OTHER_ISSUERS.
+    """
+
+    def __init__(self, samples=5, max_issuers=1000, seed=0):
+        self.samples = samples
+        self.max_issuers = max_issuers
+        self._random = random.Random(seed)
+        self._statements = {}
+        self._issuers = {}
+        self.credentials = 0
+        self.conformant = 0
+        self.errors = 0
+
+    def add(self, result, example=None, issuer=None):
+        """Count one result; ``example`` identifies the credential in samples."""
+        self.credentials += 1
+        self.conformant += result["conformant"]
+        issuer = NO_ISSUER if issuer is None else issuer
+        if issuer not in self._issuers and len(self._issuers) >= self.max_issuers:
+            issuer = OTHER_ISSUERS
+        entry = self._issuers.get(issuer)
+        if entry is None:
+            entry = self._issuers[issuer] = {"credentials": 0, "nonconformant": 0, "failures": {}}
+        entry["credentials"] += 1
+        entry["nonconformant"] += not result["conformant"]
+        counts = entry["failures"]
+        for key, statement, required in failures(result):
+            record = self._statements.get((key, statement))
+            if record is None:
+                record = self._statements[(key, statement)] = _Statement(key, statement, required)
+            record.failed += 1
+            counts[record] = counts.get(record, 0) + 1
+            if example is None:
+                continue
+            if len(record.examples) < self.samples:
+                record.examples.append(example)
+            else:
+                slot = self._random.randrange(record.failed)
+                if slot < self.samples:
+                    record.examples[slot] = example
+
+    def add_credential(self, vc, result, location=None):
+        """Count the result of ``vc``, sampled by its id, else by ``location``."""
+        example = vc.get("id") if isinstance(vc.get("id"), str) else location
+        self.add(result, example, issuer_of(vc))
+
+    def add_error(self):
+        """Count an input that could not be validated at all."""
+        self.errors += 1
+
+    def to_dict(self):
+        """The report as JSON-ready data, statements and issuers by most failures first."""
+        statements = sorted(self._statements.values(), key=lambda record: (-record.failed, record.key))
+        issuers = sorted(self._issuers.items(), key=lambda item: (-item[1]["nonconformant"], item[0]))
+        return {
+            "credentials": self.credentials,
+            "conformant": self.conformant,
+            "nonconformant": self.credentials - self.conformant,
+            "errors": self.errors,
+            "statements": [
+                {
+                    "property": record.key,
+                    "statement": record.statement,
+                    "required": record.required,
+                    "failed": record.failed,
+                    "examples": list(record.examples),
+                }
+                for record in statements
+            ],
+            "issuers": [
+                {
+                    "issuer": issuer,
+                    "credentials": entry["credentials"],
+                    "nonconformant": entry["nonconformant"],
+                    "failures": [
+                        {"property": record.key, "statement": record.statement, "failed": count}
+                        for record, count in sorted(entry["failures"].items(), key=lambda item: -item[1])
+                    ],
+                }
+                for issuer, entry in issuers
+            ],
+        }
+
+    def summary(self, top=10):
+        """A human-readable digest of the report, ``top`` entries per list."""
+        report = self.to_dict()
+        lines = [
+            f"{report['credentials']} credentials: {report['conformant']} conformant, "
+            f"{report['nonconformant']} nonconformant, {report['errors']} errors"
+        ]
+        if report["statements"]:
+            lines.append("")
+            lines.append("Most failed statements:")
+            for record in report["statements"][:top]:
+                level = "MUST" if record["required"] else "optional"
+                lines.append(f"  {record['failed']:>8}  {record['property']}: {record['statement']} ({level})")
+                if record["examples"]:
+                    lines.append(f"            e.g. {', '.join(str(example) for example in record['examples'])}")
+        offenders = [entry for entry in report["issuers"] if entry["nonconformant"]]
+        if offenders:
+            lines.append("")
+            lines.append("Issuers with most nonconformant credentials:")
+            for entry in offenders[:top]:
+                lines.append(f"  {entry['nonconformant']:>8}/{entry['credentials']:<8} {entry['issuer']}")
+        return "\n".join(lines)
+
+
+def _credentials_by_line(stream):
+    """Return a lookup of credentials by line number for an ordered walk.
+
+    Lines are read as batch reads them: JSON, or a VC-JWT as is or as a JSON
+    string.
+    """
+    lines = read_ndjson(stream)
+    current = [0, None]
+
+    def lookup(line_number):
+        while current[0] < line_number:
+            try:
+                current[0], current[1] = next(lines)
+            except StopIteration:
+                current[0], current[1] = float("inf"), None
+        if current[0] != line_number:
+            return None
+        text = current[1]
+        try:
+            vc = decode_jwt(text)[1] if looks_like_jwt(text) else json.loads(text)
+            if isinstance(vc, str) and looks_like_jwt(vc):
+                vc = decode_jwt(vc)[1]
+        except (JwtError, ValueError):
+            return None
+        return vc if isinstance(vc, dict) else None
+
+    return lookup
+
+
+def build_report(results, credentials=None, **options):
+    """Fold the JSON lines written by ``vc_test_suite batch`` into a FailureReport.
+
+    ``credentials``, the NDJSON input of that run, supplies ids and issuers;
+    the results must then be in input order, as batch writes them unless
+    ``--unordered``. Without it, samples are the line numbers or offsets.
+    """
+    report = FailureReport(**options)
+    lookup = None if credentials is None else _credentials_by_line(credentials)
+    for _, line in read_ndjson(results):
+        entry = json.loads(line)
+        if "result" not in entry:
+            report.add_error()
+            continue
+        location = f"line {entry['line']}" if "line" in entry else f"offset {entry.get('offset')}"
+        vc = None if lookup is None or "line" not in entry else lookup(entry["line"])
+        if vc is None:
+            report.add(entry["result"], location)
+        else:
+            report.add_credential(vc, entry["result"], location)
+    return report
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite report",
+        description="Summarise the output of 'vc_test_suite batch': failures per statement and per issuer, with examples.",
+    )
+    parser.add_argument("results", nargs="?", default="-", help="batch output to read, '-' for stdin (default)")
+    parser.add_argument("--credentials", default=None, help="the NDJSON input of the batch run, for credential ids and issuers")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="human-readable summary or the full JSON report (default: text)")
+    parser.add_argument("--samples", type=int, default=5, help="example credentials kept per statement (default: 5)")
+    parser.add_argument("--max-issuers", type=int, default=1000, help="issuers broken down individually (default: 1000)")
+    parser.add_argument("--top", type=int, default=10, help="entries per list in the text summary (default: 10)")
+    args = parser.parse_args(argv)
+
+    results = sys.stdin if args.results == "-" else open(args.results, encoding="utf-8")
+    credentials = None if args.credentials is None else open(args.credentials, encoding="utf-8")
+    try:
+        report = build_report(results, credentials, samples=args.samples, max_issuers=args.max_issuers)
+    finally:
+        if results is not sys.stdin:
+            results.close()
+        if credentials is not None:
+            credentials.close()
+    if args.format == "json":
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        print(report.summary(args.top))
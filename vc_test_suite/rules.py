@@ -0,0 +1,331 @@
+import struct
+import weakref
+from collections import namedtuple
+
+# A single check, reported with the statement at `index` of its section.
+# `check` receives the property value; `when`, if given, must also hold for
+# the check to be reported at all. Contextual rules look beyond their own
+# property: both functions are called with (value, vc, options), and `reads`
+# names the other top-level properties they look at.
+Rule = namedtuple("Rule", ["index", "required", "check", "when", "contextual", "reads"], defaults=[None, None, False, ()])
+
+# The checks for one top-level property. `presence` is reported whenever the
+# section is, `rules` only when the property exists. Optional sections are left
+# out of the report entirely when the property is missing.
+Section = namedtuple("Section", ["presence", "rules", "optional"], defaults=[(), False])
+
+CompiledRule = namedtuple("CompiledRule", ["statement", "required", "check", "when", "contextual"])
+# A section whose `statement` is None does not report its presence check.
+# `presence`, if given, is called with the credential instead of testing
+# `key in vc`; instrumentation uses it to time presence checks.
+CompiledSection = namedtuple("CompiledSection", ["key", "optional", "statement", "required", "rules", "presence"], defaults=[None])
+
+# How much of a plan to run: everything, only required checks, or required
+# checks up to the first failure.
+MODES = ("full", "required-only", "conformant-only")
+
+# One reportable check of a plan: a section's presence check or one of its
+# rules. A CheckTable numbers them in plan order; `required_mask` has the bit
+# of every required check set.
+Check = namedtuple("Check", ["key", "statement", "required"])
+CheckTable = namedtuple("CheckTable", ["checks", "required_mask"])
+
+
+def compile_rules(table, statements):
+    """Resolve a rule table against its statements into an evaluation plan."""
+    compiled = []
+    for key, section in table.items():
+        compiled.append(
+            CompiledSection(
+                key=key,
+                optional=section.optional,
+                statement=statements[key][section.presence.index],
+                required=section.presence.required,
+                rules=tuple(
+                    CompiledRule(statements[key][rule.index], rule.required, rule.check, rule.when, rule.contextual)
+                    for rule in section.rules
+                ),
+            )
+        )
+    return tuple(compiled)
+
+
+def dependency_index(table):
+    """Map each top-level property to the sections of a rule table that read it."""
+    index = {}
+    for key, section in table.items():
+        for read in (key, *(read for rule in section.rules for read in rule.reads)):
+            sections = index.setdefault(read, [])
+            if key not in sections:
+                sections.append(key)
+    return {read: tuple(sections) for read, sections in index.items()}
+
+
+def required_plan(plan):
+    """Strip a plan down to its required checks.
+
+    Optional rules are dropped, presence checks that are not required are no
+    longer reported and sections left without checks are skipped entirely.
+    """
+    stripped = []
+    for section in plan:
+        rules = tuple(rule for rule in section.rules if rule.required)
+        if section.required:
+            stripped.append(section._replace(rules=rules))
+        elif rules:
+            stripped.append(section._replace(statement=None, rules=rules))
+    return tuple(stripped)
+
+
+# Every ActivePlan, so that wrap_plans reaches the plans of all validators.
+_active_plans = weakref.WeakSet()
+_plan_wrapper = None
+
+
+class ActivePlan:
+    """The plan a validator runs: ``base`` as compiled, or a wrapped copy of it.
+
+    ``plan`` and ``required``, its required_plan, are what to evaluate. They
+    are ``base`` unless wrap_plans has set a wrapper, which then also applies
+    to plans created later, such as those of rulesets loaded afterwards.
+    """
+
+    __slots__ = ("base", "plan", "required", "__weakref__")
+
+    def __init__(self, base):
+        self.base = base
+        self._wrap(_plan_wrapper)
+        _active_plans.add(self)
+
+    def _wrap(self, wrapper):
+        plan = self.base if wrapper is None else wrapper(self.base)
+        self.plan, self.required = plan, required_plan(plan)
+
+
+def wrap_plans(wrapper):
+    """Run ``wrapper(plan)`` instead of every plan, or the plain plans again for None."""
+    global _plan_wrapper
+    _plan_wrapper = wrapper
+    for active in list(_active_plans):
+        active._wrap(wrapper)
+
+
+def evaluate(plan, vc, options=None):
+    """Run a compiled plan over a credential, visiting each property once.
+
+    ``options`` is handed to contextual rules as is.
+    """
+    verifications = {}
+    required_test_count = 0
+    optional_test_count = 0
+    required_test_pass = 0
+    optional_test_pass = 0
+
+    for key, optional, statement, required, rules, presence in plan:
+        present = key in vc if presence is None else presence(vc)
+        if not present and (optional or statement is None):
+            continue
+        if statement is None:
+            tests = []
+        else:
+            tests = [{"statement": statement, "required": required, "pass": present}]
+            if required:
+                required_test_count += 1
+                required_test_pass += present
+            else:
+                optional_test_count += 1
+                optional_test_pass += present
+        if present:
+            value = vc[key]
+            for statement, required, check, when, contextual in rules:
+                if contextual:
+                    if when is not None and not when(value, vc, options):
+                        continue
+                    passed = bool(check(value, vc, options))
+                else:
+                    if when is not None and not when(value):
+                        continue
+                    passed = bool(check(value))
+                tests.append({"statement": statement, "required": required, "pass": passed})
+                if required:
+                    required_test_count += 1
+                    required_test_pass += passed
+                else:
+                    optional_test_count += 1
+                    optional_test_pass += passed
+        if tests:
+            verifications[key] = tests
+
+    return {
+        "conformant": required_test_pass == required_test_count,
+        "required_score": f"{required_test_pass}/{required_test_count}",
+        "optional_score": f"{optional_test_pass}/{optional_test_count}",
+        "verifications": verifications,
+    }
+
+
+def first_failure(plan, vc, options=None):
+    """Return (key, statement) of the first required check that fails, or None.
+
+    Stops there, so a non-conformant credential costs only the checks up to
+    its first failure. Optional checks are never run.
+    """
+    for key, optional, statement, required, rules, presence in plan:
+        if not (key in vc if presence is None else presence(vc)):
+            if required and not optional:
+                return key, statement
+            continue
+        value = vc[key]
+        for statement, required, check, when, contextual in rules:
+            if not required:
+                continue
+            if contextual:
+                if when is None or when(value, vc, options):
+                    if not check(value, vc, options):
+                        return key, statement
+            elif when is None or when(value):
+                if not check(value):
+                    return key, statement
+    return None
+
+
+def evaluate_mode(plan, stripped, vc, options=None, mode="full"):
+    """Evaluate in one of MODES, given a plan and its required_plan."""
+    if mode == "full":
+        return evaluate(plan, vc, options)
+    if mode == "required-only":
+        return evaluate(stripped, vc, options)
+    if mode == "conformant-only":
+        failure = first_failure(stripped, vc, options)
+        if failure is None:
+            return {"conformant": True, "failure": None}
+        return {"conformant": False, "failure": {"property": failure[0], "statement": failure[1]}}
+    raise ValueError(f"Unknown mode {mode!r}, expected one of {', '.join(MODES)}")
+
+
+def check_table(plan):
+    """Number the checks of a compiled plan, see CompactResult."""
+    checks = []
+    for key, optional, statement, required, rules, presence in plan:
+        checks.append(Check(key, statement, required))
+        checks.extend(Check(key, rule.statement, rule.required) for rule in rules)
+    required_mask = sum(1 << bit for bit, check in enumerate(checks) if check.required)
+    return CheckTable(tuple(checks), required_mask)
+
+
+def evaluate_compact(plan, vc, options=None):
+    """Like evaluate, but return (reported, passed) bitmasks over check_table(plan)."""
+    reported = 0
+    passed = 0
+    bit = 1
+
+    for key, optional, statement, required, rules, presence in plan:
+        present = key in vc if presence is None else presence(vc)
+        if present:
+            reported |= bit
+            passed |= bit
+        elif not optional:
+            reported |= bit
+        bit <<= 1
+        if not present:
+            bit <<= len(rules)
+            continue
+        value = vc[key]
+        for statement, required, check, when, contextual in rules:
+            if contextual:
+                if when is None or when(value, vc, options):
+                    reported |= bit
+                    if check(value, vc, options):
+                        passed |= bit
+            elif when is None or when(value):
+                reported |= bit
+                if check(value):
+                    passed |= bit
+            bit <<= 1
+
+    return reported, passed
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+class CompactResult:
+    """A result as two bitmasks over a CheckTable.
+
+    Bit i of ``reported`` is set when check i was run and bit i of ``passed``
+    when it passed. Statements are only looked up in the table when the
+    result is expanded to the shape evaluate returns.
+    """
+
+    __slots__ = ("table", "reported", "passed")
+
+    def __init__(self, table, reported, passed):
+        self.table = table
+        self.reported = reported
+        self.passed = passed
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactResult):
+            return NotImplemented
+        return (self.table, self.reported, self.passed) == (other.table, other.reported, other.passed)
+
+    def __hash__(self):
+        return hash((self.reported, self.passed))
+
+    def __repr__(self):
+        return f"CompactResult(reported={self.reported:#x}, passed={self.passed:#x})"
+
+    def scores(self):
+        """Return (required_pass, required_count, optional_pass, optional_count)."""
+        required_mask = self.table.required_mask
+        return (
+            _popcount(self.passed & required_mask),
+            _popcount(self.reported & required_mask),
+            _popcount(self.passed & ~required_mask),
+            _popcount(self.reported & ~required_mask),
+        )
+
+    @property
+    def conformant(self):
+        required_mask = self.table.required_mask
+        return self.passed & required_mask == self.reported & required_mask
+
+    def expand(self):
+        """Return the verbose result dict, as evaluate builds it."""
+        verifications = {}
+        for bit, check in enumerate(self.table.checks):
+            if self.reported >> bit & 1:
+                verifications.setdefault(check.key, []).append(
+                    {"statement": check.statement, "required": check.required, "pass": bool(self.passed >> bit & 1)}
+                )
+        required_pass, required_count, optional_pass, optional_count = self.scores()
+        return {
+            "conformant": required_pass == required_count,
+            "required_score": f"{required_pass}/{required_count}",
+            "optional_score": f"{optional_pass}/{optional_count}",
+            "verifications": verifications,
+        }
+
+    def to_bytes(self):
+        """Serialize as the check count followed by both bitmasks, little-endian."""
+        count = len(self.table.checks)
+        width = (count + 7) // 8
+        return struct.pack("<H", count) + self.reported.to_bytes(width, "little") + self.passed.to_bytes(width, "little")
+
+    @classmethod
+    def from_bytes(cls, data, table):
+        """Read a result written by to_bytes for the same table."""
+        if len(data) < 2:
+            raise ValueError("Compact result is truncated")
+        (count,) = struct.unpack_from("<H", data)
+        if count != len(table.checks):
+            raise ValueError(f"Compact result has {count} checks, the table has {len(table.checks)}")
+        width = (count + 7) // 8
+        if len(data) != 2 + 2 * width:
+            raise ValueError("Compact result has the wrong length")
+        reported = int.from_bytes(data[2:2 + width], "little")
+        passed = int.from_bytes(data[2 + width:], "little")
+        if passed & ~reported:
+            raise ValueError("Compact result passes checks it did not run")
+        return cls(table, reported, passed)
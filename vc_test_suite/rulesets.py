@@ -0,0 +1,111 @@
+import threading
+import importlib
+from collections.abc import Mapping
+from vc_test_suite.rules import ActivePlan, compile_rules, evaluate_mode
+from vc_test_suite.timestamps import instant_from_datetime
+
+# Validators by name, each loaded the first time a credential needs it. A
+# validator takes (vc, now=None, mode="full") and returns what
+# test_data_model_v1 does. Registering one costs nothing: its module is only
+# imported, and its rules compiled, on first use.
+
+DEFAULT_RULESET = "vcdm-1.1"
+
+
+class UnknownRuleset(ValueError):
+    """No ruleset is registered under the name asked for."""
+
+
+class Ruleset:
+    """A validator for a rule table and its statements, compiled on first call.
+
+    For in-house profiles: build ``rules`` like w3c.VCDM_V1_RULES, keyed like
+    ``statements``, and register the Ruleset under a name.
+    """
+
+    def __init__(self, rules, statements):
+        self.rules = rules
+        self.statements = statements
+        self._active = None
+
+    @property
+    def plan(self):
+        return self._compiled().base
+
+    def _compiled(self):
+        if self._active is None:
+            self._active = ActivePlan(compile_rules(self.rules, self.statements))
+        return self._active
+
+    def __call__(self, vc, now=None, mode="full"):
+        active = self._compiled()
+        options = None if now is None else {"now": instant_from_datetime(now)}
+        return evaluate_mode(active.plan, active.required, vc, options, mode)
+
+
+_lock = threading.Lock()
+_loaders = {}
+_loaded = {}
+_contexts = {}
+
+
+def register(name, loader, contexts=()):
+    """Register a ruleset under ``name``, replacing any earlier one.
+
+    ``loader`` is the validator itself, such as a Ruleset, or a
+    "module:attribute" string naming it, imported on first use.
+    Credentials whose first @context item is one of ``contexts`` are detected
+    as this ruleset.
+    """
+    with _lock:
+        _loaders[name] = loader
+        _loaded.pop(name, None)
+        for context in contexts:
+            _contexts[context] = name
+
+
+def names():
+    return list(_loaders)
+
+
+def loaded():
+    """Names of the rulesets loaded so far."""
+    return list(_loaded)
+
+
+def get(name):
+    """Return the validator registered as ``name``, loading it if needed."""
+    validator = _loaded.get(name)
+    if validator is not None:
+        return validator
+    with _lock:
+        if name not in _loaders:
+            raise UnknownRuleset(f"Unknown ruleset {name!r}; registered: {', '.join(_loaders)}")
+        validator = _loaders[name]
+        if isinstance(validator, str):
+            module, _, attribute = validator.partition(":")
+            validator = getattr(importlib.import_module(module), attribute)
+        _loaded[name] = validator
+        return validator
+
+
+def detect(vc):
+    """Name the ruleset for ``vc`` from its first @context item.
+
+    Anything unrecognised, including malformed credentials, is DEFAULT_RULESET.
+    """
+    context = vc.get("@context") if isinstance(vc, Mapping) else None
+    if isinstance(context, (list, tuple)):
+        context = context[0] if context else None
+    if not isinstance(context, str):
+        return DEFAULT_RULESET
+    return _contexts.get(context, DEFAULT_RULESET)
+
+
+def test_data_model(vc, now=None, mode="full", ruleset=None):
+    """Check a credential against ``ruleset``, or the one its @context names."""
+    return get(detect(vc) if ruleset is None else ruleset)(vc, now, mode)
+
+
+register("vcdm-1.1", "vc_test_suite.w3c:test_data_model_v1", contexts=("https://www.w3.org/2018/credentials/v1",))
+register("vcdm-2.0", "vc_test_suite.vcdm2:test_data_model_v2", contexts=("https://www.w3.org/ns/credentials/v2",))
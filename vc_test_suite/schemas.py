@@ -0,0 +1,225 @@
+import os
+import sys
+import json
+import argparse
+import threading
+from functools import lru_cache
+from cachetools import LRUCache
+from jsonschema.exceptions import SchemaError
+from jsonschema.validators import validator_for
+from referencing import Registry, Resource
+from referencing.exceptions import NoSuchResource, Unresolvable
+from referencing.jsonschema import DRAFT202012
+from vc_test_suite import w3c
+
+# Validates credentials against the JSON Schemas their credentialSchema
+# entries reference. Needs jsonschema, which the rest of the package does not.
+# Schemas come from a loader, by default a local registry directory, and are
+# compiled into validators once per schema id. A $ref to another schema is
+# resolved through the same loader.
+
+# JsonSchemaValidator2018 schemas describe each credentialSubject; the
+# JsonSchema type of VCDM 2.0 describes the whole credential.
+SUBJECT_SCHEMA_TYPES = ("JsonSchemaValidator2018",)
+CREDENTIAL_SCHEMA_TYPES = ("JsonSchema",)
+
+# Errors listed per schema; the count is always complete.
+MAX_ERRORS = 10
+
+
+class SchemaLoadError(ValueError):
+    """A schema that cannot be found, read or compiled."""
+
+
+class SchemaDirectory:
+    """Schemas from ``*.json`` files in a directory, looked up by their ``$id``.
+
+    The directory is scanned once for ids; each file is read again only when
+    its schema has to be compiled.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.paths = {}
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, encoding="utf-8") as file:
+                    schema = json.load(file)
+            except (OSError, ValueError):
+                continue
+            if isinstance(schema, dict):
+                schema_id = schema.get("$id", schema.get("id"))
+                if isinstance(schema_id, str):
+                    self.paths[schema_id] = path
+
+    def __call__(self, schema_id):
+        path = self.paths.get(schema_id)
+        if path is None:
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+
+class SchemaEnforcer:
+    """Check credentials against the schemas their credentialSchema entries name.
+
+    ``loader`` maps a schema id to the schema, or None. Each schema is
+    compiled into a jsonschema validator once and kept in an LRU of
+    ``maxsize`` schemas, failures included, so a schema that cannot be used
+    is not loaded again for every credential that references it. Schemas
+    reached through ``$ref`` are kept in an LRU of the same size.
+    """
+
+    def __init__(self, loader, maxsize=256):
+        self.loader = loader
+        self._validators = LRUCache(maxsize)
+        self._registry = Registry(retrieve=lru_cache(maxsize=maxsize)(self._retrieve))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def validator(self, schema_id):
+        """Return the compiled validator for ``schema_id``; raises SchemaLoadError."""
+        with self._lock:
+            validator = self._validators.get(schema_id)
+            if validator is not None:
+                self.hits += 1
+        if validator is None:
+            validator = self._compile(schema_id)
+            with self._lock:
+                self.misses += 1
+                self._validators[schema_id] = validator
+        if isinstance(validator, SchemaLoadError):
+            raise validator
+        return validator
+
+    def _retrieve(self, uri):
+        schema = self.loader(uri)
+        if schema is None:
+            raise NoSuchResource(ref=uri)
+        return Resource.from_contents(schema, default_specification=DRAFT202012)
+
+    def _compile(self, schema_id):
+        try:
+            schema = self.loader(schema_id)
+        except (OSError, ValueError) as error:
+            return SchemaLoadError(f"Schema {schema_id} could not be read: {error}")
+        if schema is None:
+            return SchemaLoadError(f"Schema {schema_id} could not be found")
+        try:
+            cls = validator_for(schema)
+            cls.check_schema(schema)
+        except SchemaError as error:
+            return SchemaLoadError(f"Schema {schema_id} is not a valid JSON Schema: {error.message}")
+        return cls(schema, registry=self._registry)
+
+    def check_entry(self, vc, entry, lookup=None):
+        """Return {"id", "type", "valid", "errors", "error_count", "error"} for one credentialSchema entry.
+
+        ``errors`` lists the first MAX_ERRORS of the ``error_count`` places
+        where the credential breaks the schema; ``error`` says why the schema
+        could not be applied at all, including a ``$ref`` that cannot be
+        resolved. ``lookup`` replaces validator() to find the compiled schema.
+        """
+        report = {
+            "id": entry.get("id") if w3c.is_object(entry) else None,
+            "type": entry.get("type") if w3c.is_object(entry) else None,
+            "valid": False,
+            "errors": [],
+            "error_count": 0,
+            "error": None,
+        }
+        if report["type"] in SUBJECT_SCHEMA_TYPES:
+            if "credentialSubject" not in vc:
+                report["error"] = "Credential has no credentialSubject to validate"
+                return report
+            subject = vc["credentialSubject"]
+            instances = w3c.entries(subject) if w3c.is_one_or_more_objects(subject) else ()
+            if not instances or not all(w3c.is_object(instance) for instance in instances):
+                report["error"] = "credentialSubject MUST be one or more objects"
+                return report
+        elif report["type"] in CREDENTIAL_SCHEMA_TYPES:
+            instances = (vc,)
+        else:
+            report["error"] = f"Unsupported credentialSchema type {report['type']!r}"
+            return report
+        if not isinstance(report["id"], str):
+            report["error"] = "credentialSchema has no id"
+            return report
+        try:
+            validator = (lookup or self.validator)(report["id"])
+        except SchemaLoadError as error:
+            report["error"] = str(error)
+            return report
+        count = 0
+        try:
+            for instance in instances:
+                for error in validator.iter_errors(instance):
+                    count += 1
+                    if len(report["errors"]) < MAX_ERRORS:
+                        path = "/".join(str(part) for part in error.absolute_path)
+                        report["errors"].append(f"/{path}: {error.message}")
+        except Unresolvable as error:
+            report["errors"] = []
+            report["error"] = f"Schema {report['id']} could not be applied: {error}"
+            return report
+        report["valid"] = count == 0
+        report["error_count"] = count
+        return report
+
+    def check(self, vc, lookup=None):
+        """Check ``vc`` against each of its schemas; returns {"valid", "schemas", "error"}.
+
+        A credential without schemas is valid; ``error`` says why its schemas
+        could not be looked at.
+        """
+        entries = vc.get("credentialSchema", ())
+        if not w3c.is_one_or_more_objects(entries):
+            return {"valid": False, "schemas": [], "error": "credentialSchema MUST be one or more objects"}
+        schemas = [self.check_entry(vc, entry, lookup) for entry in w3c.entries(entries)]
+        return {"valid": all(schema["valid"] for schema in schemas), "schemas": schemas, "error": None}
+
+    def check_many(self, credentials):
+        """Check many credentials, fetching each compiled schema once, and return results in order."""
+        validators = {}
+
+        def lookup(schema_id):
+            if schema_id not in validators:
+                try:
+                    validators[schema_id] = self.validator(schema_id)
+                except SchemaLoadError as error:
+                    validators[schema_id] = error
+            validator = validators[schema_id]
+            if isinstance(validator, SchemaLoadError):
+                raise validator
+            return validator
+
+        return [self.check(vc, lookup) for vc in credentials]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "schemas": len(self._validators), "maxsize": self._validators.maxsize}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite schema",
+        description="Validate newline-delimited JSON credentials against the JSON Schemas they reference, one result line per credential.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="file to read, '-' for stdin (default)")
+    parser.add_argument("--schemas", required=True, help="directory of JSON Schema files, looked up by their $id")
+    parser.add_argument("--batch-size", type=int, default=1000, help="credentials checked together (default: 1000)")
+    args = parser.parse_args(argv)
+
+    enforcer = SchemaEnforcer(SchemaDirectory(args.schemas))
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        from vc_test_suite.batch import check_ndjson
+
+        check_ndjson(source, enforcer.check_many, args.batch_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
@@ -0,0 +1,317 @@
+import os
+import json
+import time
+import signal
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from vc_test_suite import rulesets
+from vc_test_suite.rules import MODES
+from vc_test_suite.rulesets import test_data_model
+from vc_test_suite.vcjwt import JwtError, decode as decode_jwt, looks_like_jwt
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    411: "Length Required",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+MAX_HEADER_SIZE = 16 * 1024
+
+
+def _error(message):
+    return json.dumps({"error": message})
+
+
+def configure_contexts(online=False, allow=None):
+    """Limit which @context URLs the validation of untrusted input may fetch.
+
+    By default nothing is fetched: bundled and already cached contexts are
+    used and any other fails the context check. ``allow`` lists URL prefixes
+    that may be fetched, ``online`` lets every URL be fetched.
+    """
+    from vc_test_suite import context_loader
+
+    context_loader.configure(
+        cache_dir=context_loader.document_loader.cache_dir,
+        offline=not online and not allow,
+        allow=None if online or not allow else allow,
+    )
+
+
+def validate_one(vc, mode="full", ruleset=None):
+    if isinstance(vc, str) and looks_like_jwt(vc):
+        try:
+            vc = decode_jwt(vc)[1]
+        except JwtError as error:
+            return {"error": f"Invalid VC-JWT: {error}"}
+    if not isinstance(vc, dict):
+        return {"error": "Credential MUST be a JSON object."}
+    try:
+        return {"result": test_data_model(vc, mode=mode, ruleset=ruleset)}
+    except Exception as error:
+        return {"error": f"Validation failed: {error!r}"}
+
+
+def validate_body(body, max_batch=None, mode="full", ruleset=None):
+    """Validate a request body in a worker and return (status, JSON text).
+
+    A single credential is expected unless ``max_batch`` is given, in which
+    case the body must be an array of at most that many credentials. A
+    credential is a JSON object or a VC-JWT, given as is or as a JSON string.
+    """
+    try:
+        if body.lstrip().startswith(b"eyJ"):
+            document = decode_jwt(body.decode("ascii"))[1]
+        else:
+            document = json.loads(body)
+        if isinstance(document, str) and looks_like_jwt(document):
+            document = decode_jwt(document)[1]
+    except (JwtError, UnicodeDecodeError) as error:
+        return 400, _error(f"Invalid VC-JWT: {error}")
+    except ValueError as error:
+        return 400, _error(f"Invalid JSON: {error}")
+    if max_batch is None:
+        if not isinstance(document, dict):
+            return 400, _error("Credential MUST be a JSON object.")
+        return 200, json.dumps(test_data_model(document, mode=mode, ruleset=ruleset))
+    if not isinstance(document, list):
+        return 400, _error("Batch MUST be a JSON array of credentials.")
+    if len(document) > max_batch:
+        return 413, _error(f"Batch holds {len(document)} credentials, the limit is {max_batch}.")
+    return 200, json.dumps([validate_one(vc, mode, ruleset) for vc in document])
+
+
+def validate_presentation_body(body, max_credentials=None, mode="full", ruleset=None):
+    """Like validate_body, for one presentation of at most ``max_credentials`` credentials."""
+    from vc_test_suite.presentation import embedded_credentials, test_presentation_v1
+
+    try:
+        document = json.loads(body)
+    except ValueError as error:
+        return 400, _error(f"Invalid JSON: {error}")
+    if not isinstance(document, dict):
+        return 400, _error("Presentation MUST be a JSON object.")
+    count = len(embedded_credentials(document))
+    if max_credentials is not None and count > max_credentials:
+        return 413, _error(f"Presentation holds {count} credentials, the limit is {max_credentials}.")
+    return 200, json.dumps(test_presentation_v1(document, mode=mode, ruleset=ruleset))
+
+
+class ValidationServer:
+    """Serve rulesets.test_data_model over HTTP/1.1 on an asyncio event loop.
+
+    Endpoints:
+        POST /validate        one credential, responds with its results
+        POST /validate/batch  an array of credentials, responds with an array
+                              of {"result": ...} or {"error": ...}
+        POST /validate/presentation
+                              a presentation, responds with the report on it
+                              and on each credential it carries
+        GET  /health          liveness and counters
+
+    Validation runs on ``executor``, whose processes should have called
+    configure_contexts first: the server validates untrusted credentials,
+    and their @context URLs would otherwise be fetched from wherever they
+    point. At most ``max_pending`` validations are
+    queued or running at once; further requests get 503 with Retry-After
+    instead of piling up in memory. ``mode`` picks the checks run, see
+    test_data_model_v1, and ``ruleset`` the rules, detected from each
+    credential's @context when None.
+    """
+
+    def __init__(self, executor, max_body=1024 * 1024, max_batch=1000, max_pending=64, timeout=30, mode="full", ruleset=None):
+        self.executor = executor
+        self.mode = mode
+        self.ruleset = ruleset
+        self.max_body = max_body
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.started = time.time()
+        self.pending = 0
+        self.metrics = {
+            "requests": 0,
+            "validated": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+        self.responses = {}
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.started, 3),
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            **self.metrics,
+            "responses": {str(status): count for status, count in sorted(self.responses.items())},
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 431, _error("Request headers are too large."), False)
+                    return
+                method, path, headers, keep_alive = self.parse_head(head)
+                if method is None:
+                    await self.respond(writer, 400, _error("Malformed request."), False)
+                    return
+                status, body, keep_alive = await self.dispatch(reader, method, path, headers, keep_alive)
+                await self.respond(writer, status, body, keep_alive)
+        finally:
+            writer.close()
+
+    def parse_head(self, head):
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            return None, None, None, False
+        method, path, version = parts
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path.split("?", 1)[0], headers, keep_alive
+
+    async def dispatch(self, reader, method, path, headers, keep_alive):
+        self.metrics["requests"] += 1
+        if path == "/health":
+            if method != "GET":
+                return 405, _error("Use GET."), keep_alive
+            return 200, json.dumps(self.health()), keep_alive
+        if path not in ("/validate", "/validate/batch", "/validate/presentation"):
+            return 404, _error("Unknown endpoint."), keep_alive
+        if method != "POST":
+            return 405, _error("Use POST."), keep_alive
+
+        if "content-length" not in headers:
+            return 411, _error("Content-Length is required."), False
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            return 400, _error("Invalid Content-Length."), False
+        if length < 0:
+            return 400, _error("Invalid Content-Length."), False
+        if length > self.max_body:
+            # The body is not read, so the connection cannot be reused.
+            return 413, _error(f"Request body exceeds {self.max_body} bytes."), False
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), self.timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return 408, _error("Request body was not received in time."), False
+
+        if self.pending >= self.max_pending:
+            self.metrics["rejected"] += 1
+            return 503, _error("Validation pool is saturated, retry later."), keep_alive
+        if path == "/validate/presentation":
+            work, limit = validate_presentation_body, self.max_batch
+        else:
+            work, limit = validate_body, self.max_batch if path == "/validate/batch" else None
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            status, payload = await loop.run_in_executor(self.executor, work, body, limit, self.mode, self.ruleset)
+        except Exception as error:
+            self.metrics["errors"] += 1
+            return 500, _error(f"Validation failed: {error!r}"), keep_alive
+        finally:
+            self.pending -= 1
+        if status == 200:
+            self.metrics["validated"] += 1
+        return status, payload, keep_alive
+
+    async def respond(self, writer, status, body, keep_alive):
+        self.responses[status] = self.responses.get(status, 0) + 1
+        payload = body.encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {REASONS[status]}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(payload)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host="127.0.0.1", port=8080, ready=None):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_SIZE)
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.cancel)
+            except (NotImplementedError, RuntimeError):
+                pass
+        if ready is not None:
+            ready(server)
+        async with server:
+            try:
+                await stop
+            except asyncio.CancelledError:
+                pass
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite serve",
+        description="Serve credential validation over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to bind (default: 8080)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes, 0 to validate on a thread in-process (default: CPU count)")
+    parser.add_argument("--max-body", type=int, default=1024 * 1024, help="largest accepted request body in bytes (default: 1 MiB)")
+    parser.add_argument("--max-batch", type=int, default=1000, help="most credentials accepted in one batch request or presentation (default: 1000)")
+    parser.add_argument("--max-pending", type=int, default=None, help="validations queued or running before answering 503 (default: 4 x workers)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for a request (default: 30)")
+    parser.add_argument("--mode", choices=MODES, default="full", help="checks to run: all, only required ones, or up to the first failure (default: full)")
+    parser.add_argument("--ruleset", choices=rulesets.names(), default=None, help="ruleset to check every credential against (default: detected from @context)")
+    parser.add_argument("--allow-context", action="append", default=[], metavar="PREFIX", help="fetch @context URLs starting with PREFIX (repeatable; default: only bundled and cached contexts)")
+    parser.add_argument("--online", action="store_true", help="fetch any @context URL a client sends, which lets clients make the server request arbitrary URLs")
+    args = parser.parse_args(argv)
+
+    configure_contexts(args.online, args.allow_context)
+    if args.workers == 0:
+        workers = 1
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        workers = args.workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=configure_contexts, initargs=(args.online, args.allow_context))
+    max_pending = args.max_pending or 4 * workers
+    server = ValidationServer(
+        executor,
+        max_body=args.max_body,
+        max_batch=args.max_batch,
+        max_pending=max_pending,
+        timeout=args.timeout,
+        mode=args.mode,
+        ruleset=args.ruleset,
+    )
+
+    def ready(listener):
+        for sock in listener.sockets:
+            host, port = sock.getsockname()[:2]
+            print(f"Serving on http://{host}:{port}", flush=True)
+
+    with executor:
+        asyncio.run(server.serve(args.host, args.port, ready))
@@ -0,0 +1,365 @@
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from vc_test_suite import rulesets
+from vc_test_suite.rules import MODES
+from vc_test_suite.corpus import Corpus
+
+# Long corpus runs split into shards of consecutive lines. Every finished
+# shard is a results file renamed into the run directory, so an interrupted
+# run picks up where it stopped, and a shard is claimed with an exclusive
+# lock file before it is worked on, so several processes or machines sharing
+# the directory never run the same shard twice. Once every shard is done
+# their results are merged into one output and a failure report.
+
+MANIFEST = "manifest.json"
+RESULTS = "results.ndjson"
+REPORT = "report.json"
+
+# Shards are claimed for this long without a sign of life before another
+# process may take them over.
+DEFAULT_LEASE = 3600
+
+# A lock file is written right after it is created; one still empty or
+# unreadable after this many seconds was left by a process that died between
+# the two.
+STARTUP_GRACE = 10
+
+
+class RunMismatch(ValueError):
+    """The run directory belongs to a run with another input or settings."""
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, write):
+    """Call ``write(file)`` on a temporary file and rename it to ``path`` once synced."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def plan_shards(line_count, shard_size):
+    """Split lines 1..line_count into [start, stop] ranges of ``shard_size`` lines."""
+    return [[start, min(start + shard_size - 1, line_count)] for start in range(1, line_count + 1, shard_size)]
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _identity(path):
+    """What tells one lock file from another: inode, modification time and contents.
+
+    Inode numbers alone are reused as soon as a file is deleted, and a fresh
+    claim differs from a stale one in its time and its holder.
+    """
+    stat = os.stat(path)
+    with open(path, "rb") as file:
+        return stat.st_ino, stat.st_mtime_ns, file.read()
+
+
+class ShardLock:
+    """An exclusive claim on one shard, held as a lock file in the run directory.
+
+    The file names the host and process holding it. A claim is stale once
+    its file was not touched for ``lease`` seconds, or at once when the
+    process that made it on this host is gone.
+    """
+
+    def __init__(self, path, lease=DEFAULT_LEASE):
+        self.path = path
+        self.lease = lease
+
+    def acquire(self):
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                stale = self._stale()
+                if stale is None:
+                    return False
+                if stale and not self._take_over(stale):
+                    return False
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"host": socket.gethostname(), "pid": os.getpid(), "claimed": time.time()}, file)
+            return True
+        return False
+
+    def _take_over(self, stale):
+        """Move the lock file judged stale out of the way; ``stale`` is what _stale() saw of it."""
+        stale_path = f"{self.path}.stale-{socket.gethostname()}-{os.getpid()}"
+        try:
+            os.rename(self.path, stale_path)
+        except FileNotFoundError:
+            return False
+        if _identity(stale_path) != stale:
+            # Another contender removed the stale lock first and made a fresh
+            # claim, which was moved here instead; give it back. Should a
+            # third claim already have been made, the shard may run twice,
+            # writing the same results.
+            try:
+                os.link(stale_path, self.path)
+            except FileExistsError:
+                pass
+            os.unlink(stale_path)
+            return False
+        os.unlink(stale_path)
+        return True
+
+    def _stale(self):
+        """Return the identity of the lock file when it is stale, () when it is gone, else None."""
+        try:
+            identity = _identity(self.path)
+        except FileNotFoundError:
+            return ()
+        age = time.time() - identity[1] / 1e9
+        if age > self.lease:
+            return identity
+        try:
+            holder = json.loads(identity[2])
+            if not isinstance(holder, dict):
+                raise ValueError("Lock file does not name a holder")
+        except ValueError:
+            # Half written by a process that is starting up, or that died
+            # before it could write.
+            return identity if age > min(STARTUP_GRACE, self.lease) else None
+        if holder.get("host") == socket.gethostname() and not _process_alive(holder.get("pid", 0)):
+            return identity
+        return None
+
+    def refresh(self):
+        os.utime(self.path)
+
+    def release(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def shard_name(number):
+    return f"shard-{number:05d}"
+
+
+def run_shard(run_dir, input_path, number, start, stop, mode="full", ruleset=None, lease=DEFAULT_LEASE):
+    """Validate lines ``start`` to ``stop`` into the shard's results file.
+
+    The caller holds the shard's lock; it is touched as the work goes on.
+    Returns the shard number.
+    """
+    lock = ShardLock(os.path.join(run_dir, shard_name(number) + ".lock"), lease)
+    with Corpus(input_path) as corpus:
+        def write(file):
+            for count, result in enumerate(corpus.validate(range(start, stop + 1), workers=0, mode=mode, ruleset=ruleset), start=1):
+                file.write(result)
+                file.write("\n")
+                if count % 1000 == 0:
+                    lock.refresh()
+
+        atomic_write(os.path.join(run_dir, shard_name(number) + ".ndjson"), write)
+    return number
+
+
+class ShardedRun:
+    """A checkpointed run of ``input_path`` kept in ``run_dir``.
+
+    The first process to start the run writes the manifest: the input's size
+    and modification time, the shards and the settings. Later ones, after a
+    restart or on other machines, must agree with it.
+    """
+
+    def __init__(self, run_dir, input_path, shard_size=10000, mode="full", ruleset=None, lease=DEFAULT_LEASE):
+        self.run_dir = run_dir
+        self.input_path = input_path
+        self.mode = mode
+        self.ruleset = ruleset
+        self.lease = lease
+        os.makedirs(run_dir, exist_ok=True)
+        with Corpus(input_path) as corpus:
+            line_count = len(corpus)
+        stat = os.stat(input_path)
+        manifest = {
+            "input": os.path.abspath(input_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "lines": line_count,
+            "shard_size": shard_size,
+            "mode": mode,
+            "ruleset": ruleset,
+            "shards": plan_shards(line_count, shard_size),
+        }
+        manifest_path = os.path.join(run_dir, MANIFEST)
+        lock = ShardLock(manifest_path + ".lock", lease)
+        # The manifest lock is only held for a moment; after the lease it
+        # is stale whatever its holder did, so waiting longer is pointless.
+        deadline = time.monotonic() + lease + 1
+        while not lock.acquire():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{lock.path} has been held for more than {lease} seconds")
+            time.sleep(0.1)
+        try:
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding="utf-8") as file:
+                    existing = json.load(file)
+                different = [key for key in manifest if key != "input" and existing.get(key) != manifest[key]]
+                if different:
+                    raise RunMismatch(f"{run_dir} holds a run with other {', '.join(different)}")
+            else:
+                atomic_write(manifest_path, lambda file: json.dump(manifest, file, indent=2))
+        finally:
+            lock.release()
+        self.shards = manifest["shards"]
+
+    def _path(self, number, suffix):
+        return os.path.join(self.run_dir, shard_name(number) + suffix)
+
+    def completed(self):
+        return [number for number in range(len(self.shards)) if os.path.exists(self._path(number, ".ndjson"))]
+
+    def pending(self):
+        return [number for number in range(len(self.shards)) if not os.path.exists(self._path(number, ".ndjson"))]
+
+    def _claim(self, number):
+        """Return the lock on shard ``number``, or None when it is done or taken."""
+        lock = ShardLock(self._path(number, ".lock"), self.lease)
+        if os.path.exists(self._path(number, ".ndjson")) or not lock.acquire():
+            return None
+        if os.path.exists(self._path(number, ".ndjson")):
+            # Finished elsewhere between the listing and the claim.
+            lock.release()
+            return None
+        return lock
+
+    def run(self, workers=None, progress=None):
+        """Work through the shards not yet done or claimed; returns how many this call finished.
+
+        Shards are claimed one at a time as workers free up, so processes
+        sharing the directory split the remaining work between them. With
+        ``workers=0`` shards are validated in the calling process.
+        """
+        finished = 0
+        if workers == 0:
+            for number in self.pending():
+                lock = self._claim(number)
+                if lock is None:
+                    continue
+                try:
+                    run_shard(self.run_dir, self.input_path, number, *self.shards[number], self.mode, self.ruleset, self.lease)
+                finally:
+                    lock.release()
+                finished += 1
+                if progress is not None:
+                    progress(number, len(self.completed()), len(self.shards))
+            return finished
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            queue = self.pending()
+            while queue or running:
+                while queue and len(running) < workers:
+                    number = queue.pop(0)
+                    lock = self._claim(number)
+                    if lock is None:
+                        continue
+                    start, stop = self.shards[number]
+                    future = executor.submit(run_shard, self.run_dir, self.input_path, number, start, stop, self.mode, self.ruleset, self.lease)
+                    running[future] = lock
+                if not running:
+                    break
+                future = next(as_completed(running))
+                lock = running.pop(future)
+                try:
+                    number = future.result()
+                finally:
+                    lock.release()
+                finished += 1
+                if progress is not None:
+                    progress(number, len(self.completed()), len(self.shards))
+        return finished
+
+    def merge(self, samples=5, max_issuers=1000):
+        """Join the shard results into RESULTS and write REPORT; False until every shard is done."""
+        if self.pending():
+            return False
+        from vc_test_suite.report import build_report
+
+        def write_results(output):
+            for number in range(len(self.shards)):
+                with open(self._path(number, ".ndjson"), encoding="utf-8") as shard:
+                    shutil.copyfileobj(shard, output)
+
+        results_path = os.path.join(self.run_dir, RESULTS)
+        atomic_write(results_path, write_results)
+        with open(results_path, encoding="utf-8") as results, open(self.input_path, encoding="utf-8") as credentials:
+            report = build_report(results, credentials, samples=samples, max_issuers=max_issuers)
+        atomic_write(os.path.join(self.run_dir, REPORT), lambda file: json.dump(report.to_dict(), file, indent=2))
+        return True
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite run",
+        description="Validate an NDJSON corpus in checkpointed shards; rerun the same command to resume, or on other machines sharing the run directory to help.",
+    )
+    parser.add_argument("input", help="NDJSON file to validate")
+    parser.add_argument("run_dir", help="directory for the manifest, shard results and the merged output")
+    parser.add_argument("--shard-size", type=int, default=10000, help="lines per shard (default: 10000)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="shards validated at once, 0 to validate in-process (default: CPU count)")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE, help=f"seconds without progress before a shard claimed elsewhere is taken over (default: {DEFAULT_LEASE})")
+    parser.add_argument("--mode", choices=MODES, default="full", help="checks to run: all, only required ones, or up to the first failure (default: full)")
+    parser.add_argument("--ruleset", choices=rulesets.names(), default=None, help="ruleset to check every credential against (default: detected from @context)")
+    args = parser.parse_args(argv)
+
+    try:
+        run = ShardedRun(args.run_dir, args.input, args.shard_size, args.mode, args.ruleset, args.lease)
+    except (RunMismatch, TimeoutError) as error:
+        print(f"vc_test_suite run: {error}", file=sys.stderr)
+        return 2
+
+    def progress(number, done, total):
+        print(f"{shard_name(number)} done, {done}/{total} shards complete", file=sys.stderr)
+
+    skipped = len(run.completed())
+    if skipped:
+        print(f"Resuming: {skipped}/{len(run.shards)} shards already complete", file=sys.stderr)
+    run.run(args.workers, progress)
+    if run.merge():
+        print(f"All {len(run.shards)} shards complete: {os.path.join(args.run_dir, RESULTS)}, {os.path.join(args.run_dir, REPORT)}", file=sys.stderr)
+        return 0
+    print(f"{len(run.pending())} shards are still being validated elsewhere; rerun to merge once they finish", file=sys.stderr)
+    return 0
@@ -0,0 +1,45 @@
+import sys
+import subprocess
+
+
+def parse_importtime(lines):
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth)."""
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        imports.append((module, int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def profile_imports(args, limit=25, stream=sys.stderr):
+    """Run the command line ``args`` under ``-X importtime`` and report imports.
+
+    The command's output is passed through untouched; the report, the slowest
+    top-level imports by cumulative time and the total import time, goes to
+    ``stream``.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "vc_test_suite", *args],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    lines = completed.stderr.splitlines()
+    for line in lines:
+        if not line.startswith("import time:"):
+            print(line, file=stream)
+
+    imports = parse_importtime(lines)
+    total = sum(self_us for _, self_us, _, _ in imports)
+    print(f"\nStartup imports: {len(imports)} modules, {total / 1000:.1f} ms", file=stream)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module", file=stream)
+    slowest = sorted(imports, key=lambda item: item[2], reverse=True)[:limit]
+    for module, self_us, cumulative_us, depth in slowest:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{module}", file=stream)
+    return completed.returncode
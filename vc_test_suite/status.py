@@ -0,0 +1,207 @@
+import sys
+import gzip
+import json
+import base64
+import binascii
+import argparse
+import threading
+from cachetools import TTLCache
+from vc_test_suite import w3c
+
+# Revocation and suspension checks for StatusList2021Entry (and the
+# BitstringStatusListEntry of VCDM 2.0, which works the same way). Status list
+# credentials come from a resolver, by default local fixtures, and their
+# bitstrings are decompressed once and kept, so every lookup is a bit test.
+
+ENTRY_TYPES = ("StatusList2021Entry", "BitstringStatusListEntry")
+LIST_TYPES = ("StatusList2021", "BitstringStatusList")
+
+
+class StatusError(ValueError):
+    """A status entry, or the status list it points to, cannot be used."""
+
+
+class StatusList:
+    """The decoded bitstring of one status list credential."""
+
+    __slots__ = ("purpose", "bits")
+
+    def __init__(self, purpose, bits):
+        self.purpose = purpose
+        self.bits = bits
+
+    def __len__(self):
+        return len(self.bits) * 8
+
+    def __getitem__(self, index):
+        # Index 0 is the most significant bit of the first byte.
+        return bool(self.bits[index >> 3] & (0x80 >> (index & 7)))
+
+
+def decode_list(encoded):
+    """Decompress an encodedList: GZIP, base64 or base64url, with an optional "u" multibase prefix."""
+    if not isinstance(encoded, str):
+        raise StatusError("encodedList MUST be a string")
+    if encoded.startswith("u"):
+        encoded = encoded[1:]
+    try:
+        compressed = base64.b64decode(encoded + "=" * (-len(encoded) % 4), altchars=b"-_")
+        return gzip.decompress(compressed)
+    except (binascii.Error, OSError, EOFError, ValueError):
+        raise StatusError("encodedList is not a base64 encoded GZIP bitstring") from None
+
+
+def status_list_from_credential(credential):
+    """Read the purpose and bitstring of a status list credential."""
+    subject = credential.get("credentialSubject") if w3c.is_object(credential) else None
+    if not w3c.is_object(subject) or subject.get("type") not in LIST_TYPES:
+        raise StatusError("Status list credential has no StatusList2021 subject")
+    return StatusList(subject.get("statusPurpose"), decode_list(subject.get("encodedList")))
+
+
+class StatusListStore:
+    """Status list credentials from local fixtures, looked up by URL.
+
+    ``source`` is a mapping, or a path to a JSON file holding one, from
+    statusListCredential URLs to status list credentials.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            with open(source, encoding="utf-8") as file:
+                source = json.load(file)
+        self.credentials = dict(source)
+
+    def __call__(self, url):
+        return self.credentials.get(url)
+
+
+class StatusChecker:
+    """Check credentialStatus entries against their status lists.
+
+    ``resolver`` maps a statusListCredential URL to the status list
+    credential, or None. Decoded lists are cached for ``ttl`` seconds, so
+    updated lists are picked up, in at most ``max_bytes`` of bitstrings.
+    """
+
+    def __init__(self, resolver, ttl=300, max_bytes=64 << 20):
+        self.resolver = resolver
+        self._lists = TTLCache(max_bytes, ttl, getsizeof=lambda status_list: len(status_list.bits))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def status_list(self, url):
+        with self._lock:
+            status_list = self._lists.get(url)
+            if status_list is not None:
+                self.hits += 1
+                return status_list
+            self.misses += 1
+        credential = self.resolver(url)
+        if credential is None:
+            raise StatusError(f"Status list {url} could not be resolved")
+        status_list = status_list_from_credential(credential)
+        with self._lock:
+            try:
+                self._lists[url] = status_list
+            except ValueError:
+                # Larger than the whole cache; used once and dropped.
+                pass
+        return status_list
+
+    def check_entry(self, entry, lookup=None):
+        """Return {"type", "statusPurpose", "statusListCredential", "statusListIndex", "set", "error"}.
+
+        ``lookup`` replaces status_list() to find the list.
+        """
+        report = {key: entry.get(key) if w3c.is_object(entry) else None for key in ("type", "statusPurpose", "statusListCredential", "statusListIndex")}
+        report["set"] = None
+        report["error"] = None
+        try:
+            if not w3c.is_object(entry):
+                raise StatusError("Status entry is not an object")
+            if report["type"] not in ENTRY_TYPES:
+                raise StatusError(f"Unsupported status type {report['type']!r}")
+            url = report["statusListCredential"]
+            if not isinstance(url, str):
+                raise StatusError("statusListCredential MUST be a URL")
+            index = report["statusListIndex"]
+            # str.isdigit also accepts digits such as "²" that int() rejects.
+            if not isinstance(index, str) or not (index.isascii() and index.isdigit()):
+                raise StatusError("statusListIndex MUST be a string holding a non-negative integer")
+            index = int(index)
+            status_list = (lookup or self.status_list)(url)
+            if status_list.purpose != report["statusPurpose"]:
+                raise StatusError(f"Status list purpose {status_list.purpose!r} does not match {report['statusPurpose']!r}")
+            if index >= len(status_list):
+                raise StatusError(f"statusListIndex {index} is outside the list of {len(status_list)} entries")
+            report["set"] = status_list[index]
+        except StatusError as error:
+            report["error"] = str(error)
+        return report
+
+    def check(self, vc, lookup=None):
+        """Check every status entry of ``vc``; returns {"revoked", "suspended", "entries", "error"}.
+
+        ``revoked`` and ``suspended`` are True when a list of that purpose has
+        the credential's bit set; an entry that cannot be checked is listed
+        with its ``error`` and leaves them unchanged. ``error`` says why no
+        entry could be looked at.
+        """
+        status = vc.get("credentialStatus", ())
+        if not w3c.is_one_or_more_objects(status):
+            return {"revoked": False, "suspended": False, "entries": [], "error": "credentialStatus MUST be one or more objects"}
+        entries = [self.check_entry(entry, lookup) for entry in w3c.entries(status)]
+        return {
+            "revoked": any(entry["set"] and entry["statusPurpose"] == "revocation" for entry in entries),
+            "suspended": any(entry["set"] and entry["statusPurpose"] == "suspension" for entry in entries),
+            "entries": entries,
+            "error": None,
+        }
+
+    def check_many(self, credentials):
+        """Check many credentials and return results in order.
+
+        Each status list is looked up once for the whole batch, failures
+        included, and every entry pointing into it is then a bit test.
+        """
+        lists = {}
+
+        def lookup(url):
+            if url not in lists:
+                try:
+                    lists[url] = self.status_list(url)
+                except StatusError as error:
+                    lists[url] = error
+            status_list = lists[url]
+            if isinstance(status_list, StatusError):
+                raise status_list
+            return status_list
+
+        return [self.check(vc, lookup) for vc in credentials]
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "lists": len(self._lists), "bytes": self._lists.currsize}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="vc_test_suite status",
+        description="Check the revocation and suspension status of newline-delimited JSON credentials, one result line per credential.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="file to read, '-' for stdin (default)")
+    parser.add_argument("--lists", required=True, help="JSON file mapping statusListCredential URLs to status list credentials")
+    parser.add_argument("--batch-size", type=int, default=1000, help="credentials looked up together (default: 1000)")
+    args = parser.parse_args(argv)
+
+    checker = StatusChecker(StatusListStore(args.lists))
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        from vc_test_suite.batch import check_ndjson
+
+        check_ndjson(source, checker.check_many, args.batch_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
@@ -0,0 +1,105 @@
+import re
+from datetime import date, timezone
+
+# XMLSCHEMA11-2 dateTime lexical space (3.3.7). Day-of-month, 24:00:00 and
+# the +/-14:00 timezone bound are checked after matching.
+DATETIME_PATTERN = re.compile(
+    r"(-?(?:[1-9][0-9]{3,}|0[0-9]{3}))-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])"
+    r"T([01][0-9]|2[0-4]):([0-5][0-9]):([0-5][0-9])(?:\.([0-9]+))?"
+    r"(Z|[+-](?:0[0-9]|1[0-4]):[0-5][0-9])?"
+)
+
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Parsed dateTimes are instants on the UTC time line, plain (seconds, fraction)
+# tuples: whole seconds since 1970-01-01T00:00:00Z and the fractional digits
+# without trailing zeros. They order correctly with tuple comparison, as
+# fractions of different lengths still compare right as strings.
+
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    if month == 2 and is_leap_year(year):
+        return 29
+    return DAYS_IN_MONTH[month - 1]
+
+
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 in the proleptic Gregorian calendar, any year."""
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _valid_groups(text):
+    match = DATETIME_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    groups = match.groups()
+    year, month, day, hour, minute, second, fraction, zone = groups
+    if day > "28" and int(day) > days_in_month(int(year), int(month)):
+        return None
+    if hour == "24" and (minute != "00" or second != "00" or (fraction and fraction.strip("0"))):
+        return None
+    if zone and zone[1:3] == "14" and zone[4:6] != "00":
+        return None
+    return groups
+
+
+def is_xml_datetime(text):
+    """Whether ``text`` is an XMLSCHEMA11-2 dateTime.
+
+    Dates must exist in the calendar (leap years included), 24:00:00 is only
+    allowed with zero minutes, seconds and fraction, and timezone offsets are
+    limited to +/-14:00.
+    """
+    return _valid_groups(text) is not None
+
+
+def is_xml_datetime_stamp(text):
+    """Whether ``text`` is an XMLSCHEMA11-2 dateTimeStamp: a dateTime with a timezone."""
+    groups = _valid_groups(text)
+    return groups is not None and groups[7] is not None
+
+
+def parse_xml_datetime(text):
+    """Parse an XMLSCHEMA11-2 dateTime into a (seconds, fraction) instant.
+
+    Returns None when ``text`` is not a valid dateTime, see is_xml_datetime.
+    A dateTime without a timezone is taken as UTC.
+    """
+    groups = _valid_groups(text)
+    if groups is None:
+        return None
+    year, month, day, hour, minute, second, fraction, zone = groups
+    year = int(year)
+    if 0 < year < 10000:
+        days = date(year, int(month), int(day)).toordinal() - UNIX_EPOCH_ORDINAL
+    else:
+        days = days_from_civil(year, int(month), int(day))
+    seconds = days * 86400 + int(hour) * 3600 + int(minute) * 60 + int(second)
+    if zone and zone != "Z":
+        offset = int(zone[1:3]) * 3600 + int(zone[4:6]) * 60
+        seconds += -offset if zone[0] == "+" else offset
+    return seconds, fraction.rstrip("0") if fraction else ""
+
+
+def instant_from_datetime(moment):
+    """Convert a datetime to an instant; naive datetimes are taken as UTC."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    seconds = (
+        (moment.toordinal() - UNIX_EPOCH_ORDINAL) * 86400
+        + moment.hour * 3600
+        + moment.minute * 60
+        + moment.second
+    )
+    return seconds, f"{moment.microsecond:06d}".rstrip("0")
@@ -0,0 +1,138 @@
+from vc_test_suite import messaging
+from vc_test_suite.rules import ActivePlan, Rule, Section, compile_rules, evaluate_mode
+from vc_test_suite.timestamps import is_xml_datetime_stamp, instant_from_datetime
+from vc_test_suite.predicates import (
+    contexts_processable, each_has_type, entries, instant, is_array, is_issuer, is_object,
+    is_one_or_more_objects, is_ordered_set, is_uri, issued_by_now, not_expired_by_now,
+)
+
+# VCDM 2.0 checks. Loaded through rulesets, so nothing here is compiled until a
+# 2.0 credential is validated, and the VCDM 1.1 rules in w3c are never loaded
+# for 2.0 credentials.
+
+BASE_CONTEXT_V2 = "https://www.w3.org/ns/credentials/v2"
+
+def is_timestamp(value):
+    return isinstance(value, str) and is_xml_datetime_stamp(value)
+
+def has_base_context(value):
+    return is_ordered_set(value) and value[0] == BASE_CONTEXT_V2
+
+def later_contexts_processable(value):
+    # The first item is checked by value above; the base context itself is
+    # never fetched.
+    return is_ordered_set(value) and contexts_processable(value[1:])
+
+def is_one_or_more_strings(value):
+    items = (value,) if isinstance(value, str) else value
+    return is_ordered_set(items) and all(isinstance(item, str) for item in items)
+
+def has_verifiable_credential_type(value):
+    items = (value,) if isinstance(value, str) else value
+    return is_array(items) and "VerifiableCredential" in items
+
+def each_id_is_uri(value):
+    return all(not is_object(entry) or "id" not in entry or is_uri(entry["id"]) for entry in entries(value))
+
+def each_has_uri_id(value):
+    return all(is_object(entry) and "id" in entry and is_uri(entry["id"]) for entry in entries(value))
+
+def clock_and_timestamp(value, vc, options):
+    return options is not None and options.get("now") is not None and is_timestamp(value)
+
+def both_timestamps(value, vc, options):
+    return is_timestamp(value) and is_timestamp(vc.get("validFrom"))
+
+def valid_from_not_after_valid_until(value, vc, options):
+    return instant(vc["validFrom"]) <= instant(value)
+
+def _typed_entries(index=1):
+    return [
+        Rule(index, True, is_one_or_more_objects),
+        Rule(index + 1, True, each_has_type, when=is_one_or_more_objects),
+    ]
+
+# Checks run for each property, keyed like messaging.VCDM_V2_STATEMENTS and
+# reported in this order. Rule indexes point into the statement list.
+VCDM_V2_RULES = {
+    "@context": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(1, True, is_ordered_set),
+            Rule(2, True, has_base_context),
+            Rule(3, True, later_contexts_processable),
+        ],
+    ),
+    "id": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, True, is_uri)],
+        optional=True,
+    ),
+    "type": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(1, True, is_one_or_more_strings),
+            Rule(2, True, has_verifiable_credential_type),
+        ],
+    ),
+    "issuer": Section(
+        presence=Rule(0, True),
+        rules=[Rule(1, True, is_issuer)],
+    ),
+    "credentialSubject": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(1, True, is_one_or_more_objects),
+            Rule(2, False, each_has_uri_id, when=is_one_or_more_objects),
+        ],
+    ),
+    "validFrom": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_timestamp),
+            Rule(2, True, issued_by_now, when=clock_and_timestamp, contextual=True),
+        ],
+        optional=True,
+    ),
+    "validUntil": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_timestamp),
+            Rule(2, True, valid_from_not_after_valid_until, when=both_timestamps, contextual=True, reads=("validFrom",)),
+            Rule(3, True, not_expired_by_now, when=clock_and_timestamp, contextual=True),
+        ],
+        optional=True,
+    ),
+    "credentialStatus": Section(
+        presence=Rule(0, False),
+        rules=_typed_entries() + [Rule(3, True, each_id_is_uri, when=is_one_or_more_objects)],
+        optional=True,
+    ),
+    "credentialSchema": Section(
+        presence=Rule(0, False),
+        rules=_typed_entries() + [Rule(3, True, each_has_uri_id, when=is_one_or_more_objects)],
+        optional=True,
+    ),
+    "refreshService": Section(presence=Rule(0, False), rules=_typed_entries(), optional=True),
+    "termsOfUse": Section(presence=Rule(0, False), rules=_typed_entries(), optional=True),
+    "evidence": Section(presence=Rule(0, False), rules=_typed_entries(), optional=True),
+    "proof": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, True, each_has_type, when=is_one_or_more_objects)],
+        optional=True,
+    ),
+}
+
+VCDM_V2_PLAN = compile_rules(VCDM_V2_RULES, messaging.VCDM_V2_STATEMENTS)
+# The plan test_data_model_v2 runs, timed while instrumentation is enabled.
+VCDM_V2_ACTIVE = ActivePlan(VCDM_V2_PLAN)
+
+def test_data_model_v2(vc, now=None, mode="full"):
+    """Check a credential against the VCDM 2.0 statements.
+
+    Takes and returns the same as w3c.test_data_model_v1; ``now`` checks the
+    validFrom and validUntil against that clock.
+    """
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    active = VCDM_V2_ACTIVE
+    return evaluate_mode(active.plan, active.required, vc, options, mode)
@@ -0,0 +1,118 @@
+import json
+import binascii
+from base64 import b64decode
+from datetime import datetime, timezone
+from functools import lru_cache
+from vc_test_suite.predicates import is_object
+
+# Credentials secured as compact JWS (VC-JWT). The token is decoded, the
+# registered claims are mapped back onto the data model as VCDM 1.1 section
+# 6.3.1 describes, and the result is checked like any other credential. The
+# signature is not verified.
+
+
+class JwtError(ValueError):
+    """The token is not a compact JWS carrying a credential."""
+
+
+def looks_like_jwt(text):
+    """Cheap screen: a JOSE header always starts with '{"', base64url "eyJ"."""
+    return text.startswith("eyJ")
+
+
+def _decode_segment(segment, name):
+    # b64decode accepts the urlsafe alphabet through altchars and takes str
+    # directly; only the missing padding is added.
+    try:
+        return b64decode(segment + "=" * (-len(segment) % 4), altchars=b"-_", validate=True)
+    except (binascii.Error, ValueError):
+        raise JwtError(f"JWT {name} is not base64url") from None
+
+
+def _parse_json_segment(segment, name):
+    data = _decode_segment(segment, name)
+    try:
+        value = json.loads(data)
+    except ValueError:
+        raise JwtError(f"JWT {name} is not JSON") from None
+    if not isinstance(value, dict):
+        raise JwtError(f"JWT {name} MUST be a JSON object")
+    return value
+
+
+# Tokens signed with the same key share the header segment byte for byte, so
+# it is parsed once per kid. Callers must not modify the returned dict.
+@lru_cache(maxsize=1024)
+def parse_header(segment):
+    return _parse_json_segment(segment, "header")
+
+
+def split(token):
+    """Return the (header, payload, signature) segments of a compact JWS."""
+    header, dot, rest = token.strip().partition(".")
+    payload, dot2, signature = rest.partition(".")
+    if not dot or not dot2 or "." in signature:
+        raise JwtError("A compact JWS has exactly three dot-separated segments")
+    return header, payload, signature
+
+
+def numeric_date(value, claim):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise JwtError(f"{claim} MUST be a NumericDate")
+    try:
+        moment = datetime.fromtimestamp(value, timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        raise JwtError(f"{claim} is out of range") from None
+    if moment.microsecond:
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def credential_from_claims(claims):
+    """Map JWT claims back onto a credential.
+
+    The ``vc`` claim is the credential; ``iss``, ``nbf``, ``exp``, ``jti`` and
+    ``sub`` become its issuer (id), issuanceDate, expirationDate, id and
+    credentialSubject id. Without a ``vc`` claim the payload is taken to be
+    the credential itself, as in JOSE-secured VCDM 2.0.
+    """
+    if "vc" not in claims:
+        if "@context" not in claims:
+            raise JwtError("JWT payload has neither a vc claim nor a credential")
+        return claims
+    vc = claims["vc"]
+    if not is_object(vc):
+        raise JwtError("The vc claim MUST be a JSON object")
+    vc = dict(vc)
+    if "iss" in claims:
+        issuer = vc.get("issuer")
+        vc["issuer"] = dict(issuer, id=claims["iss"]) if is_object(issuer) else claims["iss"]
+    if "nbf" in claims:
+        vc["issuanceDate"] = numeric_date(claims["nbf"], "nbf")
+    if "exp" in claims:
+        vc["expirationDate"] = numeric_date(claims["exp"], "exp")
+    if "jti" in claims:
+        vc["id"] = claims["jti"]
+    if "sub" in claims:
+        subject = vc.get("credentialSubject")
+        if is_object(subject):
+            vc["credentialSubject"] = dict(subject, id=claims["sub"])
+        elif subject is None:
+            vc["credentialSubject"] = {"id": claims["sub"]}
+    return vc
+
+
+def decode(token):
+    """Return (header, credential) for a VC-JWT; raises JwtError."""
+    if not isinstance(token, str):
+        raise JwtError("A VC-JWT MUST be a string")
+    header_segment, payload_segment, _ = split(token)
+    header = parse_header(header_segment)
+    return header, credential_from_claims(_parse_json_segment(payload_segment, "payload"))
+
+
+def test_vc_jwt(token, now=None, mode="full", ruleset=None):
+    """Decode a VC-JWT and check its credential, see rulesets.test_data_model."""
+    from vc_test_suite.rulesets import test_data_model
+
+    return test_data_model(decode(token)[1], now, mode, ruleset)
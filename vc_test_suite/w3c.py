@@ -1,572 +1,211 @@
-from pyld import jsonld
-import re
-import json
-import validators
-import uritools
 from vc_test_suite import messaging
-from rfc3986 import is_valid_uri
+# The shared checks are re-exported, so w3c.is_object and friends keep working.
+from vc_test_suite.predicates import (
+    ARRAY_TYPES, COMMON_URI_PREFIXES, UriCheck, contexts_processable, each_has, each_has_id, each_has_type,
+    entries, instant, is_array, is_issuer, is_object, is_one_or_more_objects, is_ordered_set, is_uri,
+    issued_by_now, not_expired_by_now, uri_check,
+)
+from vc_test_suite.rules import (
+    ActivePlan, Rule, Section, CompactResult, check_table, compile_rules, evaluate_compact, evaluate_mode,
+)
+from vc_test_suite.timestamps import is_xml_datetime, instant_from_datetime
 
 def valid_xml_timestamp(timestamp):
-    iso8601_regex = r"^(-?(?:[1-9][0-9]*)?[0-9]{4})-(1[0-2]|0[1-9])-(3[01]|0[1-9]|[12][0-9])T(2[0-3]|[01][0-9]):([0-5][0-9]):([0-5][0-9])(\.[0-9]+)?(Z|[+-](?:2[0-3]|[01][0-9]):[0-5][0-9])?$"
-    match_iso8601 = re.compile(iso8601_regex).match
-    return False if match_iso8601(timestamp) is None else True
-
-def test_data_model_v1(vc):
-    verifications = {}
-    required_test_count = 0
-    optional_test_count = 0
-
-
-    ### CONTEXT ###
-    verifications["@context"] = []
-    verifications["@context"].append(
-        {
-            "statement": messaging.VCDM_V1_STATEMENTS["@context"][0],
-            "required": True,
-            "pass": True if "@context" in vc else False,
-        }
-    )
-    required_test_count += 1
-    if '@context' in vc:
-        verifications["@context"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["@context"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if (isinstance(vc["@context"], list) and len(vc["@context"]) > 0)
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        verifications["@context"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["@context"][2],
-                "required": True,
-                "pass": (
-                    True
-                    if (
-                        isinstance(vc["@context"], list)
-                        and len(vc["@context"]) > 0
-                        and vc["@context"][0] == "https://www.w3.org/2018/credentials/v1"
-                    )
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        verifications["@context"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["@context"][3],
-                "required": True,
-                "pass": (
-                    True
-                    if all(isinstance(item, (dict, str)) for item in vc["@context"])
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        
-    ### ID ###
-    if 'id' in vc:
-        verifications["id"] = []
-        verifications["id"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["id"][0],
-                "required": False,
-                "pass": True if "id" in vc else False,
-            }
-        )
-        optional_test_count += 1
-        verifications["id"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["id"][1],
-                "required": False,
-                "pass": uritools.isuri(vc['id']),
-            }
-        )
-        optional_test_count += 1
-
-        
-    ### TYPE ###
-    verifications["type"] = []
-    verifications["type"].append(
-        {
-            "statement": messaging.VCDM_V1_STATEMENTS["type"][0],
-            "required": True,
-            "pass": True if "type" in vc else False,
-        }
-    )
-    required_test_count += 1
-    if 'type' in vc:
-        verifications["type"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["type"][2],
-                "required": True,
-                "pass": (
-                    True
-                    if (
-                        isinstance(vc["type"], list)
-                        and len(vc["type"]) > 0
-                        and "VerifiableCredential" in vc["type"]
-                    )
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        verifications["type"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["type"][3],
-                "required": False,
-                "pass": (
-                    True
-                    if (isinstance(vc["type"], list) and len(vc["type"]) > 1)
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-
-        
-    ### ISSUER ###
-
-    verifications["issuer"] = []
-    verifications["issuer"].append(
-        {
-            "statement": messaging.VCDM_V1_STATEMENTS["issuer"][0],
-            "required": True,
-            "pass": True if "issuer" in vc else False,
-        }
-    )
-    required_test_count += 1
-    if 'issuer' in vc:
-        verifications["issuer"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["issuer"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if (isinstance(vc["issuer"], str) and uritools.isuri(vc["issuer"]))
-                    or (
-                        isinstance(vc["issuer"], dict)
-                        and "id" in vc["issuer"]
-                        and uritools.isuri(vc["issuer"]["id"])
-                    )
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-
-
-
-
-        
-    ### ISSUANCE DATE ###
-
-    verifications["issuanceDate"] = []
-    verifications["issuanceDate"].append(
-        {
-            "statement": messaging.VCDM_V1_STATEMENTS["issuanceDate"][0],
-            "required": True,
-            "pass": True if "issuanceDate" in vc else False,
-        }
-    )
-    required_test_count += 1
-    if 'issuanceDate' in vc:
-        verifications["issuanceDate"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["issuanceDate"][1],
-                "required": True,
-                "pass": valid_xml_timestamp(vc["issuanceDate"]),
-            }
-        )
-        required_test_count += 1
-
-
-        
-    ### EXPIRATION DATE ###
-    if 'expirationDate' in vc:
-        verifications["expirationDate"] = []
-        verifications["expirationDate"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["expirationDate"][0],
-                "required": False,
-                "pass": (
-                    True if "expirationDate" in vc else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["expirationDate"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["expirationDate"][1],
-                "required": True,
-                "pass": valid_xml_timestamp(vc["expirationDate"]),
-            }
-        )
-        required_test_count += 1
-
-
-        
-    ### CREDENTIAL SUBJECT ###
-
-    verifications["credentialSubject"] = []
-    verifications["credentialSubject"].append(
-        {
-            "statement": messaging.VCDM_V1_STATEMENTS["credentialSubject"][0],
-            "required": True,
-            "pass": True if "credentialSubject" in vc else False,
-        }
-    )
-    required_test_count += 1
-    if 'credentialSubject' in vc:
-        verifications["credentialSubject"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialSubject"][1],
-                "required": False,
-                "pass": (
-                    True
-                    if isinstance(vc["credentialSubject"], dict)
-                    and "id" in vc["credentialSubject"]
-                    and uritools.isuri(vc["credentialSubject"]['id'])
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-
-    required_test_pass = 0
-    optional_test_pass = 0
-
-        
-    ### CREDENTIAL STATUS ###
-    if "credentialStatus" in vc:
-        verifications["credentialStatus"] = []
-        verifications["credentialStatus"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialStatus"][0],
-                "required": False,
-                "pass": (
-                    True
-                    if "credentialStatus" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["credentialStatus"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialStatus"][1],
-                "required": False,
-                "pass": (
-                    True
-                    if isinstance(vc["credentialStatus"], (list, dict))
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        vc["credentialStatus"] = [vc["credentialStatus"]] if isinstance(vc["credentialStatus"], dict) else vc["credentialStatus"]
-        verifications["credentialStatus"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialStatus"][1],
-                "required": False,
-                "pass": (
-                    True
-                    if ("id" in evidence for evidence in vc["credentialStatus"])
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["credentialStatus"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialStatus"][2],
-                "required": False,
-                "pass": (
-                    True
-                    if ("type" in evidence for evidence in vc["credentialStatus"])
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-
-    # Schema
-    if "credentialSchema" in vc:
-        verifications["credentialSchema"] = []
-        verifications["credentialSchema"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialSchema"][0],
-                "required": False,
-                "pass": (
-                    True
-                    if "credentialSchema" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["credentialSchema"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["credentialSchema"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if isinstance(vc["credentialSchema"], (dict, list))
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        if isinstance(vc["credentialSchema"], (dict, list)):
-            vc["credentialSchema"] = [vc["credentialSchema"]] if isinstance(vc["credentialSchema"], dict) else vc["credentialSchema"]
-
-            verifications["credentialSchema"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["credentialSchema"][2],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("id" in evidence for evidence in vc["credentialSchema"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-            verifications["credentialSchema"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["credentialSchema"][3],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("type" in evidence for evidence in vc["credentialSchema"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-
-   
-
-    # REFRESH
-    if "refreshService" in vc:
-        verifications["refreshService"] = []
-        verifications["refreshService"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["refreshService"][0],
-                "required": False,
-                "pass": (
-                    True
-                    if "refreshService" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["refreshService"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["refreshService"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if isinstance(vc["refreshService"], (dict, list))
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        if isinstance(vc["refreshService"], (dict, list)):
-            vc["refreshService"] = [vc["refreshService"]] if isinstance(vc["refreshService"], dict) else vc["refreshService"]
-
-            verifications["refreshService"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["refreshService"][2],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("id" in evidence for evidence in vc["refreshService"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-            verifications["refreshService"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["refreshService"][3],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("type" in evidence for evidence in vc["refreshService"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-
-   
-
-    # TERMS OF USE
-    if "termsOfUse" in vc:
-        verifications["termsOfUse"] = []
-        verifications["termsOfUse"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["termsOfUse"][0],
-                "required": False,
-                "pass": (
-                    True
-                    if "termsOfUse" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["termsOfUse"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["termsOfUse"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if isinstance(vc["termsOfUse"], (dict, list))
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        if isinstance(vc["termsOfUse"], (dict, list)):
-            vc["termsOfUse"] = [vc["termsOfUse"]] if isinstance(vc["termsOfUse"], dict) else vc["termsOfUse"]
-
-            verifications["termsOfUse"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["termsOfUse"][2],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("id" in evidence for evidence in vc["termsOfUse"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-            verifications["termsOfUse"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["termsOfUse"][3],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("type" in evidence for evidence in vc["termsOfUse"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-
-  
-
-    # EVIDENCE
-    if "evidence" in vc:
-        verifications["evidence"] = []
-        verifications["evidence"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["evidence"][0],
-                "required": False,
-                "pass": (
-                    True
-                    if "evidence" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        verifications["evidence"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["evidence"][1],
-                "required": True,
-                "pass": (
-                    True
-                    if isinstance(vc["evidence"], (dict, list))
-                    else False
-                ),
-            }
-        )
-        required_test_count += 1
-        if isinstance(vc["evidence"], (dict, list)):
-            vc["evidence"] = [vc["evidence"]] if isinstance(vc["evidence"], dict) else vc["evidence"]
-
-            verifications["evidence"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["evidence"][2],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("id" in evidence for evidence in vc["evidence"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-            verifications["evidence"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["evidence"][3],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("type" in evidence for evidence in vc["evidence"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-            
-
-
-    # PROOF
-    if 'proof' in vc:
-        verifications["proof"] = []
-        verifications["proof"].append(
-            {
-                "statement": messaging.VCDM_V1_STATEMENTS["proof"][2],
-                "required": False,
-                "pass": (
-                    True
-                    if "proof" in vc
-                    else False
-                ),
-            }
-        )
-        optional_test_count += 1
-        if isinstance(vc["proof"], (dict, list)):
-            vc["proof"] = [vc["proof"]] if isinstance(vc["proof"], dict) else vc["proof"]
-            verifications["proof"].append(
-                {
-                    "statement": messaging.VCDM_V1_STATEMENTS["proof"][3],
-                    "required": True,
-                    "pass": (
-                        True
-                        if ("type" in proof for proof in vc["proof"])
-                        else False
-                    ),
-                }
-            )
-            required_test_count += 1
-
-    required_test_pass = 0
-    optional_test_pass = 0
-    for section in verifications:
-        for test in verifications[section]:
-            if test["required"]:
-                required_test_pass += 1 if test["pass"] else 0
-            elif not test["required"]:
-                optional_test_pass += 1 if test["pass"] else 0
-    results = {
-        "conformant": True if required_test_pass == required_test_count else False,
-        "required_score": f"{required_test_pass}/{required_test_count}",
-        "optional_score": f"{optional_test_pass}/{optional_test_count}",
-        "verifications": verifications,
-    }
-
-    return results
\ No newline at end of file
+    return is_xml_datetime(timestamp)
+
+BASE_CONTEXT_V1 = "https://www.w3.org/2018/credentials/v1"
+
+def is_timestamp(value):
+    return isinstance(value, str) and is_xml_datetime(value)
+
+def clock_and_timestamp(value, vc, options):
+    return options is not None and options.get("now") is not None and is_timestamp(value)
+
+def both_timestamps(value, vc, options):
+    return is_timestamp(value) and is_timestamp(vc.get("issuanceDate"))
+
+def expires_after_issuance(value, vc, options):
+    return instant(value) > instant(vc["issuanceDate"])
+
+def has_base_context(value):
+    return is_ordered_set(value) and value[0] == BASE_CONTEXT_V1
+
+def has_verifiable_credential_type(value):
+    return is_ordered_set(value) and "VerifiableCredential" in value
+
+def has_specific_type(value):
+    return is_array(value) and len(value) > 1
+
+def subject_has_uri_id(value):
+    return is_object(value) and "id" in value and is_uri(value["id"])
+
+def is_one_or_more_credentials(value):
+    # A single embedded credential may also be a VC-JWT, see vcjwt.looks_like_jwt.
+    return is_one_or_more_objects(value) or (isinstance(value, str) and value.startswith("eyJ"))
+
+# Checks run for each property, keyed like messaging.VCDM_V1_STATEMENTS and
+# reported in this order. Rule indexes point into the statement list.
+VCDM_V1_RULES = {
+    "@context": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(1, True, is_ordered_set),
+            Rule(2, True, has_base_context),
+            Rule(3, True, contexts_processable),
+        ],
+    ),
+    "id": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, False, is_uri)],
+        optional=True,
+    ),
+    "type": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(2, True, has_verifiable_credential_type),
+            Rule(3, False, has_specific_type),
+        ],
+    ),
+    "issuer": Section(
+        presence=Rule(0, True),
+        rules=[Rule(1, True, is_issuer)],
+    ),
+    "issuanceDate": Section(
+        presence=Rule(0, True),
+        rules=[
+            Rule(1, True, is_timestamp),
+            Rule(2, True, issued_by_now, when=clock_and_timestamp, contextual=True),
+        ],
+    ),
+    "expirationDate": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_timestamp),
+            Rule(2, False, expires_after_issuance, when=both_timestamps, contextual=True, reads=("issuanceDate",)),
+            Rule(3, True, not_expired_by_now, when=clock_and_timestamp, contextual=True),
+        ],
+        optional=True,
+    ),
+    "credentialSubject": Section(
+        presence=Rule(0, True),
+        rules=[Rule(1, False, subject_has_uri_id)],
+    ),
+    "credentialStatus": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, False, is_one_or_more_objects),
+            Rule(2, False, each_has_id, when=is_one_or_more_objects),
+            Rule(3, False, each_has_type, when=is_one_or_more_objects),
+        ],
+        optional=True,
+    ),
+    "credentialSchema": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_one_or_more_objects),
+            Rule(2, True, each_has_type, when=is_one_or_more_objects),
+            Rule(3, True, each_has_id, when=is_one_or_more_objects),
+        ],
+        optional=True,
+    ),
+    "refreshService": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_one_or_more_objects),
+            Rule(2, True, each_has_type, when=is_one_or_more_objects),
+            Rule(3, True, each_has_id, when=is_one_or_more_objects),
+        ],
+        optional=True,
+    ),
+    "termsOfUse": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_one_or_more_objects),
+            Rule(2, True, each_has_type, when=is_one_or_more_objects),
+            Rule(3, False, each_has_id, when=is_one_or_more_objects),
+        ],
+        optional=True,
+    ),
+    "evidence": Section(
+        presence=Rule(0, False),
+        rules=[
+            Rule(1, True, is_one_or_more_objects),
+            Rule(2, True, each_has_type, when=is_one_or_more_objects),
+            Rule(3, False, each_has_id, when=is_one_or_more_objects),
+        ],
+        optional=True,
+    ),
+    "proof": Section(
+        presence=Rule(2, False),
+        rules=[Rule(3, True, each_has_type, when=is_one_or_more_objects)],
+        optional=True,
+    ),
+}
+
+VCDM_V1_PLAN = compile_rules(VCDM_V1_RULES, messaging.VCDM_V1_STATEMENTS)
+
+def has_verifiable_presentation_type(value):
+    return is_ordered_set(value) and "VerifiablePresentation" in value
+
+def is_holder(value):
+    return is_issuer(value)
+
+# Presentation-level checks, keyed like messaging.VP_V1_STATEMENTS. The
+# embedded credentials are checked against VCDM_V1_RULES by
+# presentation.test_presentation_v1.
+VP_V1_RULES = {
+    "@context": VCDM_V1_RULES["@context"],
+    "id": VCDM_V1_RULES["id"],
+    "type": Section(
+        presence=Rule(0, True),
+        rules=[Rule(2, True, has_verifiable_presentation_type)],
+    ),
+    "verifiableCredential": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, True, is_one_or_more_credentials)],
+        optional=True,
+    ),
+    "holder": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, True, is_holder)],
+        optional=True,
+    ),
+    "proof": Section(
+        presence=Rule(0, False),
+        rules=[Rule(1, True, each_has_type, when=is_one_or_more_objects)],
+        optional=True,
+    ),
+}
+
+VP_V1_PLAN = compile_rules(VP_V1_RULES, messaging.VP_V1_STATEMENTS)
+
+# Bit numbering of compact results, one per statement checked by the plan.
+VCDM_V1_CHECKS = check_table(VCDM_V1_PLAN)
+
+# The plans test_data_model_v1 and presentation.test_presentation_v1 run.
+# instrumentation.enable() swaps in timed copies, so nothing is measured, or
+# paid for, unless it is asked for.
+VCDM_V1_ACTIVE = ActivePlan(VCDM_V1_PLAN)
+VP_V1_ACTIVE = ActivePlan(VP_V1_PLAN)
+
+def test_data_model_v1(vc, now=None, mode="full"):
+    """Check a credential against the VCDM 1.1 statements.
+
+    With ``now``, a datetime (naive means UTC), the issuanceDate and
+    expirationDate are also checked against that clock.
+
+    ``mode`` is one of rules.MODES. "required-only" leaves every optional
+    check out of the report. "conformant-only" stops at the first failing
+    required check and only returns ``conformant`` and that ``failure``.
+    """
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    active = VCDM_V1_ACTIVE
+    return evaluate_mode(active.plan, active.required, vc, options, mode)
+
+def test_data_model_v1_compact(vc, now=None):
+    """Like test_data_model_v1, but return a CompactResult over VCDM_V1_CHECKS.
+
+    Call ``expand()`` on it for the usual dict.
+    """
+    options = None if now is None else {"now": instant_from_datetime(now)}
+    return CompactResult(VCDM_V1_CHECKS, *evaluate_compact(VCDM_V1_ACTIVE.plan, vc, options))